@@ -0,0 +1,102 @@
+"""
+Model artifact benchmark: the two joblib pickles vs the single model bundle.
+
+For the shipped model (and, with --knn-rows, a synthetic KNN pipeline with
+that many reference rows) writes every format to a temporary directory and
+reports the size on disk and the median load time. sklearn is imported before
+timing, so the numbers are the load itself, not the first import.
+
+    python -m benchmarks.bundle_benchmark
+    python -m benchmarks.bundle_benchmark --knn-rows 200000 --runs 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+from time import perf_counter
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _median_ms(load, runs: int) -> float:
+    load()
+    samples = []
+    for _ in range(runs):
+        started = perf_counter()
+        load()
+        samples.append((perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def benchmark_artifacts(model, model_info, runs: int) -> list:
+    """[(format, size in bytes, median load ms)] for one fitted pipeline"""
+    import joblib
+
+    from services.model_bundle import load_bundle, save_bundle
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'model.pkl')
+        info_path = os.path.join(directory, 'model_info.pkl')
+        bundle_path = os.path.join(directory, 'model.bundle')
+        joblib.dump(model, model_path)
+        joblib.dump(model_info, info_path)
+        save_bundle(model, model_info, bundle_path)
+
+        pickles_size = os.path.getsize(model_path) + os.path.getsize(info_path)
+        bundle_size = os.path.getsize(bundle_path)
+        return [
+            ('joblib pickles', pickles_size,
+             _median_ms(lambda: (joblib.load(model_path), joblib.load(info_path)), runs)),
+            ('joblib pickles, mmap', pickles_size,
+             _median_ms(lambda: (joblib.load(model_path, mmap_mode='c'), joblib.load(info_path)), runs)),
+            ('bundle', bundle_size, _median_ms(lambda: load_bundle(bundle_path), runs)),
+            ('bundle, mmap', bundle_size, _median_ms(lambda: load_bundle(bundle_path, mmap_mode='c'), runs)),
+            ('bundle, no checksum', bundle_size, _median_ms(lambda: load_bundle(bundle_path, verify=False), runs)),
+            ('bundle, mmap, no checksum', bundle_size,
+             _median_ms(lambda: load_bundle(bundle_path, mmap_mode='c', verify=False), runs)),
+        ]
+
+
+def _synthetic_knn(rows: int):
+    import numpy as np
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    from services.prediction_service import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(rows, 14))
+    y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, rows)]
+    model = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier(7))]).fit(X, y)
+    model_info = {'model_name': 'KNN', 'feature_names': list(FEATURE_COLUMNS.values()),
+                  'classes': list(model.classes_)}
+    return model, model_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--knn-rows', type=int, default=0, help='Also benchmark a synthetic KNN of this size')
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_ROOT)
+    os.chdir(PROJECT_ROOT)
+    import joblib
+
+    from config import settings
+
+    models = [('shipped model', joblib.load(settings.MODEL_PATH), joblib.load(settings.MODEL_INFO_PATH))]
+    if args.knn_rows:
+        models.append((f'KNN, {args.knn_rows} rows', *_synthetic_knn(args.knn_rows)))
+
+    for name, model, model_info in models:
+        print(f"\n{name}")
+        print(f"{'format':<28}{'size (KiB)':>12}{'load (ms)':>12}")
+        for label, size, load_ms in benchmark_artifacts(model, model_info, args.runs):
+            print(f"{label:<28}{size / 1024:>12.1f}{load_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
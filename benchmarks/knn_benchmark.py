@@ -0,0 +1,89 @@
+"""
+KNN serving benchmark: exact tree index vs the approximate IVF index.
+
+Fits a synthetic KNN pipeline with --rows reference rows (clustered, 14
+features), tunes its tree index like generate_simple_model.py does, then
+times single-row predict_proba for the exact model and for the IVF index at
+several nprobe values. Recall is the share of the exact k nearest neighbors
+the approximate search returns; agreement is the share of equal predictions.
+
+    python -m benchmarks.knn_benchmark --rows 200000
+    python -m benchmarks.knn_benchmark --rows 500000 --nprobe 1 4 16 64
+"""
+import argparse
+import os
+import statistics
+import sys
+from time import perf_counter_ns
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _p50_us(func, queries) -> float:
+    samples = []
+    for query in queries:
+        start = perf_counter_ns()
+        func(query)
+        samples.append(perf_counter_ns() - start)
+    return statistics.median(samples) / 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--n-neighbors', type=int, default=7)
+    parser.add_argument('--lists', type=int, default=0, help='IVF cells (default about sqrt(rows))')
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_ROOT)
+    import numpy as np
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    from services.knn_index import ApproximateKNNModel, tune_tree_index
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(64, 14)) * 3
+    X = centers[rng.integers(0, len(centers), args.rows)] + rng.normal(size=(args.rows, 14))
+    y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, args.rows)]
+    pipeline = Pipeline([('StandardScaler', StandardScaler()),
+                         ('KNN', KNeighborsClassifier(args.n_neighbors))]).fit(X, y)
+
+    started = perf_counter_ns()
+    index_info = tune_tree_index(pipeline)
+    print(f"Tree index: {index_info['algorithm']}, leaf_size {index_info['leaf_size']} "
+          f"(tuned in {(perf_counter_ns() - started) / 1e9:.1f}s)")
+
+    queries = centers[rng.integers(0, len(centers), args.queries)] + rng.normal(size=(args.queries, 14))
+    scaler, knn = pipeline.steps[0][1], pipeline.steps[-1][1]
+    exact_neighbors = knn.kneighbors(scaler.transform(queries), return_distance=False)
+    exact_predictions = pipeline.predict(queries)
+
+    print(f"{'model':<18}{'p50 (µs)':>12}{'recall':>10}{'agreement':>12}")
+    exact_us = _p50_us(lambda q: pipeline.predict_proba(q[None, :]), queries)
+    print(f"{'exact tree':<18}{exact_us:>12.1f}{1.0:>10.3f}{1.0:>12.3f}")
+
+    for nprobe in args.nprobe:
+        started = perf_counter_ns()
+        approximate = ApproximateKNNModel.from_model(pipeline, args.lists or None, nprobe)
+        build_s = (perf_counter_ns() - started) / 1e9
+        index = approximate.index
+
+        # IVF results index the index's reordered rows, so compare the rows themselves
+        found = index.points[index.kneighbors(scaler.transform(queries), args.n_neighbors)]
+        exact = knn._fit_X[exact_neighbors]
+        recall = float(np.mean([
+            len({row.tobytes() for row in found[i]} & {row.tobytes() for row in exact[i]}) / args.n_neighbors
+            for i in range(len(queries))
+        ]))
+        agreement = float(np.mean(approximate.predict(queries) == exact_predictions))
+        latency = _p50_us(lambda q: approximate.predict_proba(q[None, :]), queries)
+        print(f"{'ivf nprobe=' + str(nprobe):<18}{latency:>12.1f}{recall:>10.3f}{agreement:>12.3f}"
+              f"   (build {build_s:.1f}s, {len(index.centroids)} cells)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Latency and throughput benchmark with a regression baseline.
+
+Cases:
+    predict_single        PredictionService.predict for one student
+    predict_batch_<n>     PredictionService.predict_batch for n students
+    ingest_rows_<n>       n JSON records validated, turned into objects and a matrix
+    ingest_columnar_<n>   the same records through StudentBatch.from_records
+    validate              validate_dataclass_data alone
+    http_predict          POST /api/predict through the Flask test client
+
+Every case runs warmup rounds first and is then timed with perf_counter_ns
+over many repetitions. The prediction cache and micro-batching are turned off
+so each repetition scores the model, and the app logger is raised to WARNING
+so request logs do not end up in the timings.
+
+    python -m benchmarks.latency_benchmark
+    python -m benchmarks.latency_benchmark --output results.json
+    python -m benchmarks.latency_benchmark --save-baseline
+    python -m benchmarks.latency_benchmark --compare benchmarks/baseline.json
+
+With --compare the script exits with status 1 when the p50 or p95 of any case
+is more than --tolerance (default 25%) slower than the baseline. Baselines
+only make sense on the machine that recorded them.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+from time import perf_counter_ns
+
+import numpy as np
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+COMPARED_METRICS = ('p50_us', 'p95_us')
+
+
+def _random_student_payload(rng: random.Random) -> dict:
+    enrolled_1st = rng.randint(0, 10)
+    enrolled_2nd = rng.randint(0, 10)
+    return {
+        'age_at_enrollment': rng.randint(17, 60),
+        'gender': rng.randint(0, 1),
+        'marital_status': rng.randint(1, 6),
+        'admission_grade': round(rng.uniform(95.0, 190.0), 1),
+        'daytime_evening_attendance': rng.randint(0, 1),
+        'scholarship_holder': rng.randint(0, 1),
+        'tuition_fees_up_to_date': rng.randint(0, 1),
+        'curricular_units_1st_sem_enrolled': enrolled_1st,
+        'curricular_units_1st_sem_approved': rng.randint(0, enrolled_1st),
+        'curricular_units_1st_sem_grade': round(rng.uniform(0.0, 20.0), 2),
+        'curricular_units_2nd_sem_enrolled': enrolled_2nd,
+        'curricular_units_2nd_sem_approved': rng.randint(0, enrolled_2nd),
+        'curricular_units_2nd_sem_grade': round(rng.uniform(0.0, 20.0), 2),
+        'unemployment_rate': round(rng.uniform(7.0, 17.0), 1)
+    }
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def time_case(func, repetitions: int, warmup: int, rows: int = 1) -> dict:
+    """Call func warmup + repetitions times and summarize the timed calls"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repetitions):
+        start = perf_counter_ns()
+        func()
+        samples.append(perf_counter_ns() - start)
+
+    samples.sort()
+    total_seconds = sum(samples) / 1e9
+    return {
+        'repetitions': repetitions,
+        'rows': rows,
+        'p50_us': _percentile(samples, 0.50) / 1000.0,
+        'p95_us': _percentile(samples, 0.95) / 1000.0,
+        'p99_us': _percentile(samples, 0.99) / 1000.0,
+        'mean_us': total_seconds / repetitions * 1e6,
+        'rows_per_s': rows * repetitions / total_seconds if total_seconds else 0.0
+    }
+
+
+def run_benchmarks(repetitions: int = 1000, warmup: int = 50, batch_sizes=BATCH_SIZES,
+                   max_batch_rows: int = 200000) -> dict:
+    sys.path.insert(0, PROJECT_ROOT)
+    from config import settings
+
+    settings.PREDICTION_CACHE_SIZE = 0
+    settings.MICRO_BATCH_ENABLED = False
+    settings.MODEL_BACKGROUND_LOAD = False
+    settings.MODEL_WATCH_INTERVAL = 0
+
+    from core.app_factory import create_app
+    from logger import logger
+    from models.schemas import STUDENT_FIELDS, SimpleStudentData, StudentBatch
+    from services.prediction_service import prediction_service
+    from utils.validation import validate_dataclass_batch, validate_dataclass_data
+
+    app = create_app()
+    logger.setLevel(logging.WARNING)
+    if not prediction_service.is_model_loaded():
+        raise RuntimeError("Model failed to load")
+
+    rng = random.Random(0)
+    payloads = [_random_student_payload(rng) for _ in range(max(batch_sizes))]
+    students = [SimpleStudentData.from_dict(payload) for payload in payloads]
+    client = app.test_client()
+
+    def cycle(items):
+        position = [0]
+
+        def next_item():
+            position[0] = (position[0] + 1) % len(items)
+            return items[position[0]]
+        return next_item
+
+    next_student = cycle(students)
+    next_payload = cycle(payloads)
+
+    results = {
+        'predict_single': time_case(lambda: prediction_service.predict(next_student()), repetitions, warmup),
+        'validate': time_case(
+            lambda: validate_dataclass_data(SimpleStudentData, next_payload()), repetitions, warmup
+        ),
+    }
+    for size in batch_sizes:
+        batch = students[:size]
+        batch_repetitions = max(10, min(repetitions, max_batch_rows // size))
+        results[f'predict_batch_{size}'] = time_case(
+            lambda: prediction_service.predict_batch(batch), batch_repetitions,
+            max(2, min(warmup, batch_repetitions // 10)), rows=size
+        )
+
+    size = max(batch_sizes)
+    ingest_repetitions = max(10, min(repetitions, max_batch_rows // size))
+    
+    def ingest_rows():
+        validated, _ = validate_dataclass_batch(SimpleStudentData, payloads)
+        rows = [SimpleStudentData.from_dict(item) for item in validated]
+        return np.array([[getattr(row, name) for name in STUDENT_FIELDS] for row in rows], dtype=np.float64)
+    
+    results[f'ingest_rows_{size}'] = time_case(ingest_rows, ingest_repetitions, 2, rows=size)
+    results[f'ingest_columnar_{size}'] = time_case(
+        lambda: StudentBatch.from_records(payloads).to_matrix(), ingest_repetitions, 2, rows=size
+    )
+
+    def http_predict():
+        response = client.post('/api/predict', json=next_payload())
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/predict answered {response.status_code}")
+
+    results['http_predict'] = time_case(http_predict, repetitions, warmup)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return one message per case and metric that is slower than the baseline allows"""
+    regressions = []
+    for case, reference in baseline.get('cases', {}).items():
+        current = results.get(case)
+        if current is None:
+            continue
+        for metric in COMPARED_METRICS:
+            limit = reference[metric] * (1 + tolerance)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{case} {metric}: {current[metric]:.1f} > {limit:.1f} "
+                    f"(baseline {reference[metric]:.1f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repetitions', type=int, default=1000, help='Timed calls per case')
+    parser.add_argument('--warmup', type=int, default=50, help='Untimed calls before each case')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    parser.add_argument('--compare', metavar='BASELINE', help='Fail when slower than this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown, 0.25 = 25%%')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f'Write the results as the new baseline (default {DEFAULT_BASELINE})')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repetitions, args.warmup)
+    report = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+        'cases': results
+    }
+
+    print(f"{'case':<22}{'p50 (µs)':>12}{'p95 (µs)':>12}{'p99 (µs)':>12}{'rows/s':>14}")
+    for case, result in results.items():
+        print(f"{case:<22}{result['p50_us']:>12.1f}{result['p95_us']:>12.1f}"
+              f"{result['p99_us']:>12.1f}{result['rows_per_s']:>14.0f}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Logging benchmark: time a log call costs the thread that makes it.
+
+Compares a synchronous StreamHandler with an f-string message (the previous
+setup) against the queue handler of logger.py with a lazy %-style message,
+a JSON formatter and the writer thread, and the sampled call used for
+validation errors. Each is measured writing to a file and to a pipe whose
+reader is slow, like a log collector falling behind; there the synchronous
+handler blocks once the pipe buffer is full.
+
+    python -m benchmarks.logging_benchmark
+    python -m benchmarks.logging_benchmark --calls 50000
+
+Only the caller's time is reported. The queued records are still formatted
+and written, on the writer thread, which takes CPU from the requests when the
+machine has a single core.
+"""
+import argparse
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from logging.handlers import QueueListener
+from time import perf_counter
+
+from logger import JsonFormatter, LogSampler, TEXT_FORMAT, _LazyQueueHandler
+
+MESSAGE_ARGS = ("Field 'admission_grade' must be at most 200.0",)
+
+
+class _SlowPipe:
+    """Write end of a pipe drained 1 KiB per millisecond by a reader thread"""
+
+    def __init__(self):
+        read_fd, write_fd = os.pipe()
+        self.stream = os.fdopen(write_fd, 'w', buffering=1)
+        self._reader = os.fdopen(read_fd, 'rb', buffering=0)
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while self._reader.read(1024):
+            time.sleep(0.001)
+
+    def close(self):
+        self.stream.close()
+        self._thread.join()
+
+
+def _time_calls(log, calls: int) -> dict:
+    samples = []
+    for i in range(calls):
+        started = perf_counter()
+        log(i)
+        samples.append(perf_counter() - started)
+    samples.sort()
+    return {
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p99_us': samples[int(len(samples) * 0.99)] * 1e6,
+        'max_us': samples[-1] * 1e6
+    }
+
+
+def _sync_logger(name, stream):
+    log = logging.getLogger(name)
+    log.propagate = False
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    log.addHandler(handler)
+    return log, lambda: None
+
+
+def _queue_logger(name, stream):
+    log = logging.getLogger(name)
+    log.propagate = False
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    handler = _LazyQueueHandler(queue.Queue(100000))
+    log.addHandler(handler)
+    listener = QueueListener(handler.queue, output)
+    listener.start()
+    return log, listener.stop
+
+
+def run_case(label: str, target: str, calls: int) -> dict:
+    if target == 'file':
+        stream = tempfile.TemporaryFile('w')
+        close = stream.close
+    else:
+        pipe = _SlowPipe()
+        stream, close = pipe.stream, pipe.close
+
+    name = f'bench.{label}.{target}'
+    if label == 'sync f-string':
+        log, stop = _sync_logger(name, stream)
+        call = lambda i: log.error(f"Validation error: {MESSAGE_ARGS[0]} ({i})")
+    else:
+        log, stop = _queue_logger(name, stream)
+        if label == 'queue lazy':
+            call = lambda i: log.error("Validation error: %s (%d)", MESSAGE_ARGS[0], i)
+        else:
+            sampler = LogSampler(10)
+
+            def call(i):
+                allowed, _ = sampler.allow('validation')
+                if allowed:
+                    log.error("Validation error: %s (%d)", MESSAGE_ARGS[0], i)
+
+    result = _time_calls(call, calls)
+    started = perf_counter()
+    stop()
+    result['drain_ms'] = (perf_counter() - started) * 1000
+    close()
+    result.update(case=label, target=target)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'case':<18}{'output':<12}{'p50 (µs)':>10}{'p99 (µs)':>10}{'max (µs)':>11}{'drain (ms)':>12}")
+    for target in ('file', 'slow pipe'):
+        for label in ('sync f-string', 'queue lazy', 'queue sampled'):
+            r = run_case(label, target, args.calls)
+            print(f"{r['case']:<18}{r['target']:<12}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}"
+                  f"{r['max_us']:>11.0f}{r['drain_ms']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
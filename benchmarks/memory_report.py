@@ -0,0 +1,127 @@
+"""
+Memory report: RSS and PSS per worker with and without memory-mapped model arrays.
+
+Starts N worker processes per mode. Each one loads the model through
+PredictionService (like a prefork worker would), runs a prediction and then
+waits until every worker has loaded before reading /proc/self/smaps_rollup, so
+PSS reflects the pages the workers actually share.
+
+    python -m benchmarks.memory_report --workers 4
+    python -m benchmarks.memory_report --workers 4 --knn-rows 200000
+
+--knn-rows fits a synthetic KNN pipeline with that many reference rows, which
+makes the difference visible on models larger than the shipped SVM. "load RSS"
+is the growth in RSS caused by loading the model, including the sklearn import.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODES = {'copy': None, 'mmap': 'c'}
+
+
+def _read_memory_kb() -> dict:
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Shared_Clean:', 'Private_Dirty:'):
+                values[parts[0].rstrip(':').lower()] = int(parts[1])
+    return values
+
+
+def _worker(model_path, info_path, mmap_mode, barrier, results):
+    sys.path.insert(0, PROJECT_ROOT)
+    import numpy as np
+
+    from config import settings
+    from services.prediction_service import PredictionService
+
+    settings.MODEL_PATH = model_path
+    settings.MODEL_INFO_PATH = info_path
+    settings.MODEL_MMAP_MODE = mmap_mode
+    settings.USE_COMPILED_MODEL = False
+
+    before = _read_memory_kb()
+    service = PredictionService()
+    if not service.load_model():
+        raise RuntimeError("Model failed to load")
+    service._state.inference_model.predict_proba(np.zeros((8, len(service._state.feature_fields))))
+
+    barrier.wait()
+    after = _read_memory_kb()
+    barrier.wait()
+    results.put({'before': before, 'after': after})
+
+
+def _build_knn_artifacts(rows: int, directory: str):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    sys.path.insert(0, PROJECT_ROOT)
+    from services.prediction_service import FEATURE_COLUMNS
+
+    feature_names = list(FEATURE_COLUMNS.values())
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(rows, len(feature_names))), columns=feature_names)
+    y = rng.choice(['Dropout', 'Enrolled', 'Graduate'], size=rows)
+    model = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier())]).fit(X, y)
+
+    model_path = os.path.join(directory, 'knn_model.pkl')
+    info_path = os.path.join(directory, 'knn_model_info.pkl')
+    joblib.dump(model, model_path)
+    joblib.dump({'model_name': 'KNN', 'feature_names': feature_names,
+                 'classes': list(model.classes_)}, info_path)
+    return model_path, info_path
+
+
+def measure(model_path: str, info_path: str, mmap_mode, workers: int) -> list:
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(model_path, info_path, mmap_mode, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=300) for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--knn-rows', type=int, default=0, help='Use a synthetic KNN model of this size')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.knn_rows:
+            model_path, info_path = _build_knn_artifacts(args.knn_rows, directory)
+        else:
+            model_path = os.path.join(PROJECT_ROOT, 'student_dropout_simple_model.pkl')
+            info_path = os.path.join(PROJECT_ROOT, 'student_dropout_simple_model_info.pkl')
+        print(f"Model: {model_path} ({os.path.getsize(model_path) / 1024:.0f} KiB), workers: {args.workers}")
+
+        print(f"{'mode':<8}{'RSS/worker':>14}{'PSS/worker':>14}{'load RSS':>14}{'total PSS':>14}  (MiB)")
+        for mode, mmap_mode in MODES.items():
+            reports = measure(model_path, info_path, mmap_mode, args.workers)
+            rss = sum(r['after']['rss'] for r in reports) / len(reports) / 1024
+            pss = sum(r['after']['pss'] for r in reports) / len(reports) / 1024
+            load_rss = sum(r['after']['rss'] - r['before']['rss'] for r in reports) / len(reports) / 1024
+            total_pss = sum(r['after']['pss'] for r in reports) / 1024
+            print(f"{mode:<8}{rss:>14.1f}{pss:>14.1f}{load_rss:>14.1f}{total_pss:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
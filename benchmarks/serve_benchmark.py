@@ -0,0 +1,191 @@
+"""
+Serving benchmark: Flask's development server vs the prefork server (serve.py).
+
+Starts each server in a subprocess, drives it with --concurrency client
+threads for --duration seconds per endpoint (a new connection per request,
+random students so the prediction cache does not answer) and reports
+requests per second, p50/p99 latency and errors. For serve.py it also reports
+the summed PSS of the parent and workers, which shows how much of the model
+the workers share with the parent.
+
+    python -m benchmarks.serve_benchmark --workers 4 --concurrency 16
+    python -m benchmarks.serve_benchmark --workers 2 4 8 --duration 10
+
+The client runs on the same machine, so on a machine with few cores it
+competes with the server for CPU; the prefork server only scales with the
+number of cores.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+DEV_SERVER_SCRIPT = (
+    "import sys\n"
+    "from main import app\n"
+    "app.run(host='127.0.0.1', port=int(sys.argv[1]), debug=False)\n"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _random_student(rng: random.Random) -> dict:
+    return {
+        'age_at_enrollment': rng.randint(17, 60),
+        'gender': rng.randint(0, 1),
+        'marital_status': rng.randint(1, 4),
+        'admission_grade': round(rng.uniform(95, 190), 1),
+        'daytime_evening_attendance': rng.randint(0, 1),
+        'scholarship_holder': rng.randint(0, 1),
+        'tuition_fees_up_to_date': rng.randint(0, 1),
+        'curricular_units_1st_sem_enrolled': 6,
+        'curricular_units_1st_sem_approved': rng.randint(0, 6),
+        'curricular_units_1st_sem_grade': round(rng.uniform(0, 18), 2),
+        'curricular_units_2nd_sem_enrolled': 6,
+        'curricular_units_2nd_sem_approved': rng.randint(0, 6),
+        'curricular_units_2nd_sem_grade': round(rng.uniform(0, 18), 2),
+        'unemployment_rate': round(rng.uniform(7, 17), 1)
+    }
+
+
+def _wait_ready(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/')
+            if json.loads(connection.getresponse().read()).get('model_loaded'):
+                return
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not become ready within {timeout}s")
+
+
+def _load(port: int, method: str, path: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        local, failed = [], 0
+        while time.monotonic() < stop_at:
+            body = json.dumps(_random_student(rng)) if method == 'POST' else None
+            started = time.perf_counter()
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                connection.request(method, path, body=body, headers={
+                    'Content-Type': 'application/json', 'Connection': 'close'
+                })
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                if response.status != 200:
+                    failed += 1
+                    continue
+            except OSError:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else float('nan'),
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float('nan'),
+        'errors': errors[0]
+    }
+
+
+def _pss_kb(pid: int) -> int:
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _process_tree_pss_mb(pid: int) -> float:
+    """PSS of a process and its direct children, in MiB"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = [int(child) for child in f.read().split()]
+        return sum(_pss_kb(p) for p in [pid] + children) / 1024
+    except OSError:
+        return float('nan')
+
+
+def run_server(label: str, command: list, port: int, endpoints, concurrency: int, duration: float) -> list:
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port)
+        results = []
+        for method, path in endpoints:
+            result = _load(port, method, path, concurrency, duration)
+            result.update(server=label, endpoint=f'{method} {path}', pss_mb=_process_tree_pss_mb(process.pid))
+            results.append(result)
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count() or 1])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per endpoint')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    endpoints = [('POST', '/api/predict'), ('GET', '/api/model-info')]
+    results = []
+
+    port = _free_port()
+    results += run_server('dev server', [sys.executable, '-c', DEV_SERVER_SCRIPT, str(port)], port,
+                          endpoints, args.concurrency, args.duration)
+    for workers in args.workers:
+        port = _free_port()
+        command = [sys.executable, 'serve.py', '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(workers)]
+        results += run_server(f'serve.py x{workers}', command, port, endpoints, args.concurrency, args.duration)
+
+    print(f"{os.cpu_count()} CPUs, {args.concurrency} concurrent clients, {args.duration:.0f}s per endpoint")
+    print(f"{'server':<16}{'endpoint':<22}{'req/s':>9}{'p50 (ms)':>10}{'p99 (ms)':>10}{'errors':>8}{'PSS (MiB)':>11}")
+    for r in results:
+        print(f"{r['server']:<16}{r['endpoint']:<22}{r['rps']:>9.0f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['errors']:>8}{r['pss_mb']:>11.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup benchmark: time to first byte and time to model ready.
+
+Starts the API in a subprocess for each load mode and polls GET /api/ until it
+answers (time to first byte) and until it reports model_loaded (time to model
+ready). Times are measured from just before the process is spawned.
+
+    python -m benchmarks.startup_benchmark --runs 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SERVER_SCRIPT = (
+    "import sys\n"
+    "from main import app\n"
+    "app.run(host='127.0.0.1', port=int(sys.argv[1]), debug=False)\n"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_startup(background: bool, timeout: float = 60.0, poll_interval: float = 0.005) -> dict:
+    """Spawn one server and return its time to first byte and time to model ready"""
+    port = _free_port()
+    env = dict(os.environ, MODEL_BACKGROUND_LOAD='1' if background else '0')
+    url = f'http://127.0.0.1:{port}/api/'
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVER_SCRIPT, str(port)],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    first_byte = None
+    model_ready = None
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    body = json.loads(response.read())
+                now = time.perf_counter() - start
+                if first_byte is None:
+                    first_byte = now
+                if body.get('model_loaded'):
+                    model_ready = now
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(poll_interval)
+    finally:
+        process.terminate()
+        process.wait()
+
+    if model_ready is None:
+        raise RuntimeError(f"Server did not become ready within {timeout}s")
+    return {'time_to_first_byte': first_byte, 'time_to_model_ready': model_ready}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Server starts per mode')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args()
+
+    results = {}
+    for mode, background in (('sync', False), ('background', True)):
+        runs = [measure_startup(background) for _ in range(args.runs)]
+        results[mode] = {
+            metric: statistics.median(run[metric] for run in runs)
+            for metric in ('time_to_first_byte', 'time_to_model_ready')
+        }
+
+    print(f"{'mode':<12}{'first byte (s)':>16}{'model ready (s)':>18}")
+    for mode, result in results.items():
+        print(f"{mode:<12}{result['time_to_first_byte']:>16.3f}{result['time_to_model_ready']:>18.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
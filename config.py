@@ -1,12 +1,101 @@
+import os
+
+
 class Settings:
     MODEL_PATH = "student_dropout_simple_model.pkl"
     MODEL_INFO_PATH = "student_dropout_simple_model_info.pkl"
     
+    # joblib mmap_mode for the model arrays ("c" shares pages between workers
+    # until written; "r" is not usable with SVC because libsvm needs writable arrays)
+    MODEL_MMAP_MODE = os.environ.get("MODEL_MMAP_MODE") or None
+    
+    # sklearn-free model exported by services/compiled_model.py
+    COMPILED_MODEL_PATH = "student_dropout_simple_model.npz"
+    USE_COMPILED_MODEL = os.environ.get("USE_COMPILED_MODEL", "0") == "1"
+    
+    # Single-file bundle (model, model info and checksum) written by services/model_bundle.py
+    MODEL_BUNDLE_PATH = "student_dropout_simple_model.bundle"
+    USE_MODEL_BUNDLE = os.environ.get("USE_MODEL_BUNDLE", "0") == "1"
+    # Checking the bundle checksum reads the whole file (about 1 ms per MB)
+    MODEL_BUNDLE_VERIFY = os.environ.get("MODEL_BUNDLE_VERIFY", "1") == "1"
+    
+    # Training data for generate_simple_model.py: a local path or URL, the local
+    # dataset cache, and offline mode (never download, fail if nothing is cached)
+    TRAINING_DATA_SOURCE = os.environ.get(
+        "TRAINING_DATA_SOURCE",
+        "https://raw.githubusercontent.com/matfigueiredo/student-dropout-mvp/refs/heads/master/data.csv"
+    )
+    TRAINING_DATA_CACHE_DIR = os.environ.get("TRAINING_DATA_CACHE_DIR", ".data_cache")
+    TRAINING_OFFLINE = os.environ.get("TRAINING_OFFLINE", "0") == "1"
+    
     API_TITLE = "Student Dropout Prediction API - Simplified"
     API_DESCRIPTION = "API simplificada para predição de dropout com apenas 14 campos essenciais"
     API_VERSION = "2.0.0"
     
     HOST = "0.0.0.0"
     PORT = 5000
+    
+    # Prefork server (serve.py): worker processes (0 means one per CPU), requests
+    # before a worker is recycled (0 never) plus a random jitter, and seconds a
+    # stopping worker gets to finish its current request
+    SERVE_WORKERS = int(os.environ.get("SERVE_WORKERS", "0"))
+    SERVE_MAX_REQUESTS = int(os.environ.get("SERVE_MAX_REQUESTS", "0"))
+    SERVE_MAX_REQUESTS_JITTER = int(os.environ.get("SERVE_MAX_REQUESTS_JITTER", "0"))
+    SERVE_GRACEFUL_TIMEOUT = float(os.environ.get("SERVE_GRACEFUL_TIMEOUT", "30"))
+    
+    # Log output: "json" (one object per line, with the request ID) or "text". Records
+    # wait in a queue of LOG_QUEUE_SIZE for the writer thread and are dropped when it
+    # is full; sampled messages (validation errors) are capped per second (0 logs all)
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+    LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+    LOG_SAMPLE_PER_SECOND = int(os.environ.get("LOG_SAMPLE_PER_SECOND", "10"))
+    
+    # Token required in the X-Admin-Token header by /api/admin endpoints (unset disables them)
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+    
+    # Request profiling of /api/predict (utils/profiling.py). While enabled, a request
+    # is profiled when it sends "X-Profile: 1" with the admin token (never without ADMIN_TOKEN)
+    # or falls in the sample rate; "tracing" times every call, "sampling" reads the
+    # stack every PROFILING_INTERVAL_MS. Collapsed stacks are written to PROFILING_DIR
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_MODE = os.environ.get("PROFILING_MODE", "tracing")
+    PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", "1"))
+    PROFILING_DIR = os.environ.get("PROFILING_DIR", "profiles")
+    # Newest profiles kept in PROFILING_DIR; older ones are deleted
+    PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", "100"))
+    
+    # Load the model in a background thread so the app answers (with 503s) right away
+    MODEL_BACKGROUND_LOAD = os.environ.get("MODEL_BACKGROUND_LOAD", "0") == "1"
+    
+    # Seconds between checks of the model files for hot reload (0 disables the watcher)
+    MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", "0"))
+    
+    # Cache-Control max-age of /api/, /api/model-info and /api/features. They carry
+    # ETags, so 0 ("no-cache") still lets clients revalidate with a cheap 304
+    METADATA_CACHE_MAX_AGE = int(os.environ.get("METADATA_CACHE_MAX_AGE", "0"))
+    
+    # Maximum number of students accepted by /api/predict/batch
+    BATCH_MAX_SIZE = 10000
+    
+    # Rows validated and scored per model call by /api/predict/stream
+    STREAM_CHUNK_SIZE = 1000
+    # Longest line accepted by /api/predict/stream; a student row is a few hundred bytes
+    STREAM_MAX_LINE_BYTES = int(os.environ.get("STREAM_MAX_LINE_BYTES", "8192"))
+    
+    # Opt-in micro-batching of concurrent /api/predict calls into one model call
+    MICRO_BATCH_ENABLED = os.environ.get("MICRO_BATCH_ENABLED", "0") == "1"
+    MICRO_BATCH_MAX_SIZE = 32
+    MICRO_BATCH_MAX_WAIT_MS = 2.0
+    
+    # Approximate neighbor search for KNN models (inverted file over k-means cells).
+    # More probed cells raise recall and latency; 0 cells means about sqrt(rows)
+    KNN_APPROXIMATE = os.environ.get("KNN_APPROXIMATE", "0") == "1"
+    KNN_IVF_LISTS = int(os.environ.get("KNN_IVF_LISTS", "0"))
+    KNN_IVF_NPROBE = int(os.environ.get("KNN_IVF_NPROBE", "8"))
+    
+    # Prediction result cache (size 0 disables it, TTL None keeps entries until evicted)
+    PREDICTION_CACHE_SIZE = 1024
+    PREDICTION_CACHE_TTL = 300
 
 settings = Settings() 
\ No newline at end of file
@@ -1,10 +1,19 @@
-from flask import Flask
+import re
+import threading
+import uuid
+
+from flask import Flask, g, request
 from flask_cors import CORS
 
-from logger import log_info, setup_logger
+from config import settings
+from logger import log_debug, log_info, request_id_var, setup_logger
 from routers.prediction import prediction_bp
+from services.model_watcher import ModelWatcher
 from services.prediction_service import prediction_service
 
+# Client-supplied request IDs are kept only when short and log-safe
+_REQUEST_ID = re.compile(r'[A-Za-z0-9._:-]{1,64}')
+
 
 def create_app() -> Flask:
     """Flask application factory"""
@@ -19,20 +28,37 @@ def create_app() -> Flask:
     CORS(app, 
          origins=["*"],
          methods=["GET", "POST", "OPTIONS"],
-         allow_headers=["Content-Type", "Authorization", "Accept"],
+         allow_headers=["Content-Type", "Authorization", "Accept", "X-Request-ID"],
+         expose_headers=["X-Request-ID"],
          supports_credentials=True,
          max_age=86400)  # Cache preflight for 24 hours
     
+    # Tag every request with an ID for the logs: the client's X-Request-ID or a new one
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get('X-Request-ID', '')
+        g.request_id = incoming if _REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+        request_id_var.set(g.request_id)
+    
+    @app.after_request
+    def add_request_id_header(response):
+        if 'request_id' in g:
+            response.headers['X-Request-ID'] = g.request_id
+        return response
+    
+    @app.teardown_request
+    def clear_request_id(error):
+        request_id_var.set(None)
+    
     # Add explicit OPTIONS handler for all routes
     @app.before_request
     def handle_preflight():
-        from flask import request
         if request.method == "OPTIONS":
             response = app.make_default_options_response()
             headers = response.headers
             headers['Access-Control-Allow-Origin'] = '*'
             headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-            headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept'
+            headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept, X-Request-ID'
             headers['Access-Control-Max-Age'] = '86400'
             return response
     
@@ -42,14 +68,27 @@ def create_app() -> Flask:
     # Initialize services on startup
     with app.app_context():
         log_info("🚀 Starting up Flask app...")
-        prediction_service.load_model()
+        if settings.MODEL_BACKGROUND_LOAD:
+            # Prediction endpoints answer 503 "Model not loaded" until this finishes
+            app.model_loader = threading.Thread(
+                target=prediction_service.load_model, name="model-loader", daemon=True
+            )
+            app.model_loader.start()
+        else:
+            prediction_service.load_model()
+    
+    # Hot reload the model when its files change on disk
+    if settings.MODEL_WATCH_INTERVAL > 0:
+        app.model_watcher = ModelWatcher(prediction_service, settings.MODEL_WATCH_INTERVAL)
+        app.model_watcher.start()
     
     @app.teardown_appcontext
     def cleanup(error):
         """Cleanup on app shutdown"""
         if error:
-            log_info(f"App error: {error}")
-        log_info("🛑 App context teardown...")
+            log_info("App error: %s", error)
+        # Runs after every request, so only at debug level
+        log_debug("🛑 App context teardown...")
     
     @app.errorhandler(404)
     def not_found(error):
@@ -1,10 +1,10 @@
+import argparse
 import warnings
 
 import joblib
-import pandas as pd
 from sklearn.base import clone
 from sklearn.metrics import accuracy_score
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import Pipeline
@@ -12,52 +12,24 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 
+from services.compiled_model import save_compiled_model
+from services.knn_index import tune_tree_index
+from services.model_bundle import save_bundle
+from training.dataset import SELECTED_FEATURES, TARGET_COLUMN, load_dataset
+from training.orchestrator import TrainingOrchestrator
+
 warnings.filterwarnings("ignore")
 
 def load_and_prepare_simple_data():
     """Load and prepare the dataset with selected features only"""
-    url = "https://raw.githubusercontent.com/matfigueiredo/student-dropout-mvp/refs/heads/master/data.csv"
-    dataset = pd.read_csv(url, delimiter=';')
-    
-    # Clean column names
-    dataset.columns = dataset.columns.str.strip()
-    if 'Daytime/evening attendance\t' in dataset.columns:
-        dataset = dataset.rename(columns={'Daytime/evening attendance\t': 'Daytime/evening attendance'})
-    
-    # Select only the most important and interpretable features
-    selected_features = [
-        # Personal Information (3 features)
-        'Age at enrollment',
-        'Gender',
-        'Marital status',
-        
-        # Academic Information (2 features)
-        'Admission grade',
-        'Daytime/evening attendance',
-        
-        # Financial Status (2 features)
-        'Scholarship holder',
-        'Tuition fees up to date',
-        
-        # 1st Semester Performance (3 features)
-        'Curricular units 1st sem (enrolled)',
-        'Curricular units 1st sem (approved)',
-        'Curricular units 1st sem (grade)',
-        
-        # 2nd Semester Performance (3 features)
-        'Curricular units 2nd sem (enrolled)',
-        'Curricular units 2nd sem (approved)',
-        'Curricular units 2nd sem (grade)',
-        
-        # Economic Context (1 feature)
-        'Unemployment rate'
-    ]
+    # Downloaded once, then served from the local content-addressed cache
+    dataset = load_dataset()
+    selected_features = list(SELECTED_FEATURES)
     
     # Filter dataset to include only selected features + target
     X = dataset[selected_features]
-    y = dataset['Target']
+    y = dataset[TARGET_COLUMN]
     
-    print(f"Original dataset: {dataset.shape}")
     print(f"Simplified dataset: {X.shape}")
     print(f"Selected features: {len(selected_features)}")
     print("\nSelected features:")
@@ -66,8 +38,11 @@ def load_and_prepare_simple_data():
     
     return X, y, selected_features
 
-def train_and_save_simple_model():
-    """Train the simplified model and save it"""
+def train_and_save_simple_model(search='grid', n_jobs=-1, cache_dir='.training_cache'):
+    """
+    Train the simplified model and save it
+    search is 'grid' or 'halving'; CV results are cached in cache_dir (None disables it)
+    """
     print("🔄 Loading and preparing simplified data...")
     X, y, feature_names = load_and_prepare_simple_data()
     
@@ -119,26 +94,29 @@ def train_and_save_simple_model():
         }
     }
     
-    best_models = {}
-    
-    # Train and optimize each model
-    for name, model in models.items():
-        print(f"🔧 Optimizing {name}...")
-        grid_search = GridSearchCV(
-            model, 
-            param_grids[name], 
-            cv=5, 
-            scoring='accuracy',
-            n_jobs=-1
-        )
-        grid_search.fit(X_train, y_train)
-        best_models[name] = (grid_search.best_score_, grid_search.best_estimator_)
-        print(f"   ✅ {name} - Best score: {grid_search.best_score_:.4f}")
+    # Every (family, parameter set, fold) fit runs in one shared worker pool
+    orchestrator = TrainingOrchestrator(
+        {name: (model, param_grids[name]) for name, model in models.items()},
+        cv=5,
+        n_jobs=n_jobs,
+        cache_dir=cache_dir
+    )
+    if search == 'halving':
+        print("🔧 Optimizing all models (successive halving)...")
+        result = orchestrator.halving_search(X_train, y_train)
+    else:
+        print("🔧 Optimizing all models (grid search)...")
+        result = orchestrator.grid_search(X_train, y_train)
+    
+    for name, candidate in orchestrator.best_per_family(result).items():
+        print(f"   ✅ {name} - Best score: {candidate.mean_score:.4f}")
+    print(f"   ⏱️ Search took {result.elapsed:.1f}s")
     
     # Select best model
-    best_model_name = max(best_models.keys(), key=lambda k: best_models[k][0])
-    best_model_score = best_models[best_model_name][0]
-    best_model = best_models[best_model_name][1]
+    best_model_name = result.best.family
+    best_model_score = result.best.mean_score
+    best_model = orchestrator.build(result.best)
+    best_model.fit(X_train, y_train)
     
     print(f"\n🏆 Best model: {best_model_name} (Score: {best_model_score:.4f})")
     
@@ -146,6 +124,14 @@ def train_and_save_simple_model():
     model_final = clone(best_model)
     model_final.fit(X, y)
     
+    # Build the KNN neighbor index once, with the tree type and leaf size that query fastest
+    knn_index = None
+    if best_model_name == 'KNN':
+        knn_index = tune_tree_index(model_final)
+        knn_index.pop('timings')
+        print(f"🌲 KNN index: {knn_index['algorithm']}, leaf_size {knn_index['leaf_size']} "
+              f"({knn_index['query_us']:.0f} µs/query)")
+    
     # Test accuracy
     y_pred = best_model.predict(X_test)
     test_accuracy = accuracy_score(y_test, y_pred)
@@ -167,11 +153,21 @@ def train_and_save_simple_model():
         'is_simplified': True,
         'feature_count': len(feature_names)
     }
+    if knn_index is not None:
+        model_info['knn_index'] = knn_index
     joblib.dump(model_info, 'student_dropout_simple_model_info.pkl')
     
+    # Export plain arrays for the sklearn-free runtime
+    save_compiled_model(model_final, 'student_dropout_simple_model.npz', {'model_info': model_info})
+    
+    # Model, model info and checksum in one file
+    save_bundle(model_final, model_info, 'student_dropout_simple_model.bundle')
+    
     print("\n💾 Simplified model saved successfully!")
     print("- student_dropout_simple_model.pkl")
     print("- student_dropout_simple_model_info.pkl")
+    print("- student_dropout_simple_model.npz")
+    print("- student_dropout_simple_model.bundle")
     print(f"- Features: {len(feature_names)} (reduced from 36)")
     
     # Show feature importance if possible
@@ -187,6 +183,12 @@ def train_and_save_simple_model():
     return model_final, model_info
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and save the simplified model")
+    parser.add_argument('--search', choices=('grid', 'halving'), default='grid')
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--cache-dir', default='.training_cache', help="CV results cache ('' disables it)")
+    args = parser.parse_args()
+    
     print("🚀 Starting simplified model training...")
-    train_and_save_simple_model()
+    train_and_save_simple_model(args.search, args.n_jobs, args.cache_dir or None)
     print("\n✅ Simplified model ready for production!") 
\ No newline at end of file
@@ -1,24 +1,204 @@
+"""
+Application logging.
+
+Records are put on an in-memory queue by the calling thread and formatted and
+written to stderr by a QueueListener thread, so a request never waits on a
+write. Messages use logging's lazy %-style arguments (log_error("... %s", value)):
+the string is only built on the listener thread, and not at all when the level
+is disabled. LOG_FORMAT=json writes one JSON object per line with the request ID
+of the request that logged it.
+"""
+import atexit
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from config import settings
 
 logger = logging.getLogger(__name__)
 
-def setup_logger(level=logging.INFO):
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('[%(asctime)s] %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
+# ID of the request being handled by the current thread, set by the app
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, pid, request_id, message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'pid': record.process,
+            'message': record.getMessage()
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id is not None:
+            entry['request_id'] = request_id
+        suppressed = getattr(record, 'suppressed', None)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _RequestContextFilter(logging.Filter):
+    # Runs in the thread that logs, where the request's context variable is set
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener and drops records when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message here, on the request thread.
+        # The listener is in the same process, so the record can go as is; the
+        # arguments must not be mutated after the call, as with any lazy logging
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogSampler:
+    """
+    Lets at most `per_second` records per key through in each one-second window;
+    the first record of a later window reports how many were suppressed
+    """
+
+    def __init__(self, per_second: int, clock=time.monotonic):
+        self.per_second = per_second
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [window start, records let through, records suppressed]
+        self._windows: Dict[str, list] = {}
+
+    def allow(self, key: str) -> Tuple[bool, int]:
+        """(log this record, records suppressed since the last one logged)"""
+        if self.per_second <= 0:
+            return True, 0
+        now = self._clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                return True, suppressed
+            if window[1] < self.per_second:
+                window[1] += 1
+                return True, 0
+            window[2] += 1
+            return False, 0
+
+
+_handler: Optional[_LazyQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_sampler = LogSampler(settings.LOG_SAMPLE_PER_SECOND)
+
+
+def _make_output_handler(log_format: str) -> logging.Handler:
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+    return output
+
+
+def _start_listener(output: logging.Handler):
+    global _listener
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    # Writes out everything queued so far
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_in_child():
+    # The listener thread does not survive fork(). The child gets a new queue, as
+    # records other parent threads queued after the stop are the parent's to write
+    if _listener is not None:
+        _handler.queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+        _start_listener(_listener.handlers[0])
+
+
+def _restart_in_parent():
+    if _listener is not None:
+        _listener.start()
+
+
+def setup_logger(level=logging.INFO, log_format: Optional[str] = None):
+    """Attach the queue handler and start the listener thread (once per process)"""
+    global _handler
     logger.setLevel(level)
-    if not logger.hasHandlers():
-        logger.addHandler(handler)
+    if _handler is not None:
+        return
+
+    _handler = _LazyQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    _handler.addFilter(_RequestContextFilter())
+    logger.addHandler(_handler)
+    _start_listener(_make_output_handler(log_format or settings.LOG_FORMAT))
+
+    atexit.register(_stop_listener)
+    if hasattr(os, 'register_at_fork'):
+        # Stopping before fork flushes the queue and guarantees no thread holds its lock
+        os.register_at_fork(before=_stop_listener, after_in_parent=_restart_in_parent,
+                            after_in_child=_restart_in_child)
+
+
+def flush_logs():
+    """Wait until every queued record has been written"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+        _listener.start()
+
+
+def dropped_log_records() -> int:
+    """Records discarded because the queue was full"""
+    return _handler.dropped if _handler is not None else 0
+
 
-def log_info(message):
-    logger.info(message)
+def log_info(message, *args):
+    logger.info(message, *args)
 
-def log_warning(message):
-    logger.warning(message)
+def log_warning(message, *args):
+    logger.warning(message, *args)
 
-def log_error(message):
-    logger.error(message)
+def log_error(message, *args):
+    logger.error(message, *args)
 
-def log_debug(message):
-    logger.debug(message)
+def log_debug(message, *args):
+    logger.debug(message, *args)
 
+def log_sampled(key: str, level: int, message, *args):
+    """Log at most LOG_SAMPLE_PER_SECOND records per second for the key, for high-volume messages"""
+    if not logger.isEnabledFor(level):
+        return
+    allowed, suppressed = _sampler.allow(key)
+    if not allowed:
+        return
+    if suppressed:
+        logger.log(level, message + " (%d similar messages suppressed)", *args, suppressed,
+                   extra={'suppressed': suppressed})
+    else:
+        logger.log(level, message, *args)
@@ -1,5 +1,12 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List
+import io
+from csv import reader as csv_reader
+from dataclasses import dataclass, fields
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.validation import ValidationError
 
 
 @dataclass
@@ -70,6 +77,134 @@ class SimpleStudentData:
             'unemployment_rate': self.unemployment_rate
         }
 
+# SimpleStudentData fields in declaration order, and the NumPy dtype of each
+STUDENT_FIELDS = tuple(field.name for field in fields(SimpleStudentData))
+STUDENT_DTYPES = {
+    field.name: np.dtype(np.int64) if field.type is int else np.dtype(np.float64)
+    for field in fields(SimpleStudentData)
+}
+
+# Python types StudentBatch.from_records takes as is for each dtype (JSON numbers)
+_RECORD_TYPES = {np.dtype(np.int64): {int, bool}, np.dtype(np.float64): {float, int, bool}}
+
+_get_student_fields = itemgetter(*STUDENT_FIELDS)
+_get_student_attributes = attrgetter(*STUDENT_FIELDS)
+
+@dataclass
+class CompactStudentData:
+    """SimpleStudentData with __slots__ instead of a per-instance __dict__, for rows built in bulk"""
+    __slots__ = STUDENT_FIELDS
+    
+    age_at_enrollment: int
+    gender: int
+    marital_status: int
+    admission_grade: float
+    daytime_evening_attendance: int
+    scholarship_holder: int
+    tuition_fees_up_to_date: int
+    curricular_units_1st_sem_enrolled: int
+    curricular_units_1st_sem_approved: int
+    curricular_units_1st_sem_grade: float
+    curricular_units_2nd_sem_enrolled: int
+    curricular_units_2nd_sem_approved: int
+    curricular_units_2nd_sem_grade: float
+    unemployment_rate: float
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactStudentData':
+        """Create instance from dictionary"""
+        return cls(*_get_student_fields(data))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return dict(zip(STUDENT_FIELDS, _get_student_attributes(self)))
+
+class StudentBatch:
+    """
+    Students stored by column, one int64 or float64 array per SimpleStudentData
+    field, built from JSON records or CSV text without a Python object per row
+    """
+    __slots__ = ('columns',)
+    
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(columns[name]) for name in STUDENT_FIELDS}
+        if len(lengths) > 1:
+            raise ValueError("All columns of a StudentBatch must have the same length")
+        self.columns = columns
+    
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> 'StudentBatch':
+        """
+        Build from JSON objects whose fields are all plain numbers. Anything
+        else (a missing field, a string to convert) raises ValidationError, and
+        the caller can fall back to validate_dataclass_batch for per-row errors
+        """
+        columns = {}
+        for name in STUDENT_FIELDS:
+            dtype = STUDENT_DTYPES[name]
+            try:
+                values = list(map(itemgetter(name), records))
+            except KeyError:
+                raise ValidationError(f"Field '{name}' is required", name)
+            except (TypeError, IndexError):
+                raise ValidationError("Each item must be a JSON object")
+            if not set(map(type, values)) <= _RECORD_TYPES[dtype]:
+                raise ValidationError(f"Field '{name}' must be of type {dtype.name}", name)
+            try:
+                columns[name] = np.array(values, dtype=dtype)
+            except OverflowError:
+                raise ValidationError(f"Field '{name}' is out of range", name)
+        return cls(columns)
+    
+    @classmethod
+    def from_csv(cls, lines: Iterable[Union[str, bytes]], header: Optional[Sequence[str]] = None) -> 'StudentBatch':
+        """
+        Parse CSV lines with NumPy's C reader straight into typed columns.
+        Without header the first line is the header; other columns are ignored.
+        Integer fields only accept integer text, like int() does
+        """
+        lines = list(lines)
+        if lines and isinstance(lines[0], bytes):
+            lines = b'\n'.join(lines).decode('utf-8', errors='replace').split('\n')
+        if header is None:
+            if not lines:
+                raise ValidationError("CSV data has no header row")
+            header = next(csv_reader([lines[0]]))
+            lines = lines[1:]
+        
+        positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name in STUDENT_FIELDS if name not in positions]
+        if missing:
+            raise ValidationError(f"Field '{missing[0]}' is required", missing[0])
+        
+        lines = [line for line in lines if line.strip()]
+        if not lines:
+            return cls({name: np.empty(0, dtype=STUDENT_DTYPES[name]) for name in STUDENT_FIELDS})
+        try:
+            table = np.loadtxt(
+                io.StringIO('\n'.join(lines)), delimiter=',', quotechar='"', ndmin=1,
+                dtype=[(name, STUDENT_DTYPES[name]) for name in STUDENT_FIELDS],
+                usecols=[positions[name] for name in STUDENT_FIELDS]
+            )
+        except ValueError as e:
+            raise ValidationError(f"Invalid CSV data: {e}")
+        # Contiguous copies of the fields of the parsed records
+        return cls({name: np.ascontiguousarray(table[name]) for name in STUDENT_FIELDS})
+    
+    def __len__(self) -> int:
+        return len(self.columns[STUDENT_FIELDS[0]])
+    
+    def row(self, index: int) -> CompactStudentData:
+        """One student as a CompactStudentData"""
+        return CompactStudentData(*(self.columns[name][index].item() for name in STUDENT_FIELDS))
+    
+    def to_matrix(self, order: Sequence[str] = STUDENT_FIELDS) -> np.ndarray:
+        """float64 matrix with one row per student and the columns in the given field order"""
+        matrix = np.empty((len(self), len(order)), dtype=np.float64)
+        for j, name in enumerate(order):
+            matrix[:, j] = self.columns[name]
+        return matrix
+
 @dataclass
 class PredictionResponse:
     """Response for prediction endpoint"""
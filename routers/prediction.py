@@ -1,16 +1,54 @@
-from flask import Blueprint, jsonify, make_response, request
+import hmac
+import json
+import logging
+import os
+import signal
+from time import perf_counter
+from typing import Optional
 
-from logger import log_error
-from models.schemas import SimpleStudentData
+from flask import Blueprint, Response, current_app, g, jsonify, make_response, request, stream_with_context
+
+from config import settings
+from logger import log_error, log_sampled
+from models.schemas import CompactStudentData, SimpleStudentData, StudentBatch
+from services.explainer import METHODS as EXPLAIN_METHODS
+from services.metrics import (
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+    observe_phase,
+    render_gauges,
+    render_metrics,
+)
 from services.prediction_service import prediction_service
+from utils.http_cache import VersionedBodies, cache_control_header, conditional_response
+from utils.profiling import RequestProfiler, profiled
+from utils.streaming import iter_chunks, iter_csv_chunks, iter_csv_records, iter_lines, iter_ndjson_records
 from utils.validation import (
     ValidationError,
     create_error_response,
+    validate_dataclass_batch,
     validate_dataclass_data,
 )
 
 prediction_bp = Blueprint('prediction', __name__, url_prefix='/api')
 
+# Bodies of the metadata endpoints, serialized once per loaded model
+metadata_bodies = VersionedBodies()
+
+# Opt-in profiling of /api/predict, toggled per process by /api/admin/profiling
+request_profiler = RequestProfiler(
+    enabled=settings.PROFILING_ENABLED,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    mode=settings.PROFILING_MODE,
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+    output_dir=settings.PROFILING_DIR,
+    max_files=settings.PROFILING_MAX_FILES
+)
+
+# Set by serve.py to the prefork parent's pid: a worker then asks the parent to
+# reload, so every worker moves to the new model together
+reload_parent_pid: Optional[int] = None
+
 def add_cors_headers(response):
     """Add CORS headers to response"""
     response.headers['Access-Control-Allow-Origin'] = '*'
@@ -18,29 +56,138 @@ def add_cors_headers(response):
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept'
     return response
 
+@prediction_bp.before_request
+def start_request_timer():
+    """Start timing the request for the latency histograms"""
+    g.request_started = perf_counter()
+
+@prediction_bp.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency by endpoint"""
+    started = g.get('request_started')
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.observe((endpoint,), perf_counter() - started)
+        REQUESTS_TOTAL.inc((endpoint, request.method, response.status_code))
+    return response
+
+def uses_compact_json() -> bool:
+    """True when jsonify writes compact JSON, which is what the pre-encoded bodies match"""
+    provider = current_app.json
+    compact = getattr(provider, 'compact', None)
+    if compact is False or (compact is None and current_app.debug):
+        return False
+    return getattr(provider, 'sort_keys', True) and getattr(provider, 'ensure_ascii', True)
+
+def check_admin_token():
+    """Return an error response unless the request carries the configured admin token"""
+    if not settings.ADMIN_TOKEN:
+        # Admin endpoints stay closed until a token is configured
+        response = make_response(jsonify({"error": "Admin endpoints are disabled, ADMIN_TOKEN is not set"}), 403)
+        return add_cors_headers(response)
+    token = request.headers.get('X-Admin-Token', '')
+    if hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        return None
+    response = make_response(jsonify({"error": "Invalid admin token"}), 403)
+    return add_cors_headers(response)
+
+def profile_requested() -> bool:
+    """True when the request asks to be profiled with X-Profile and carries the admin token"""
+    if request.headers.get('X-Profile', '') in ('', '0'):
+        return False
+    return check_admin_token() is None
+
+def metadata_response(name: str, build):
+    """
+    Conditional response for a metadata endpoint: the body build() returns is
+    serialized once per model version and answered with 304 when unchanged.
+    Returns None, without caching, when build() returns None
+    """
+    def serialize():
+        data = build()
+        return None if data is None else jsonify(data).get_data()
+    
+    key = (prediction_service.model_version, prediction_service.is_model_loaded())
+    cached = metadata_bodies.get(name, key, serialize)
+    if cached is None:
+        return None
+    body, etag = cached
+    response = conditional_response(body, etag, cache_control_header(settings.METADATA_CACHE_MAX_AGE))
+    return add_cors_headers(response)
+
+def score_records(records: list, first_index: int = 0, batch: StudentBatch = None):
+    """
+    Score a list of records with one model call. When they are all complete
+    and numeric (or a parsed batch is given) they are scored by column;
+    otherwise each record is validated for its own error.
+    Returns (results with their index, records scored, model_info)
+    """
+    if batch is None:
+        try:
+            batch = StudentBatch.from_records(records)
+        except ValidationError:
+            pass
+    
+    if batch is not None:
+        if not len(batch):
+            return [], 0, None
+        predictions, probabilities, classes, model_info = prediction_service.predict_student_batch(batch)
+        labels = [str(prediction) for prediction in predictions.tolist()]
+        if probabilities is None:
+            confidences = [{"prediction_only": 1.0} for _ in labels]
+        else:
+            confidences = [dict(zip(classes, row)) for row in probabilities.tolist()]
+        results = [
+            {"index": first_index + offset, "prediction": label, "confidence": confidence}
+            for offset, (label, confidence) in enumerate(zip(labels, confidences))
+        ]
+        return results, len(results), model_info
+    
+    validated_items, errors = validate_dataclass_batch(SimpleStudentData, records)
+    for offset, record in enumerate(records):
+        if isinstance(record, ValidationError):
+            errors[offset] = record
+    
+    valid_offsets = [i for i, item in enumerate(validated_items) if item is not None]
+    predictions = prediction_service.predict_batch(
+        [CompactStudentData.from_dict(validated_items[i]) for i in valid_offsets]
+    )
+    
+    results = [None] * len(records)
+    model_info = None
+    for offset, prediction in zip(valid_offsets, predictions):
+        model_info = prediction.model_info
+        results[offset] = {
+            "index": first_index + offset,
+            "prediction": prediction.prediction,
+            "confidence": prediction.confidence
+        }
+    for offset, error in errors.items():
+        results[offset] = {"index": first_index + offset, **create_error_response(error)}
+    return results, len(valid_offsets), model_info
+
 @prediction_bp.route('/', methods=['GET'])
 def root():
     """Root endpoint"""
-    response = make_response(jsonify({
+    return metadata_response('root', lambda: {
         "message": "Student Dropout Prediction API",
         "status": "running",
         "model_loaded": prediction_service.is_model_loaded(),
         "features": len(prediction_service.model_info.get('feature_names', [])) if prediction_service.model_info else 0,
         "version": "2.0.0"
-    }))
-    return add_cors_headers(response)
+    })
 
 @prediction_bp.route('/model-info', methods=['GET'])
 def get_model_info():
     """Get model information"""
-    model_info = prediction_service.get_model_info()
-    if model_info is None:
+    response = metadata_response('model_info', prediction_service.get_model_info)
+    if response is None:
         response = make_response(jsonify({"error": "Model not loaded"}), 503)
-    else:
-        response = make_response(jsonify(model_info))
-    return add_cors_headers(response)
+        return add_cors_headers(response)
+    return response
 
 @prediction_bp.route('/predict', methods=['POST', 'OPTIONS'])
+@profiled(request_profiler, profile_requested)
 def predict_student_status():
     """Predict student dropout status"""
     if request.method == 'OPTIONS':
@@ -52,29 +199,181 @@ def predict_student_status():
         return add_cors_headers(response)
     
     try:
+        started = perf_counter()
         data = request.get_json()
+        observe_phase('json_parse', perf_counter() - started)
         if not data:
             response = make_response(jsonify({"error": "No JSON data provided"}), 400)
             return add_cors_headers(response)
         
+        started = perf_counter()
         validated_data = validate_dataclass_data(SimpleStudentData, data)
+        observe_phase('validate', perf_counter() - started)
         
+        started = perf_counter()
         student_data = SimpleStudentData.from_dict(validated_data)
+        observe_phase('from_dict', perf_counter() - started)
         
-        result = prediction_service.predict(student_data)
-        
-        response = make_response(jsonify(result.to_dict()))
+        if uses_compact_json():
+            # Body encoded by the service from pre-encoded fragments, no jsonify
+            body = prediction_service.predict_json(student_data)
+            response = make_response(Response(body, mimetype=current_app.json.mimetype))
+        else:
+            result = prediction_service.predict(student_data)
+            
+            started = perf_counter()
+            response = make_response(jsonify(result.to_dict()))
+            observe_phase('jsonify', perf_counter() - started)
         return add_cors_headers(response)
         
     except ValidationError as e:
-        log_error(f"Validation error: {e.message}")
+        log_sampled('validation', logging.ERROR, "Validation error: %s", e.message)
         response = make_response(jsonify(create_error_response(e)), 400)
         return add_cors_headers(response)
     except Exception as e:
-        log_error(f"Prediction error: {str(e)}")
+        log_error("Prediction error: %s", e)
         response = make_response(jsonify({"error": f"Prediction error: {str(e)}"}), 400)
         return add_cors_headers(response)
 
+@prediction_bp.route('/predict/batch', methods=['POST', 'OPTIONS'])
+def predict_batch():
+    """Predict dropout status for a list of students in one call"""
+    if request.method == 'OPTIONS':
+        response = make_response()
+        return add_cors_headers(response)
+    
+    if not prediction_service.is_model_loaded():
+        response = make_response(jsonify({"error": "Model not loaded"}), 503)
+        return add_cors_headers(response)
+    
+    try:
+        data = request.get_json()
+        students = data.get('students') if isinstance(data, dict) else data
+        if not isinstance(students, list) or not students:
+            response = make_response(jsonify({"error": "Expected a non-empty list of students"}), 400)
+            return add_cors_headers(response)
+        
+        if len(students) > settings.BATCH_MAX_SIZE:
+            response = make_response(jsonify({
+                "error": f"Batch size {len(students)} exceeds the limit of {settings.BATCH_MAX_SIZE}"
+            }), 413)
+            return add_cors_headers(response)
+        
+        results, succeeded, model_info = score_records(students)
+        
+        response = make_response(jsonify({
+            "total": len(students),
+            "succeeded": succeeded,
+            "failed": len(students) - succeeded,
+            "model_info": model_info,
+            "results": results
+        }))
+        return add_cors_headers(response)
+        
+    except Exception as e:
+        log_error("Batch prediction error: %s", e)
+        response = make_response(jsonify({"error": f"Prediction error: {str(e)}"}), 400)
+        return add_cors_headers(response)
+
+@prediction_bp.route('/predict/stream', methods=['POST', 'OPTIONS'])
+def predict_stream():
+    """Score an NDJSON or CSV body chunk by chunk and stream NDJSON results back"""
+    if request.method == 'OPTIONS':
+        response = make_response()
+        return add_cors_headers(response)
+    
+    if not prediction_service.is_model_loaded():
+        response = make_response(jsonify({"error": "Model not loaded"}), 503)
+        return add_cors_headers(response)
+    
+    is_csv = 'csv' in (request.content_type or '')
+    lines = iter_lines(request.stream, max_line_length=settings.STREAM_MAX_LINE_BYTES)
+    if is_csv:
+        # Raw lines, parsed by column per chunk
+        chunks = iter_csv_chunks(lines, settings.STREAM_CHUNK_SIZE)
+    else:
+        chunks = iter_chunks(iter_ndjson_records(lines), settings.STREAM_CHUNK_SIZE)
+    
+    def generate():
+        total = succeeded = 0
+        model_info = None
+        try:
+            for chunk in chunks:
+                records, batch = chunk, None
+                if is_csv:
+                    header, lines = chunk
+                    try:
+                        records, batch = [], StudentBatch.from_csv(lines, header)
+                    except ValidationError:
+                        # Row by row, so every bad row gets its own error
+                        records = list(iter_csv_records(lines, header))
+                
+                results, scored, chunk_model_info = score_records(records, total, batch)
+                model_info = chunk_model_info or model_info
+                total += len(results)
+                succeeded += scored
+                yield ''.join(json.dumps(result) + '\n' for result in results)
+        except ValidationError as e:
+            # A line over STREAM_MAX_LINE_BYTES; the rest of the body is not read
+            log_sampled('validation', logging.ERROR, "Stream rejected: %s", e.message)
+            yield json.dumps({"error": e.message, "index": total}) + '\n'
+            return
+        except Exception as e:
+            # The status line is already sent, so the failure is reported in the stream
+            log_error("Stream prediction error: %s", e)
+            yield json.dumps({"error": f"Prediction error: {str(e)}", "index": total}) + '\n'
+            return
+        
+        yield json.dumps({"summary": {
+            "total": total,
+            "succeeded": succeeded,
+            "failed": total - succeeded,
+            "model_info": model_info
+        }}) + '\n'
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    return add_cors_headers(response)
+
+@prediction_bp.route('/explain', methods=['POST', 'OPTIONS'])
+def explain_prediction():
+    """Predict one student's status and explain each feature's contribution"""
+    if request.method == 'OPTIONS':
+        response = make_response()
+        return add_cors_headers(response)
+    
+    if not prediction_service.is_model_loaded():
+        response = make_response(jsonify({"error": "Model not loaded"}), 503)
+        return add_cors_headers(response)
+    
+    method = request.args.get('method', 'auto')
+    if method not in EXPLAIN_METHODS:
+        response = make_response(jsonify({"error": f"method must be one of {', '.join(EXPLAIN_METHODS)}"}), 400)
+        return add_cors_headers(response)
+    
+    try:
+        data = request.get_json()
+        if not data:
+            response = make_response(jsonify({"error": "No JSON data provided"}), 400)
+            return add_cors_headers(response)
+        
+        student_data = SimpleStudentData.from_dict(validate_dataclass_data(SimpleStudentData, data))
+        explanation = prediction_service.explain(student_data, method)
+        if explanation is None:
+            response = make_response(jsonify({"error": "Explanations not available for the loaded model"}), 503)
+            return add_cors_headers(response)
+        
+        response = make_response(jsonify(explanation))
+        return add_cors_headers(response)
+        
+    except ValidationError as e:
+        log_sampled('validation', logging.ERROR, "Validation error: %s", e.message)
+        response = make_response(jsonify(create_error_response(e)), 400)
+        return add_cors_headers(response)
+    except Exception as e:
+        log_error("Explanation error: %s", e)
+        response = make_response(jsonify({"error": f"Explanation error: {str(e)}"}), 400)
+        return add_cors_headers(response)
+
 @prediction_bp.route('/predict-example', methods=['POST'])
 def predict_example():
     """Endpoint with simplified example data for testing"""
@@ -105,10 +404,109 @@ def predict_example():
         response = make_response(jsonify(result.to_dict()))
         return add_cors_headers(response)
     except Exception as e:
-        log_error(f"Example prediction error: {str(e)}")
+        log_error("Example prediction error: %s", e)
         response = make_response(jsonify({"error": f"Prediction error: {str(e)}"}), 400)
         return add_cors_headers(response)
 
+@prediction_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Get prediction cache hit, miss and eviction counters"""
+    response = make_response(jsonify(prediction_service.get_cache_stats()))
+    return add_cors_headers(response)
+
+@prediction_bp.route('/micro-batch-stats', methods=['GET'])
+def get_micro_batch_stats():
+    """Get micro-batcher batch fill and queue wait statistics"""
+    stats = prediction_service.get_micro_batch_stats()
+    if stats is None:
+        response = make_response(jsonify({"enabled": False}))
+    else:
+        response = make_response(jsonify({"enabled": True, **stats}))
+    return add_cors_headers(response)
+
+@prediction_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request counts, latency histograms and cache counters in Prometheus text format"""
+    extra_lines = render_gauges(
+        'prediction_cache', 'Prediction cache counters and size',
+        {key: value for key, value in prediction_service.get_cache_stats().items()
+         if key in ('hits', 'misses', 'evictions', 'expirations', 'size')},
+        'stat'
+    )
+    micro_batch_stats = prediction_service.get_micro_batch_stats()
+    if micro_batch_stats is not None:
+        extra_lines += render_gauges(
+            'micro_batch', 'Micro-batcher fill and queue wait statistics',
+            {key: value for key, value in micro_batch_stats.items()
+             if key in ('batches', 'items', 'avg_batch_size', 'avg_fill_ratio', 'avg_wait_ms', 'max_wait_observed_ms')},
+            'stat'
+        )
+    
+    response = make_response(render_metrics(extra_lines))
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return add_cors_headers(response)
+
+@prediction_bp.route('/admin/reload-model', methods=['POST'])
+def reload_model():
+    """Reload the model from disk and swap it in without dropping requests"""
+    error_response = check_admin_token()
+    if error_response is not None:
+        return error_response
+    
+    previous_version = prediction_service.model_version
+    if reload_parent_pid is not None:
+        # Same as SIGHUP to serve.py: reload in the parent and replace all workers
+        try:
+            os.kill(reload_parent_pid, signal.SIGHUP)
+        except OSError as e:
+            log_error("Reload request to the server process failed: %s", e)
+            response = make_response(jsonify({
+                "error": "Model reload failed",
+                "model_version": previous_version
+            }), 500)
+            return add_cors_headers(response)
+        response = make_response(jsonify({
+            "message": "Model reload requested from the server process",
+            "previous_version": previous_version
+        }), 202)
+        return add_cors_headers(response)
+    
+    if not prediction_service.load_model():
+        response = make_response(jsonify({
+            "error": "Model reload failed",
+            "model_version": previous_version
+        }), 500)
+        return add_cors_headers(response)
+    
+    response = make_response(jsonify({
+        "message": "Model reloaded",
+        "previous_version": previous_version,
+        "model_version": prediction_service.model_version
+    }))
+    return add_cors_headers(response)
+
+@prediction_bp.route('/admin/profiling', methods=['GET', 'POST'])
+def profiling_settings():
+    """Show or change the request profiler settings of this process"""
+    error_response = check_admin_token()
+    if error_response is not None:
+        return error_response
+    
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        try:
+            request_profiler.configure(
+                enabled=bool(data['enabled']) if 'enabled' in data else None,
+                sample_rate=float(data['sample_rate']) if 'sample_rate' in data else None,
+                mode=data.get('mode')
+            )
+        except (TypeError, ValueError) as e:
+            response = make_response(jsonify({"error": str(e)}), 400)
+            return add_cors_headers(response)
+    
+    response = make_response(jsonify(request_profiler.status()))
+    return add_cors_headers(response)
+
 @prediction_bp.route('/features', methods=['GET'])
 def get_features():
     """Get list of features with descriptions"""
@@ -117,14 +515,13 @@ def get_features():
         return add_cors_headers(response)
     
     try:
-        features_info = prediction_service.get_features_info()
-        if features_info is None:
+        response = metadata_response('features', prediction_service.get_features_info)
+        if response is None:
             response = make_response(jsonify({"error": "Model not loaded"}), 503)
             return add_cors_headers(response)
         
-        response = make_response(jsonify(features_info))
-        return add_cors_headers(response)
+        return response
     except Exception as e:
-        log_error(f"Features error: {str(e)}")
+        log_error("Features error: %s", e)
         response = make_response(jsonify({"error": f"Error getting features: {str(e)}"}), 500)
         return add_cors_headers(response) 
\ No newline at end of file
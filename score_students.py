@@ -0,0 +1,163 @@
+"""
+Offline bulk scoring of a CSV or Parquet file of students.
+
+The input columns must use the training names in model_info['feature_names']
+(e.g. "Age at enrollment"); extra columns are ignored unless listed in
+--keep-columns. The output has one row per input row, in input order, with
+the kept columns, the predicted class and one probability column per class.
+
+    python score_students.py students.csv predictions.csv
+    python score_students.py students.parquet predictions.parquet --workers 8 --keep-columns "Student ID"
+
+The input is read in chunks and the chunks are scored by a process pool, each
+worker holding its own copy of the model (shared with the parent on fork).
+Only a few chunks per worker are in flight at a time, so memory stays bounded
+however large the input is. Parquet needs pyarrow installed.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+import pandas as pd
+
+from services.prediction_service import PredictionService
+
+# Model used by this process, set in the parent before forking or by _init_worker
+_service = None
+
+
+def _init_worker():
+    global _service
+    if _service is None or not _service.is_model_loaded():
+        _service = PredictionService()
+        if not _service.load_model():
+            raise RuntimeError("Model failed to load in worker")
+
+
+def _score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    predictions, probabilities, classes = _service.predict_frame(chunk)
+    scored = pd.DataFrame({'prediction': predictions}, index=chunk.index)
+    if probabilities is not None:
+        for i, cls in enumerate(classes):
+            scored[f'prob_{cls}'] = probabilities[:, i]
+    return scored
+
+
+def _file_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return 'parquet' if path.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def read_chunks(path: str, file_format: str, chunk_size: int, columns: list):
+    """Yield DataFrames of at most chunk_size rows with only the given columns"""
+    if file_format == 'parquet':
+        pyarrow = _import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path: str, file_format: str):
+        self.path = path
+        self.file_format = file_format
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, frame: pd.DataFrame):
+        if self.file_format == 'parquet':
+            pyarrow = _import_pyarrow()
+            table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='a' if self._wrote_header else 'w',
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(input_path: str, output_path: str, workers: int = None, chunk_size: int = 50000,
+               keep_columns: list = (), input_format: str = None, output_format: str = None) -> int:
+    """Score input_path into output_path and return the number of rows scored"""
+    global _service
+    _service = PredictionService()
+    if not _service.load_model():
+        raise RuntimeError("Model failed to load")
+
+    feature_names = list(_service.model_info['feature_names'])
+    columns = list(keep_columns) + [name for name in feature_names if name not in keep_columns]
+    chunks = read_chunks(input_path, _file_format(input_path, input_format), chunk_size, columns)
+    writer = ChunkWriter(output_path, _file_format(output_path, output_format))
+    workers = workers or os.cpu_count() or 1
+
+    def write(chunk, scored):
+        writer.write(pd.concat([chunk[list(keep_columns)], scored], axis=1))
+        return len(chunk)
+
+    rows = 0
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                rows += write(chunk, _score_chunk(chunk))
+            return rows
+
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            # Bounded window of pending chunks, written back in submission order
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk[list(keep_columns)],
+                                pool.apply_async(_score_chunk, (chunk[feature_names],))))
+                if len(pending) >= workers * 2:
+                    kept, result = pending.popleft()
+                    rows += write(kept, result.get())
+            while pending:
+                kept, result = pending.popleft()
+                rows += write(kept, result.get())
+        return rows
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='CSV or Parquet file with the training column names')
+    parser.add_argument('output', help='CSV or Parquet file for the predictions')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Rows per chunk')
+    parser.add_argument('--keep-columns', default='', help='Comma-separated input columns copied to the output')
+    parser.add_argument('--input-format', choices=('csv', 'parquet'), help='Default: from the file extension')
+    parser.add_argument('--output-format', choices=('csv', 'parquet'), help='Default: from the file extension')
+    args = parser.parse_args()
+
+    keep_columns = [column.strip() for column in args.keep_columns.split(',') if column.strip()]
+    started = time.perf_counter()
+    rows = score_file(args.input, args.output, args.workers, args.chunk_size, keep_columns,
+                      args.input_format, args.output_format)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Scored {rows} students in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""
+Prefork production server for the API.
+
+The parent process creates the app and loads the model once, then calls
+gc.freeze() so the model's objects sit in the permanent GC generation: a
+collection in a worker never touches them, so their memory pages stay shared
+copy-on-write with the parent instead of being copied into every worker.
+The workers are forked from the parent and accept connections on one shared
+listening socket, each serving one request at a time.
+
+    python serve.py --workers 4
+    python serve.py --workers 8 --port 8000 --max-requests 20000 --max-requests-jitter 2000
+
+Signals to the parent process:
+
+    SIGHUP           reload the model in the parent, start new workers with it
+                     and stop the old ones once their current request is done
+                     (POST /api/admin/reload-model sends this from a worker)
+    SIGTERM, SIGINT  graceful shutdown, waiting up to --graceful-timeout seconds
+
+With --max-requests a worker exits after that many requests (plus a random
+jitter, so workers do not all restart at once) and is replaced. When
+MODEL_WATCH_INTERVAL is set, the parent polls the model files and reloads like
+on SIGHUP when they change.
+"""
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from config import settings
+from logger import log_info, log_warning
+
+# How often the parent checks its workers and signals, in seconds
+_MASTER_TICK = 0.2
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # One request per connection: a worker serves one connection at a time,
+    # so a kept-alive idle client would block it
+    protocol_version = "HTTP/1.0"
+
+
+class _QuietRequestHandler(_RequestHandler):
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+class _WorkerServer(BaseWSGIServer):
+    """Werkzeug server on an inherited listening socket that counts handled requests"""
+
+    multiprocess = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handled = 0
+
+    def finish_request(self, request, client_address):
+        self.handled += 1
+        super().finish_request(request, client_address)
+
+
+def _run_worker(app, listener: socket.socket, max_requests: int, access_log: bool) -> int:
+    """Serve requests in a forked worker until told to stop or recycled"""
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    # Ctrl-C reaches the whole process group; the parent decides how to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    host, port = listener.getsockname()[:2]
+    server = _WorkerServer(host, port, app, handler=_RequestHandler if access_log else _QuietRequestHandler,
+                           fd=listener.fileno())
+    server.timeout = 0.5
+    while not stopping and (not max_requests or server.handled < max_requests):
+        server.handle_request()
+    return 0
+
+
+class Arbiter:
+    """Parent process: owns the listening socket and the model, forks and supervises workers"""
+
+    def __init__(self, app, service, host: str, port: int, workers: int, max_requests: int = 0,
+                 max_requests_jitter: int = 0, graceful_timeout: float = 30.0, watch_interval: float = 0,
+                 access_log: bool = False, backlog: int = 2048):
+        self.app = app
+        self.service = service
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+
+        self.listener = socket.create_server((host, port), backlog=backlog)
+        # Workers race for each connection; a loser's accept() must fail, not block
+        self.listener.setblocking(False)
+
+        self._pids: Dict[int, float] = {}
+        self._retiring: Dict[int, float] = {}
+        self._reload_requested = False
+        self._stop_requested = False
+
+        self._watcher = None
+        if watch_interval > 0:
+            from services.model_watcher import ModelWatcher
+            # Polled from the main loop: a thread in the parent would not exist in the workers
+            # and could hold a lock at fork time
+            self._watcher = ModelWatcher(self, watch_interval)
+            self._watch_interval = watch_interval
+            self._next_watch = time.monotonic() + watch_interval
+            self._pending_signature = None
+
+    @property
+    def address(self):
+        return self.listener.getsockname()[:2]
+
+    # ModelWatcher interface
+    def get_model_paths(self) -> List[str]:
+        return self.service.get_model_paths()
+
+    def load_model(self) -> bool:
+        return self.reload()
+
+    def _freeze(self):
+        # Everything allocated so far (the app, the model) becomes invisible to
+        # the collector, so no worker's collection writes to those pages
+        gc.collect()
+        gc.freeze()
+
+    def _spawn_worker(self):
+        max_requests = self.max_requests
+        if max_requests and self.max_requests_jitter:
+            max_requests += random.randint(0, self.max_requests_jitter)
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                random.seed()
+                code = _run_worker(self.app, self.listener, max_requests, self.access_log)
+            finally:
+                os._exit(code)
+        self._pids[pid] = time.monotonic()
+
+    def _spawn_workers(self):
+        while len(self._pids) < self.workers:
+            self._spawn_worker()
+
+    def _retire(self, pids):
+        """Ask workers to finish their current request and exit"""
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            self._pids.pop(pid, None)
+            self._retiring[pid] = deadline
+            self._kill(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _kill(pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if self._retiring.pop(pid, None) is not None:
+                continue
+            started = self._pids.pop(pid, None)
+            if started is not None and not self._stop_requested:
+                code = os.waitstatus_to_exitcode(status)
+                if code == 0:
+                    log_info("♻️ Worker %d recycled after its request limit, starting a replacement", pid)
+                else:
+                    log_warning("⚠️ Worker %d exited with status %d, starting a replacement", pid, code)
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now >= deadline:
+                log_warning("⚠️ Worker %d did not stop within %ss, killing it", pid, self.graceful_timeout)
+                self._kill(pid, signal.SIGKILL)
+                self._retiring[pid] = float('inf')
+
+    def reload(self) -> bool:
+        """Load the model again in the parent and replace the workers; old ones finish their request"""
+        log_info("🔄 Reloading the model in the parent process...")
+        gc.unfreeze()
+        loaded = self.service.load_model()
+        self._freeze()
+        if not loaded:
+            log_warning("⚠️ Model reload failed, keeping the current workers")
+            return False
+
+        old = list(self._pids)
+        self._pids.clear()
+        self._spawn_workers()
+        self._retire(old)
+        log_info("✅ %d workers started with the new model", len(self._pids))
+        return True
+
+    def _on_hup(self, signum, frame):
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame):
+        self._stop_requested = True
+
+    def _watch(self):
+        if self._watcher is None or time.monotonic() < self._next_watch:
+            return
+        self._next_watch = time.monotonic() + self._watch_interval
+        self._pending_signature = self._watcher.check(self._pending_signature)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGHUP, self._on_hup)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        self._freeze()
+        host, port = self.address
+        log_info("🚀 Serving on http://%s:%d with %d workers (parent pid %d)", host, port, self.workers, os.getpid())
+        self._spawn_workers()
+
+        while not self._stop_requested:
+            time.sleep(_MASTER_TICK)
+            self._reap()
+            if self._stop_requested:
+                break
+            if self._reload_requested:
+                self._reload_requested = False
+                self.reload()
+            self._watch()
+            self._kill_overdue()
+            self._spawn_workers()
+
+        log_info("🛑 Shutting down, waiting for workers to finish their requests...")
+        self._retire(list(self._pids))
+        while self._retiring:
+            time.sleep(_MASTER_TICK)
+            self._reap()
+            self._kill_overdue()
+        self.listener.close()
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=settings.HOST)
+    parser.add_argument('--port', type=int, default=settings.PORT)
+    parser.add_argument('--workers', type=int, default=settings.SERVE_WORKERS or os.cpu_count() or 1)
+    parser.add_argument('--max-requests', type=int, default=settings.SERVE_MAX_REQUESTS,
+                        help='Recycle a worker after this many requests (0 never)')
+    parser.add_argument('--max-requests-jitter', type=int, default=settings.SERVE_MAX_REQUESTS_JITTER)
+    parser.add_argument('--graceful-timeout', type=float, default=settings.SERVE_GRACEFUL_TIMEOUT)
+    parser.add_argument('--access-log', action='store_true', help='Log every request')
+    args = parser.parse_args(argv)
+
+    # The model must be loaded in the parent before forking, and the watcher
+    # runs in the parent's main loop instead of a thread
+    watch_interval = settings.MODEL_WATCH_INTERVAL
+    settings.MODEL_BACKGROUND_LOAD = False
+    settings.MODEL_WATCH_INTERVAL = 0
+
+    import routers.prediction as prediction_router
+    from core.app_factory import create_app
+    from services.prediction_service import prediction_service
+
+    app = create_app()
+    # /api/admin/reload-model in a worker signals this process instead of
+    # reloading only that worker
+    prediction_router.reload_parent_pid = os.getpid()
+    if not prediction_service.is_model_loaded():
+        log_warning("⚠️ Starting without a model; prediction endpoints answer 503 until a reload")
+
+    arbiter = Arbiter(app, prediction_service, args.host, args.port, args.workers, args.max_requests,
+                      args.max_requests_jitter, args.graceful_timeout, watch_interval, args.access_log)
+    return arbiter.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+sklearn-free runtime for the fitted student dropout Pipeline.
+
+export_pipeline_arrays turns a fitted StandardScaler + SVC/KNN/CART/GaussianNB
+pipeline into plain NumPy arrays, and CompiledModel scores them again with
+NumPy only. Nothing in this module imports sklearn.
+"""
+import json
+from typing import Any, Dict
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# libsvm clips pairwise probabilities to this range before coupling them
+_MIN_PROBABILITY = 1e-7
+
+
+def export_pipeline_arrays(pipeline) -> Dict[str, Any]:
+    """Extract the arrays needed to score a fitted Pipeline without sklearn"""
+    steps = [step for _, step in pipeline.steps]
+    if len(steps) != 2:
+        raise ValueError("Expected a Pipeline with a StandardScaler and one classifier")
+    scaler, estimator = steps
+    n_features = len(scaler.mean_) if scaler.mean_ is not None else scaler.n_features_in_
+
+    arrays = {
+        'classes': np.asarray(estimator.classes_).astype(str),
+        'scaler_mean': (np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean
+                        else np.zeros(n_features)),
+        'scaler_scale': (np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std
+                         else np.ones(n_features)),
+    }
+
+    estimator_type = type(estimator).__name__
+    if estimator_type == 'SVC':
+        if estimator.kernel not in ('linear', 'rbf'):
+            raise ValueError(f"Unsupported SVC kernel: {estimator.kernel}")
+        if not estimator.probability:
+            raise ValueError("SVC must be fitted with probability=True")
+        family = 'svc'
+        arrays.update({
+            'support_vectors': estimator.support_vectors_,
+            'n_support': estimator.n_support_.astype(np.int64),
+            'dual_coef': estimator._dual_coef_,
+            'intercept': estimator._intercept_,
+            'prob_a': estimator.probA_,
+            'prob_b': estimator.probB_,
+            'gamma': np.array(estimator._gamma if estimator.kernel == 'rbf' else 0.0),
+            'kernel': np.array(estimator.kernel),
+        })
+    elif estimator_type == 'KNeighborsClassifier':
+        if estimator.weights != 'uniform' or estimator.effective_metric_ != 'euclidean':
+            raise ValueError("Only uniform-weight euclidean KNN is supported")
+        family = 'knn'
+        arrays.update({
+            'fit_x': estimator._fit_X,
+            'fit_y': estimator._y.astype(np.int64),
+            'n_neighbors': np.array(estimator.n_neighbors),
+        })
+    elif estimator_type == 'DecisionTreeClassifier':
+        tree = estimator.tree_
+        family = 'cart'
+        arrays.update({
+            'children_left': tree.children_left.astype(np.int64),
+            'children_right': tree.children_right.astype(np.int64),
+            'feature': tree.feature.astype(np.int64),
+            'threshold': tree.threshold,
+            'value': tree.value[:, 0, :],
+        })
+    elif estimator_type == 'GaussianNB':
+        family = 'nb'
+        arrays.update({
+            'theta': estimator.theta_,
+            'var': estimator.var_,
+            'class_prior': estimator.class_prior_,
+        })
+    else:
+        raise ValueError(f"Unsupported estimator: {estimator_type}")
+
+    arrays['family'] = np.array(family)
+    return {
+        name: np.ascontiguousarray(value) if np.ndim(value) else np.asarray(value)
+        for name, value in arrays.items()
+    }
+
+
+def save_compiled_model(pipeline, path: str, metadata: Dict[str, Any] = None):
+    """Export a fitted Pipeline to an uncompressed .npz file"""
+    arrays = export_pipeline_arrays(pipeline)
+    arrays['format_version'] = np.array(FORMAT_VERSION)
+    arrays['metadata'] = np.array(json.dumps(metadata or {}, default=str))
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def _sigmoid_predict(decision, prob_a, prob_b):
+    """libsvm's numerically stable Platt sigmoid"""
+    f_ap_b = decision * prob_a + prob_b
+    positive = f_ap_b >= 0
+    exp_term = np.exp(-np.abs(f_ap_b))
+    return np.where(positive, exp_term / (1.0 + exp_term), 1.0 / (1.0 + exp_term))
+
+
+def _couple_pairwise_probabilities(pairwise: np.ndarray) -> np.ndarray:
+    """
+    Vectorized port of libsvm's multiclass_probability (Wu, Lin and Weng, method 2).
+    pairwise[n, i, j] is the probability of class i against class j for row n.
+    Rows are updated in lockstep but each row stops at its own convergence point,
+    exactly like the per-row loop in libsvm.
+    """
+    n_rows, k, _ = pairwise.shape
+    max_iter = max(100, k)
+    eps = 0.005 / k
+
+    Q = -pairwise.transpose(0, 2, 1) * pairwise
+    squared = pairwise ** 2
+    diagonal = squared.sum(axis=1) - squared[:, np.arange(k), np.arange(k)]
+    Q[:, np.arange(k), np.arange(k)] = diagonal
+
+    p = np.full((n_rows, k), 1.0 / k)
+    active = np.ones(n_rows, dtype=bool)
+    for _ in range(max_iter):
+        Qp = np.einsum('nij,nj->ni', Q, p)
+        pQp = np.einsum('ni,ni->n', p, Qp)
+        max_error = np.abs(Qp - pQp[:, None]).max(axis=1)
+        active &= max_error >= eps
+        if not active.any():
+            break
+
+        rows = np.flatnonzero(active)
+        q, pr, qp, pqp = Q[rows], p[rows], Qp[rows], pQp[rows]
+        for t in range(k):
+            q_tt = q[:, t, t]
+            diff = (-qp[:, t] + pqp) / q_tt
+            pr[:, t] += diff
+            pqp = (pqp + diff * (diff * q_tt + 2 * qp[:, t])) / (1 + diff) / (1 + diff)
+            qp = (qp + diff[:, None] * q[:, t, :]) / (1 + diff)[:, None]
+            pr /= (1 + diff)[:, None]
+        p[rows] = pr
+    return p
+
+
+class CompiledModel:
+    """NumPy-only scorer for arrays exported by export_pipeline_arrays"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], metadata: Dict[str, Any] = None):
+        self.arrays = arrays
+        self.metadata = metadata or {}
+        self.family = str(arrays['family'])
+        self.classes_ = arrays['classes']
+        self._mean = arrays['scaler_mean']
+        self._scale = arrays['scaler_scale']
+
+        if self.family == 'svc':
+            n_support = arrays['n_support']
+            self._sv_start = np.concatenate([[0], np.cumsum(n_support)])
+            self._kernel = str(arrays['kernel'])
+            self._gamma = float(arrays['gamma'])
+            self._sv_sq_norms = (arrays['support_vectors'] ** 2).sum(axis=1)
+        elif self.family == 'knn':
+            self._fit_sq_norms = (arrays['fit_x'] ** 2).sum(axis=1)
+        elif self.family == 'nb':
+            var = arrays['var']
+            self._nb_log_norm = -0.5 * np.log(2.0 * np.pi * var).sum(axis=1)
+            self._nb_log_prior = np.log(arrays['class_prior'])
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = None) -> 'CompiledModel':
+        """Load a model written by save_compiled_model"""
+        with np.load(path, allow_pickle=False, mmap_mode=mmap_mode) as data:
+            arrays = {name: data[name] for name in data.files}
+        if int(arrays.pop('format_version')) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format in {path}")
+        metadata = json.loads(str(arrays.pop('metadata')))
+        return cls(arrays, metadata)
+
+    def transform(self, X) -> np.ndarray:
+        """Apply the exported StandardScaler step"""
+        X = np.asarray(X, dtype=np.float64)
+        return (X - self._mean) / self._scale
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities, matching Pipeline.predict_proba"""
+        Xt = self.transform(X)
+        if self.family == 'svc':
+            return self._svc_proba(self._svc_decision(Xt))
+        if self.family == 'knn':
+            return self._knn_proba(Xt)
+        if self.family == 'cart':
+            leaf_values = self.arrays['value'][self._tree_leaves(Xt)]
+            return leaf_values / leaf_values.sum(axis=1, keepdims=True)
+        jll = self._nb_joint_log_likelihood(Xt)
+        log_prob = jll.max(axis=1, keepdims=True)
+        log_prob = log_prob + np.log(np.exp(jll - log_prob).sum(axis=1, keepdims=True))
+        return np.exp(jll - log_prob)
+
+    def predict(self, X) -> np.ndarray:
+        """Class labels, matching Pipeline.predict"""
+        if self.family == 'svc':
+            # libsvm predicts by one-vs-one voting, not by the coupled probabilities
+            return self.classes_[self._svc_vote(self._svc_decision(self.transform(X)))]
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def _svc_kernel(self, Xt: np.ndarray) -> np.ndarray:
+        sv = self.arrays['support_vectors']
+        dot = Xt @ sv.T
+        if self._kernel == 'linear':
+            return dot
+        sq_dist = (Xt ** 2).sum(axis=1)[:, None] - 2.0 * dot + self._sv_sq_norms[None, :]
+        return np.exp(-self._gamma * np.maximum(sq_dist, 0.0))
+
+    def _svc_decision(self, Xt: np.ndarray) -> np.ndarray:
+        """One-vs-one decision values in libsvm pair order (0,1), (0,2), ..., (1,2), ..."""
+        kernel = self._svc_kernel(Xt)
+        dual_coef = self.arrays['dual_coef']
+        intercept = self.arrays['intercept']
+        start = self._sv_start
+        k = len(self.classes_)
+
+        decisions = []
+        pair = 0
+        for i in range(k):
+            for j in range(i + 1, k):
+                si, sj = slice(start[i], start[i + 1]), slice(start[j], start[j + 1])
+                value = kernel[:, si] @ dual_coef[j - 1, si] + kernel[:, sj] @ dual_coef[i, sj]
+                decisions.append(value + intercept[pair])
+                pair += 1
+        return np.column_stack(decisions)
+
+    def _svc_vote(self, decisions: np.ndarray) -> np.ndarray:
+        k = len(self.classes_)
+        votes = np.zeros((decisions.shape[0], k), dtype=np.int64)
+        pair = 0
+        for i in range(k):
+            for j in range(i + 1, k):
+                positive = decisions[:, pair] > 0
+                votes[:, i] += positive
+                votes[:, j] += ~positive
+                pair += 1
+        return np.argmax(votes, axis=1)
+
+    def _svc_proba(self, decisions: np.ndarray) -> np.ndarray:
+        k = len(self.classes_)
+        pairwise_probability = np.clip(
+            _sigmoid_predict(decisions, self.arrays['prob_a'], self.arrays['prob_b']),
+            _MIN_PROBABILITY, 1 - _MIN_PROBABILITY
+        )
+        pairwise = np.zeros((decisions.shape[0], k, k))
+        pair = 0
+        for i in range(k):
+            for j in range(i + 1, k):
+                pairwise[:, i, j] = pairwise_probability[:, pair]
+                pairwise[:, j, i] = 1 - pairwise_probability[:, pair]
+                pair += 1
+        return _couple_pairwise_probabilities(pairwise)
+
+    def _knn_proba(self, Xt: np.ndarray) -> np.ndarray:
+        fit_x = self.arrays['fit_x']
+        n_neighbors = int(self.arrays['n_neighbors'])
+        sq_dist = (Xt ** 2).sum(axis=1)[:, None] - 2.0 * (Xt @ fit_x.T) + self._fit_sq_norms[None, :]
+        neighbors = np.argpartition(sq_dist, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        neighbor_labels = self.arrays['fit_y'][neighbors]
+
+        counts = np.zeros((Xt.shape[0], len(self.classes_)))
+        np.add.at(counts, (np.arange(Xt.shape[0])[:, None], neighbor_labels), 1.0)
+        return counts / n_neighbors
+
+    def _tree_leaves(self, Xt: np.ndarray) -> np.ndarray:
+        left, right = self.arrays['children_left'], self.arrays['children_right']
+        feature, threshold = self.arrays['feature'], self.arrays['threshold']
+        # sklearn evaluates tree splits on float32 inputs
+        X32 = Xt.astype(np.float32)
+        rows = np.arange(X32.shape[0])
+        nodes = np.zeros(X32.shape[0], dtype=np.int64)
+
+        internal = left[nodes] != -1
+        while internal.any():
+            current = nodes[internal]
+            go_left = X32[rows[internal], feature[current]] <= threshold[current]
+            nodes[internal] = np.where(go_left, left[current], right[current])
+            internal = left[nodes] != -1
+        return nodes
+
+    def _nb_joint_log_likelihood(self, Xt: np.ndarray) -> np.ndarray:
+        theta, var = self.arrays['theta'], self.arrays['var']
+        squared = ((Xt[:, None, :] - theta[None, :, :]) ** 2 / var[None, :, :]).sum(axis=2)
+        return self._nb_log_prior + self._nb_log_norm - 0.5 * squared
+
+
+if __name__ == "__main__":
+    # Export the current pickled artifacts; unpickling them does need sklearn
+    import joblib
+
+    from config import settings
+
+    model = joblib.load(settings.MODEL_PATH)
+    model_info = joblib.load(settings.MODEL_INFO_PATH)
+    save_compiled_model(model, settings.COMPILED_MODEL_PATH, {'model_info': model_info})
+    print(f"💾 Compiled model saved to {settings.COMPILED_MODEL_PATH}")
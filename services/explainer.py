@@ -0,0 +1,168 @@
+"""
+Per-feature explanations of a single prediction.
+
+Contributions are measured against a baseline student whose features are the
+training means kept by the pipeline's StandardScaler. Two kinds of model have
+an exact, additive decomposition, read from the same arrays the compiled
+model uses:
+
+    nb            GaussianNB: each feature's log-likelihood term minus its term
+                  at the baseline (units: log_likelihood); the baseline's joint
+                  log-likelihood plus the contributions is the student's
+    cart          decision tree: the change in class shares at every split on
+                  the student's path, credited to the split feature (units:
+                  probability); the root shares plus the contributions are the
+                  leaf's, which is what predict_proba returns
+
+Every other model is explained by perturbation: the student's row and one row
+per feature with that feature set to the baseline are scored in a single
+predict_proba call, and a feature's contribution is how much the probabilities
+drop without it. These do not add up to the prediction when features interact.
+"""
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from services.compiled_model import export_pipeline_arrays
+
+METHODS = ('auto', 'perturbation')
+
+# Estimators with an exact decomposition, and their family in the exported arrays
+_EXACT_ESTIMATORS = ('GaussianNB', 'DecisionTreeClassifier')
+
+
+def _explainer_arrays(model) -> Optional[Dict[str, np.ndarray]]:
+    """Scaler arrays, plus the classifier's for NB and CART, of a compiled model or fitted Pipeline"""
+    arrays = getattr(model, 'arrays', None)
+    if arrays is not None:
+        return arrays
+    steps = getattr(model, 'steps', None)
+    if not isinstance(steps, list) or len(steps) != 2 or getattr(steps[0][1], 'mean_', None) is None:
+        return None
+    scaler, estimator = steps[0][1], steps[1][1]
+    if type(estimator).__name__ in _EXACT_ESTIMATORS:
+        return export_pipeline_arrays(model)
+    n_features = len(scaler.mean_)
+    return {
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n_features),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n_features),
+        'family': np.array('other'),
+    }
+
+
+class Explainer:
+    """Feature contributions for one student; the baseline is computed once, when built"""
+
+    def __init__(self, model, arrays: Dict[str, np.ndarray], feature_fields: Sequence[str],
+                 feature_names: Sequence[str]):
+        # Scores the perturbed rows; takes NumPy rows in training column order
+        self.model = model
+        self.feature_fields = tuple(feature_fields)
+        self.feature_names = tuple(feature_names)
+        self.classes = [str(cls) for cls in model.classes_]
+        self.family = str(arrays['family'])
+
+        self._mean = np.asarray(arrays['scaler_mean'], dtype=np.float64)
+        self._scale = np.asarray(arrays['scaler_scale'], dtype=np.float64)
+        self.baseline = self._mean.copy()
+        self.baseline_probabilities = np.asarray(model.predict_proba(self.baseline[None, :]))[0]
+
+        if self.family == 'nb':
+            self._theta, self._var = arrays['theta'], arrays['var']
+            self._nb_log_norm = -0.5 * np.log(2.0 * np.pi * self._var)
+            self._nb_log_prior = np.log(arrays['class_prior'])
+            self._nb_baseline_terms = self._nb_terms(self.baseline)
+        elif self.family == 'cart':
+            value = np.asarray(arrays['value'], dtype=np.float64)
+            self._tree_shares = value / value.sum(axis=1, keepdims=True)
+            self._left, self._right = arrays['children_left'], arrays['children_right']
+            self._feature, self._threshold = arrays['feature'], arrays['threshold']
+
+    @classmethod
+    def from_model(cls, model, inference_model, feature_fields: Sequence[str],
+                   feature_names: Sequence[str]) -> Optional['Explainer']:
+        """
+        Build from the loaded model (for its arrays) and the model used for
+        NumPy inference; None when there is no scaler baseline or predict_proba
+        """
+        if not hasattr(inference_model, 'predict_proba'):
+            return None
+        arrays = _explainer_arrays(model)
+        if arrays is None:
+            return None
+        return cls(inference_model, arrays, feature_fields, feature_names)
+
+    @property
+    def exact_method(self) -> Optional[str]:
+        return self.family if self.family in ('nb', 'cart') else None
+
+    def _nb_terms(self, row: np.ndarray) -> np.ndarray:
+        """Per-class, per-feature Gaussian log-likelihood terms of one row"""
+        z = (row - self._mean) / self._scale
+        return self._nb_log_norm - 0.5 * (z[None, :] - self._theta) ** 2 / self._var
+
+    def _explain_nb(self, row: np.ndarray):
+        terms = self._nb_terms(row)
+        jll = self._nb_log_prior + terms.sum(axis=1)
+        probabilities = np.exp(jll - jll.max())
+        probabilities /= probabilities.sum()
+        baseline = self._nb_log_prior + self._nb_baseline_terms.sum(axis=1)
+        return probabilities, baseline, (terms - self._nb_baseline_terms).T, 'log_likelihood'
+
+    def _explain_cart(self, row: np.ndarray):
+        # sklearn evaluates tree splits on float32 inputs
+        z = ((row - self._mean) / self._scale).astype(np.float32)
+        shares = self._tree_shares
+        contributions = np.zeros((len(row), shares.shape[1]))
+        node = 0
+        while self._left[node] != -1:
+            feature = self._feature[node]
+            child = self._left[node] if z[feature] <= self._threshold[node] else self._right[node]
+            contributions[feature] += shares[child] - shares[node]
+            node = child
+        return shares[node], shares[0], contributions, 'probability'
+
+    def _explain_perturbation(self, row: np.ndarray):
+        n = len(row)
+        rows = np.repeat(row[None, :], n + 1, axis=0)
+        rows[np.arange(1, n + 1), np.arange(n)] = self.baseline
+        probabilities = np.asarray(self.model.predict_proba(rows))
+        return probabilities[0], self.baseline_probabilities, probabilities[0] - probabilities[1:], 'probability'
+
+    def explain(self, row: np.ndarray, method: str = 'auto') -> Dict[str, Any]:
+        """
+        Explain one row in training column order. Returns the method used, the
+        units of the contributions, the class probabilities, the baseline values
+        and one entry per feature in training order
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        row = np.asarray(row, dtype=np.float64).reshape(-1)
+        used = self.exact_method if method == 'auto' else None
+        if used == 'nb':
+            probabilities, baseline, contributions, units = self._explain_nb(row)
+        elif used == 'cart':
+            probabilities, baseline, contributions, units = self._explain_cart(row)
+        else:
+            used = 'perturbation'
+            probabilities, baseline, contributions, units = self._explain_perturbation(row)
+
+        return {
+            'method': used,
+            'units': units,
+            'probabilities': dict(zip(self.classes, probabilities.tolist())),
+            'baseline': dict(zip(self.classes, baseline.tolist())),
+            'contributions': [
+                {
+                    'feature': name,
+                    'field': field,
+                    'value': value,
+                    'baseline': baseline_value,
+                    'contribution': dict(zip(self.classes, values))
+                }
+                for name, field, value, baseline_value, values in zip(
+                    self.feature_names, self.feature_fields, row.tolist(), self.baseline.tolist(),
+                    contributions.tolist()
+                )
+            ]
+        }
@@ -0,0 +1,185 @@
+"""
+Neighbor indexes for serving KNN models.
+
+tune_tree_index is used at training time: it refits the KNN step with an
+explicit KD-tree or ball tree and the leaf size that answered queries fastest,
+so the tree is built once and pickled with the model instead of being left to
+sklearn's defaults.
+
+IVFIndex is an optional approximate index (an inverted file over k-means
+cells). Each query only scans the reference rows of the nprobe cells whose
+centroids are closest, so nprobe trades recall for latency. Nothing in this
+module imports sklearn.
+"""
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+LEAF_SIZES = (10, 20, 30, 40, 60, 100)
+TREE_ALGORITHMS = ('kd_tree', 'ball_tree')
+
+# Rows per distance block when assigning points to cells, bounds build memory
+_ASSIGN_BLOCK = 16384
+
+
+def is_knn_model(model) -> bool:
+    """True for a KNN Pipeline or a compiled KNN model"""
+    if getattr(model, 'family', None) == 'knn':
+        return True
+    steps = getattr(model, 'steps', None)
+    return bool(steps) and type(steps[-1][1]).__name__ == 'KNeighborsClassifier'
+
+
+def _time_queries(knn, queries: np.ndarray, single_queries: int) -> float:
+    """Mean seconds per single-row kneighbors call"""
+    knn.kneighbors(queries[:1])
+    started = time.perf_counter()
+    for i in range(single_queries):
+        knn.kneighbors(queries[i:i + 1])
+    return (time.perf_counter() - started) / single_queries
+
+
+def tune_tree_index(pipeline, leaf_sizes: Sequence[int] = LEAF_SIZES,
+                    algorithms: Sequence[str] = TREE_ALGORITHMS, single_queries: int = 200,
+                    random_state: int = 0) -> Dict[str, Any]:
+    """
+    Refit the pipeline's KNN step with each tree type and leaf size, keep the
+    one with the lowest single-row query time and return what was chosen
+    """
+    name, knn = pipeline.steps[-1]
+    fit_x = np.asarray(knn._fit_X)
+    labels = knn.classes_[np.asarray(knn._y)]
+
+    # Queries near the reference rows, in the scaled space the index lives in
+    rng = np.random.default_rng(random_state)
+    sample = fit_x[rng.integers(0, len(fit_x), single_queries)]
+    queries = sample + rng.normal(scale=0.1, size=sample.shape)
+
+    timings = []
+    best = None
+    for algorithm in algorithms:
+        for leaf_size in leaf_sizes:
+            candidate = type(knn)(**dict(knn.get_params(), algorithm=algorithm, leaf_size=leaf_size))
+            candidate.fit(fit_x, labels)
+            seconds = _time_queries(candidate, queries, single_queries)
+            timings.append({'algorithm': algorithm, 'leaf_size': leaf_size, 'query_us': seconds * 1e6})
+            if best is None or seconds < best[0]:
+                best = (seconds, candidate, algorithm, leaf_size)
+
+    seconds, tuned, algorithm, leaf_size = best
+    pipeline.steps[-1] = (name, tuned)
+    return {
+        'algorithm': algorithm,
+        'leaf_size': leaf_size,
+        'query_us': seconds * 1e6,
+        'reference_rows': len(fit_x),
+        'timings': timings
+    }
+
+
+def _kmeans(points: np.ndarray, n_clusters: int, iterations: int, rng) -> np.ndarray:
+    """Plain Lloyd's k-means, enough to partition the reference rows into cells"""
+    centroids = points[rng.choice(len(points), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _assign(points, centroids)
+        counts = np.bincount(assignment, minlength=n_clusters)
+        sums = np.column_stack([
+            np.bincount(assignment, weights=points[:, d], minlength=n_clusters) for d in range(points.shape[1])
+        ])
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+def _assign(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    centroid_sq_norms = (centroids ** 2).sum(axis=1)
+    assignment = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), _ASSIGN_BLOCK):
+        block = points[start:start + _ASSIGN_BLOCK]
+        # |x|^2 is the same for every centroid, so it does not change the argmin
+        assignment[start:start + len(block)] = np.argmin(centroid_sq_norms[None, :] - 2.0 * block @ centroids.T, axis=1)
+    return assignment
+
+
+class IVFIndex:
+    """Approximate nearest neighbors over k-means cells (inverted file)"""
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, points: np.ndarray,
+                 labels: np.ndarray, nprobe: int):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.points = points
+        self.labels = labels
+        self.nprobe = max(1, min(nprobe, len(centroids)))
+        self._cell_sizes = np.diff(offsets)
+        self._centroid_sq_norms = (centroids ** 2).sum(axis=1)
+        self._point_sq_norms = (points ** 2).sum(axis=1)
+
+    @classmethod
+    def build(cls, points: np.ndarray, labels: np.ndarray, n_lists: Optional[int] = None,
+              nprobe: int = 8, iterations: int = 10, random_state: int = 0) -> 'IVFIndex':
+        """Partition the reference rows into n_lists cells (default about sqrt(n))"""
+        points = np.asarray(points, dtype=np.float64)
+        n_lists = n_lists or max(1, int(np.sqrt(len(points))))
+        n_lists = min(n_lists, len(points))
+        rng = np.random.default_rng(random_state)
+
+        centroids = _kmeans(points, n_lists, iterations, rng)
+        assignment = _assign(points, centroids)
+        # Store each cell's rows contiguously so a probe is one slice
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+        return cls(centroids, offsets, np.ascontiguousarray(points[order]), np.asarray(labels)[order], nprobe)
+
+    def _candidates(self, query: np.ndarray, n_neighbors: int) -> np.ndarray:
+        distances = self._centroid_sq_norms - 2.0 * (self.centroids @ query)
+        cells = np.argsort(distances)
+        # Probe more cells if the nearest ones hold fewer rows than neighbors needed
+        enough = int(np.searchsorted(np.cumsum(self._cell_sizes[cells]), n_neighbors)) + 1
+        probed = max(self.nprobe, enough)
+        return np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells[:probed]])
+
+    def kneighbors(self, queries: np.ndarray, n_neighbors: int) -> np.ndarray:
+        """Indexes (into points/labels) of the approximate nearest neighbors of each query"""
+        queries = np.asarray(queries, dtype=np.float64)
+        result = np.empty((len(queries), n_neighbors), dtype=np.int64)
+        for row, query in enumerate(queries):
+            candidates = self._candidates(query, n_neighbors)
+            distances = self._point_sq_norms[candidates] - 2.0 * (self.points[candidates] @ query)
+            nearest = np.argpartition(distances, n_neighbors - 1)[:n_neighbors]
+            result[row] = candidates[nearest]
+        return result
+
+
+class ApproximateKNNModel:
+    """
+    Serving wrapper scoring a KNN model through an IVFIndex. Probabilities are
+    neighbor vote shares, like KNeighborsClassifier with uniform weights
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], n_lists: Optional[int] = None, nprobe: int = 8):
+        self.classes_ = np.asarray(arrays['classes'])
+        self.n_neighbors = int(arrays['n_neighbors'])
+        self._mean = np.asarray(arrays['scaler_mean'])
+        self._scale = np.asarray(arrays['scaler_scale'])
+        self.index = IVFIndex.build(arrays['fit_x'], arrays['fit_y'], n_lists, nprobe)
+
+    @classmethod
+    def from_model(cls, model, n_lists: Optional[int] = None, nprobe: int = 8) -> 'ApproximateKNNModel':
+        """Build from a compiled KNN model or a fitted KNN Pipeline"""
+        arrays = getattr(model, 'arrays', None)
+        if arrays is None:
+            from services.compiled_model import export_pipeline_arrays
+            arrays = export_pipeline_arrays(model)
+        return cls(arrays, n_lists, nprobe)
+
+    def predict_proba(self, X) -> np.ndarray:
+        Xt = (np.asarray(X, dtype=np.float64) - self._mean) / self._scale
+        neighbor_labels = self.index.labels[self.index.kneighbors(Xt, self.n_neighbors)]
+        counts = np.zeros((Xt.shape[0], len(self.classes_)))
+        np.add.at(counts, (np.arange(Xt.shape[0])[:, None], neighbor_labels), 1.0)
+        return counts / self.n_neighbors
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
@@ -0,0 +1,172 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Recording goes through one of a few striped locks, one per thread in turn, so
+concurrent requests rarely contend and a scrape never blocks recording for
+longer than it takes to copy one stripe.
+"""
+import itertools
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+_STRIPES = 16
+
+# Thread idents are stack addresses spaced by large powers of two, so they
+# cannot pick a stripe; each thread gets the next number the first time it records
+_stripe_numbers = itertools.count()
+_thread_stripe = threading.local()
+
+
+def _stripe_index() -> int:
+    try:
+        return _thread_stripe.index
+    except AttributeError:
+        _thread_stripe.index = next(_stripe_numbers) % _STRIPES
+        return _thread_stripe.index
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._stripes = [({}, threading.Lock()) for _ in range(_STRIPES)]
+
+    def _stripe(self) -> Tuple[Dict, threading.Lock]:
+        return self._stripes[_stripe_index()]
+
+    def _header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+
+    def clear(self):
+        for values, lock in self._stripes:
+            with lock:
+                values.clear()
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        values, lock = self._stripe()
+        with lock:
+            values[labels] = values.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Tuple, float]:
+        merged = {}
+        for values, lock in self._stripes:
+            with lock:
+                items = list(values.items())
+            for labels, value in items:
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {_format_number(value)}')
+        return lines
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: Tuple, value: float):
+        """Record one observation; value is in seconds for the latency histograms"""
+        values, lock = self._stripe()
+        index = bisect_left(self.buckets, value)
+        with lock:
+            entry = values.get(labels)
+            if entry is None:
+                # Per-bucket counts (last slot is +Inf) followed by the running sum
+                entry = values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def collect(self) -> Dict[Tuple, List]:
+        merged = {}
+        for values, lock in self._stripes:
+            with lock:
+                items = [(labels, list(entry)) for labels, entry in values.items()]
+            for labels, entry in items:
+                total = merged.get(labels)
+                merged[labels] = entry if total is None else [a + b for a, b in zip(total, entry)]
+        return merged
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for labels, entry in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry[:-1]):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}')
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_number(entry[-1])}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+def render_gauges(name: str, documentation: str, samples: Dict[str, float], label_name: str) -> List[str]:
+    """Render a family of gauges from a plain dict, e.g. the cache counters"""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} gauge']
+    for label, value in sorted(samples.items()):
+        lines.append(f'{name}{_format_labels((label_name,), (label,))} {_format_number(value)}')
+    return lines
+
+
+REQUESTS_TOTAL = Counter(
+    'api_requests_total', 'Requests handled, by endpoint, method and status code',
+    ('endpoint', 'method', 'status')
+)
+REQUEST_LATENCY = Histogram(
+    'api_request_duration_seconds', 'Request latency by endpoint', ('endpoint',)
+)
+PREDICT_PHASE_LATENCY = Histogram(
+    'predict_phase_duration_seconds', 'Latency of each phase of the predict path', ('phase',)
+)
+
+REGISTRY = (REQUESTS_TOTAL, REQUEST_LATENCY, PREDICT_PHASE_LATENCY)
+
+
+def observe_phase(phase: str, seconds: float):
+    PREDICT_PHASE_LATENCY.observe((phase,), seconds)
+
+
+def render_metrics(extra_lines: List[str] = None) -> str:
+    """Render every registered metric in the Prometheus text format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra_lines or [])
+    return '\n'.join(lines) + '\n'
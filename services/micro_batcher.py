@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+
+class _PendingPrediction:
+    __slots__ = ('item', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item predictions and runs them as one batch.
+
+    A batch is flushed when it reaches max_batch_size, when max_wait_ms has
+    passed since its first item, or as soon as every caller currently waiting
+    is already in it. The last rule makes the batcher adaptive: a lone request
+    is never held back waiting for company that is not coming.
+    """
+
+    def __init__(self, predict_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 2.0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queue = None
+        self._worker_pid = None
+
+        self._batches = 0
+        self._items = 0
+        self._batch_sizes = [0] * (max_batch_size + 1)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _ensure_worker(self):
+        # The worker thread does not survive a fork, so each process starts its own
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._in_flight = 0
+                threading.Thread(target=self._run, args=(self._queue,), name="micro-batcher", daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def predict(self, item):
+        """Submit one item and block until its batch has been scored"""
+        self._ensure_worker()
+        pending = _PendingPrediction(item)
+        with self._lock:
+            self._in_flight += 1
+        try:
+            self._queue.put(pending)
+            pending.done.wait()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run(self, work_queue: queue.Queue):
+        while True:
+            batch = [work_queue.get()]
+            deadline = batch[0].enqueued_at + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(work_queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or len(batch) >= self._in_flight:
+                    break
+                try:
+                    batch.append(work_queue.get(timeout=min(remaining, 0.0005)))
+                except queue.Empty:
+                    pass
+            self._flush(batch)
+
+    def _flush(self, batch: List[_PendingPrediction]):
+        started = time.perf_counter()
+        try:
+            results = self.predict_batch([pending.item for pending in batch])
+            for pending, result in zip(batch, results):
+                pending.result = result
+        except Exception as e:
+            for pending in batch:
+                pending.error = e
+
+        waits = [started - pending.enqueued_at for pending in batch]
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, max(waits))
+
+        for pending in batch:
+            pending.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch fill and queue wait statistics"""
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+                "avg_fill_ratio": (self._items / (self._batches * self.max_batch_size)
+                                   if self._batches else 0.0),
+                "batch_size_counts": {
+                    str(size): count for size, count in enumerate(self._batch_sizes) if count
+                },
+                "avg_wait_ms": self._wait_total / self._items * 1000.0 if self._items else 0.0,
+                "max_wait_observed_ms": self._wait_max * 1000.0
+            }
@@ -0,0 +1,173 @@
+"""
+Single-file model bundle: the fitted Pipeline, its model info and a checksum.
+
+Layout (integers are little endian):
+
+    8 bytes    magic b'SDMBNDL1'
+    8 bytes    manifest length
+    32 bytes   sha256 of the manifest and everything after it
+    manifest   UTF-8 JSON: format version, feature order, classes, model_info
+               and the offset and length of the pickle and of every array
+    payload    pickle protocol 5 stream of the Pipeline, then each NumPy array
+               buffer out-of-band, raw and starting on a 64-byte boundary
+
+The arrays are never compressed or copied through the pickle stream, so
+load_bundle can give the unpickler views into one read of the file or into a
+memory map of it (mmap_mode "c" or "r", like joblib's).
+"""
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MAGIC = b'SDMBNDL1'
+ALIGNMENT = 64
+
+_HEADER = struct.Struct('<8sQ32s')
+
+_MMAP_ACCESS = {'c': mmap.ACCESS_COPY, 'r': mmap.ACCESS_READ}
+
+
+class ModelBundleError(Exception):
+    """The bundle file is not a valid model bundle or is corrupted"""
+
+
+@dataclass
+class ModelBundle:
+    model: Any
+    model_info: Dict[str, Any]
+    manifest: Dict[str, Any]
+    checksum: str
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _json_default(value):
+    # model_info holds NumPy scalars such as the CV score
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def save_bundle(pipeline, model_info: Dict[str, Any], path: str):
+    """Write a fitted Pipeline and its model info to a single bundle file"""
+    buffers = []
+    payload = pickle.dumps(pipeline, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    sections = []
+    offset = len(payload)
+    for raw in raw_buffers:
+        offset = _aligned(offset)
+        sections.append([offset, raw.nbytes])
+        offset += raw.nbytes
+
+    sklearn = sys.modules.get('sklearn')
+    manifest = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'feature_names': list(model_info['feature_names']),
+        'classes': [str(c) for c in pipeline.classes_],
+        'model_info': model_info,
+        'pickle': [0, len(payload)],
+        'buffers': sections,
+        'versions': {'numpy': np.__version__, 'sklearn': getattr(sklearn, '__version__', None)}
+    }, default=_json_default).encode()
+
+    # The payload starts aligned too, so buffer offsets are aligned in the file
+    body_start = _aligned(_HEADER.size + len(manifest))
+    body = bytearray(offset)
+    body[:len(payload)] = payload
+    for (start, length), raw in zip(sections, raw_buffers):
+        body[start:start + length] = raw
+    padding = b'\0' * (body_start - _HEADER.size - len(manifest))
+
+    digest = hashlib.sha256()
+    for part in (manifest, padding, body):
+        digest.update(part)
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(manifest), digest.digest()))
+        f.write(manifest)
+        f.write(padding)
+        f.write(body)
+    os.replace(temporary, path)
+
+
+def _read(path: str, mmap_mode: Optional[str]):
+    with open(path, 'rb') as f:
+        if mmap_mode is None:
+            # One read into a writable buffer; the arrays are views into it
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+            return data
+        if mmap_mode not in _MMAP_ACCESS:
+            raise ValueError(f"Unsupported mmap_mode: {mmap_mode}")
+        return mmap.mmap(f.fileno(), 0, access=_MMAP_ACCESS[mmap_mode])
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Manifest of a bundle, without loading the model"""
+    with open(path, 'rb') as f:
+        magic, manifest_length, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ModelBundleError(f"{path} is not a model bundle")
+        return json.loads(f.read(manifest_length))
+
+
+def load_bundle(path: str, mmap_mode: Optional[str] = None, verify: bool = True) -> ModelBundle:
+    """
+    Load a bundle written by save_bundle. With mmap_mode the arrays are mapped
+    from the page cache ("r" makes them read-only, which SVC cannot use)
+    """
+    data = _read(path, mmap_mode)
+    view = memoryview(data)
+    if len(data) < _HEADER.size:
+        raise ModelBundleError(f"{path} is not a model bundle")
+    magic, manifest_length, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ModelBundleError(f"{path} is not a model bundle")
+    if verify and hashlib.sha256(view[_HEADER.size:]).digest() != checksum:
+        raise ModelBundleError(f"Checksum mismatch in {path}, the file is corrupted")
+
+    manifest = json.loads(bytes(view[_HEADER.size:_HEADER.size + manifest_length]))
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ModelBundleError(f"Unsupported bundle format in {path}")
+
+    body = view[_aligned(_HEADER.size + manifest_length):]
+    start, length = manifest['pickle']
+    model = pickle.loads(
+        body[start:start + length],
+        buffers=[body[offset:offset + size] for offset, size in manifest['buffers']]
+    )
+
+    if [str(c) for c in model.classes_] != manifest['classes']:
+        raise ModelBundleError(f"Classes in {path} do not match its manifest")
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features is not None and n_features != len(manifest['feature_names']):
+        raise ModelBundleError(f"Feature count in {path} does not match its manifest")
+    return ModelBundle(model, manifest['model_info'], manifest, checksum.hex())
+
+
+if __name__ == "__main__":
+    # Bundle the current pickled artifacts; unpickling them does need sklearn
+    import joblib
+
+    from config import settings
+
+    model = joblib.load(settings.MODEL_PATH)
+    model_info = joblib.load(settings.MODEL_INFO_PATH)
+    save_bundle(model, model_info, settings.MODEL_BUNDLE_PATH)
+    print(f"💾 Model bundle saved to {settings.MODEL_BUNDLE_PATH}")
@@ -0,0 +1,52 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+from logger import log_info, log_warning
+
+
+class ModelWatcher(threading.Thread):
+    """
+    Background thread that polls the model files and reloads the model when
+    they change. A change is only acted on once the files look the same on
+    two consecutive polls, so a half-copied artifact is never loaded.
+    """
+
+    def __init__(self, service, interval: float):
+        super().__init__(name="model-watcher", daemon=True)
+        self.service = service
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._loaded_signature = self._signature()
+
+    def _signature(self) -> Optional[Tuple]:
+        try:
+            return tuple(
+                (path, stat.st_mtime_ns, stat.st_size)
+                for path, stat in ((path, os.stat(path)) for path in self.service.get_model_paths())
+            )
+        except OSError:
+            return None
+
+    def check(self, pending: Optional[Tuple] = None) -> Optional[Tuple]:
+        """Run one poll; returns the signature still waiting to settle, if any"""
+        signature = self._signature()
+        if signature is None or signature == self._loaded_signature:
+            return None
+        if signature != pending:
+            return signature
+
+        log_info("🔄 Model files changed, reloading...")
+        if not self.service.load_model():
+            log_warning("⚠️ Model reload failed, keeping the current model")
+        # Either way, wait for the next change before trying again
+        self._loaded_signature = signature
+        return None
+
+    def run(self):
+        pending = None
+        while not self._stop_event.wait(self.interval):
+            pending = self.check(pending)
+
+    def stop(self):
+        self._stop_event.set()
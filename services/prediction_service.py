@@ -1,138 +1,548 @@
+import copy
+import hashlib
 import os
-from typing import Any, Dict, Optional
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import joblib
-import pandas as pd
+import numpy as np
 
 from config import settings
 from logger import log_error, log_info, log_warning
-from models.schemas import PredictionResponse, SimpleStudentData
+from models.schemas import PredictionResponse, SimpleStudentData, StudentBatch
+from services.compiled_model import CompiledModel
+from services.explainer import Explainer
+from services.knn_index import ApproximateKNNModel, is_knn_model
+from services.metrics import observe_phase
+from services.micro_batcher import MicroBatcher
+from services.model_bundle import load_bundle
+from services.prediction_cache import PredictionCache
+from services.response_encoder import ResponseEncoder, encode_json
+
+# joblib and pandas (and sklearn, through unpickling) are imported lazily so
+# the app can start and answer health checks before the model is loaded
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Maps SimpleStudentData fields to the column names used in training
+FEATURE_COLUMNS = {
+    'age_at_enrollment': 'Age at enrollment',
+    'gender': 'Gender',
+    'marital_status': 'Marital status',
+    'admission_grade': 'Admission grade',
+    'daytime_evening_attendance': 'Daytime/evening attendance',
+    'scholarship_holder': 'Scholarship holder',
+    'tuition_fees_up_to_date': 'Tuition fees up to date',
+    'curricular_units_1st_sem_enrolled': 'Curricular units 1st sem (enrolled)',
+    'curricular_units_1st_sem_approved': 'Curricular units 1st sem (approved)',
+    'curricular_units_1st_sem_grade': 'Curricular units 1st sem (grade)',
+    'curricular_units_2nd_sem_enrolled': 'Curricular units 2nd sem (enrolled)',
+    'curricular_units_2nd_sem_approved': 'Curricular units 2nd sem (approved)',
+    'curricular_units_2nd_sem_grade': 'Curricular units 2nd sem (grade)',
+    'unemployment_rate': 'Unemployment rate'
+}
+
+# Descriptions returned by /api/features, by training column name
+FEATURE_DESCRIPTIONS = {
+    'Age at enrollment': 'Idade do estudante na matrícula (16-80 anos)',
+    'Gender': 'Gênero (0=Feminino, 1=Masculino)',
+    'Marital status': 'Estado civil (1=Solteiro, 2=Casado, 3=Divorciado, 4=Viúvo)',
+    'Admission grade': 'Nota de admissão (0-200)',
+    'Daytime/evening attendance': 'Período (0=Noturno, 1=Diurno)',
+    'Scholarship holder': 'Bolseiro (0=Não, 1=Sim)',
+    'Tuition fees up to date': 'Propinas em dia (0=Não, 1=Sim)',
+    'Curricular units 1st sem (enrolled)': 'Unidades curriculares matriculadas no 1º semestre',
+    'Curricular units 1st sem (approved)': 'Unidades curriculares aprovadas no 1º semestre',
+    'Curricular units 1st sem (grade)': 'Nota média do 1º semestre (0-20)',
+    'Curricular units 2nd sem (enrolled)': 'Unidades curriculares matriculadas no 2º semestre',
+    'Curricular units 2nd sem (approved)': 'Unidades curriculares aprovadas no 2º semestre',
+    'Curricular units 2nd sem (grade)': 'Nota média do 2º semestre (0-20)',
+    'Unemployment rate': 'Taxa de desemprego (%)'
+}
+
+# Reverse lookup used to resolve the training column order once per model load
+FEATURE_FIELDS = {column: field for field, column in FEATURE_COLUMNS.items()}
+
+# Cache keys of encoded /api/predict bodies, kept apart from PredictionResponse entries
+_JSON_CACHE_KEY = 'json'
+
+
+def _without_feature_names(model):
+    """
+    Return a shallow copy of the model whose first step has no feature_names_in_
+    so it can be fed plain NumPy rows without sklearn's feature-name warning
+    """
+    steps = getattr(model, 'steps', None)
+    first_step = steps[0][1] if isinstance(steps, list) and steps else model
+    if not isinstance(getattr(first_step, 'feature_names_in_', None), np.ndarray):
+        return model
+    
+    first_step = copy.copy(first_step)
+    del first_step.feature_names_in_
+    if first_step is model:
+        return first_step
+    
+    stripped = copy.copy(model)
+    stripped.steps = [(steps[0][0], first_step)] + list(steps[1:])
+    return stripped
+
+
+def _file_digest(paths: List[str]) -> str:
+    """Short content hash of the model files, used as the model version"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class ModelState:
+    """
+    A loaded (model, model_info) pair and everything derived from it.
+    States are never mutated after construction: reloads build a new one and
+    swap the reference, so a request that grabbed a state sees a matching pair.
+    """
+    
+    def __init__(self, model=None, model_info=None, version: Optional[str] = None, prepare: bool = False):
+        self.model = model
+        self.model_info = model_info
+        self.version = version
+        
+        # NumPy inference path and response encoder, resolved once per model load
+        self.feature_fields = None
+        self.inference_model = None
+        self.encoder = None
+        self.explainer = None
+        if prepare:
+            self._prepare_inference()
+            self._prepare_encoder()
+            self._prepare_explainer()
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None and self.model_info is not None
+    
+    def _prepare_inference(self):
+        """Resolve the feature column order for the NumPy inference path"""
+        try:
+            self.feature_fields = tuple(FEATURE_FIELDS[name] for name in self.model_info['feature_names'])
+            self.inference_model = _without_feature_names(self.model)
+        except KeyError as e:
+            log_warning("⚠️ Unknown feature %s, using DataFrame inference path", e)
+            return
+        
+        if settings.KNN_APPROXIMATE and is_knn_model(self.model):
+            try:
+                approximate = ApproximateKNNModel.from_model(
+                    self.model, settings.KNN_IVF_LISTS or None, settings.KNN_IVF_NPROBE
+                )
+            except ValueError as e:
+                # Distance weights or other metrics: keep the exact model
+                log_warning("⚠️ Approximate KNN index unavailable (%s), using exact search", e)
+                return
+            self.inference_model = approximate
+            log_info("🧭 Approximate KNN index: %d cells, nprobe %d",
+                     len(self.inference_model.index.centroids), self.inference_model.index.nprobe)
+    
+    @property
+    def response_model_info(self) -> Dict[str, Any]:
+        """model_info fragment of every prediction response"""
+        return {
+            "model_name": self.model_info.get("model_name", "Unknown"),
+            "model_version": self.version,
+            "features_used": len(self.model_info['feature_names']),
+            "is_simplified": True
+        }
+    
+    def _prepare_encoder(self):
+        """Pre-encode the parts of the /api/predict body that are the same for every request"""
+        model = self.inference_model if self.inference_model is not None else self.model
+        try:
+            self.encoder = ResponseEncoder(model.classes_, self.response_model_info)
+        except (AttributeError, TypeError) as e:
+            log_warning("⚠️ Response encoder unavailable (%s), using jsonify", e)
+    
+    def _prepare_explainer(self):
+        """Compute the baseline of /api/explain once per model load"""
+        if self.inference_model is None:
+            return
+        try:
+            self.explainer = Explainer.from_model(
+                self.model, self.inference_model, self.feature_fields, self.model_info['feature_names']
+            )
+        except Exception as e:
+            log_warning("⚠️ Explanations unavailable (%s)", e)
+            return
+        if self.explainer is None:
+            log_warning("⚠️ Explanations unavailable: the model has no scaler baseline or predict_proba")
+    
+    def warm_up(self):
+        """Run one prediction so the first real request does not pay for lazy setup"""
+        if self.inference_model is not None:
+            row = np.zeros((1, len(self.feature_fields)))
+            self.inference_model.predict(row)
+            if hasattr(self.inference_model, 'predict_proba'):
+                self.inference_model.predict_proba(row)
 
 
 class PredictionService:
     def __init__(self):
-        self.model = None
-        self.model_info = None
+        self._state = ModelState()
+        self._reload_lock = threading.Lock()
+        self._row_buffers = threading.local()
+        
+        self._cache = PredictionCache(settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_TTL)
+        
+        self._micro_batcher = None
+        if settings.MICRO_BATCH_ENABLED:
+            self._micro_batcher = MicroBatcher(
+                self.predict_batch, settings.MICRO_BATCH_MAX_SIZE, settings.MICRO_BATCH_MAX_WAIT_MS
+            )
+    
+    @property
+    def model(self):
+        return self._state.model
+    
+    @model.setter
+    def model(self, model):
+        self._state = ModelState(model, self._state.model_info)
+    
+    @property
+    def model_info(self):
+        return self._state.model_info
+    
+    @model_info.setter
+    def model_info(self, model_info):
+        self._state = ModelState(self._state.model, model_info)
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        return self._state.version
+    
+    def get_model_paths(self) -> List[str]:
+        """Files the model is loaded from in the current configuration"""
+        if settings.USE_COMPILED_MODEL and os.path.exists(settings.COMPILED_MODEL_PATH):
+            return [settings.COMPILED_MODEL_PATH]
+        if settings.USE_MODEL_BUNDLE and os.path.exists(settings.MODEL_BUNDLE_PATH):
+            return [settings.MODEL_BUNDLE_PATH]
+        return [settings.MODEL_PATH, settings.MODEL_INFO_PATH]
     
     def load_model(self):
-        """Load the model and model info from disk"""
-        try:
-            if os.path.exists(settings.MODEL_PATH) and os.path.exists(settings.MODEL_INFO_PATH):
-                self.model = joblib.load(settings.MODEL_PATH)
-                self.model_info = joblib.load(settings.MODEL_INFO_PATH)
-                log_info(f"✅ Simplified model loaded: {self.model_info['model_name']}")
-                log_info(f"📊 Features: {len(self.model_info['feature_names'])}")
-                log_info(f"🎯 Classes: {self.model_info['classes']}")
-            else:
-                log_warning("❌ Model files not found. Please run generate_simple_model.py first.")
+        """
+        Load the model and model info from disk and swap them in atomically.
+        Requests keep using the previous model until the new one is warmed up.
+        """
+        with self._reload_lock:
+            try:
+                paths = self.get_model_paths()
+                if not all(os.path.exists(path) for path in paths):
+                    log_warning("❌ Model files not found. Please run generate_simple_model.py first.")
+                    return False
+                
+                if settings.USE_COMPILED_MODEL and paths == [settings.COMPILED_MODEL_PATH]:
+                    # NumPy-only scorer, does not import sklearn
+                    model = CompiledModel.load(settings.COMPILED_MODEL_PATH)
+                    model_info = model.metadata['model_info']
+                    version = _file_digest(paths)
+                elif paths == [settings.MODEL_BUNDLE_PATH]:
+                    # One file, checked against its checksum, which doubles as the version
+                    bundle = load_bundle(settings.MODEL_BUNDLE_PATH, mmap_mode=settings.MODEL_MMAP_MODE,
+                                         verify=settings.MODEL_BUNDLE_VERIFY)
+                    model, model_info = bundle.model, bundle.model_info
+                    version = bundle.checksum[:12]
+                else:
+                    import joblib
+                    
+                    # With mmap_mode the model arrays are mapped from the page cache, so
+                    # prefork workers share one physical copy instead of one each
+                    model = joblib.load(settings.MODEL_PATH, mmap_mode=settings.MODEL_MMAP_MODE)
+                    model_info = joblib.load(settings.MODEL_INFO_PATH)
+                    version = _file_digest(paths)
+                
+                state = ModelState(model, model_info, version=version, prepare=True)
+                state.warm_up()
+            except Exception as e:
+                log_error("💥 Error loading model: %s", e)
                 return False
-        except Exception as e:
-            log_error(f"💥 Error loading model: {e}")
-            return False
+            
+            self._state = state
+            # Cached results belong to the previous model
+            self._cache.clear()
+        
+        log_info("✅ Simplified model loaded: %s (version %s)", model_info['model_name'], state.version)
+        log_info("📊 Features: %d", len(model_info['feature_names']))
+        log_info("🎯 Classes: %s", model_info['classes'])
         return True
     
+    def _get_row_buffer(self, size: int) -> np.ndarray:
+        """Get the preallocated single-row feature buffer for the current thread"""
+        row = getattr(self._row_buffers, 'row', None)
+        if row is None or row.shape[1] != size:
+            row = np.empty((1, size), dtype=np.float64)
+            self._row_buffers.row = row
+        return row
+    
     def is_model_loaded(self) -> bool:
         """Check if model is loaded"""
-        return self.model is not None and self.model_info is not None
+        return self._state.is_loaded
     
     def get_model_info(self) -> Optional[Dict[str, Any]]:
         """Get model information"""
-        if not self.is_model_loaded():
+        state = self._state
+        if not state.is_loaded:
             return None
         
+        model_info = state.model_info
         return {
-            "model_name": self.model_info.get("model_name"),
-            "model_score": self.model_info.get("model_score"),
-            "test_accuracy": self.model_info.get("test_accuracy"),
-            "features_count": len(self.model_info.get("feature_names", [])),
-            "classes": self.model_info.get("classes", []),
-            "is_simplified": self.model_info.get("is_simplified", True),
-            "feature_names": self.model_info.get("feature_names", [])
+            "model_name": model_info.get("model_name"),
+            "model_score": model_info.get("model_score"),
+            "test_accuracy": model_info.get("test_accuracy"),
+            "features_count": len(model_info.get("feature_names", [])),
+            "classes": model_info.get("classes", []),
+            "is_simplified": model_info.get("is_simplified", True),
+            "feature_names": model_info.get("feature_names", []),
+            "model_version": state.version
         }
     
     def predict(self, student_data: SimpleStudentData) -> PredictionResponse:
         """Make prediction for student data"""
-        if not self.is_model_loaded():
+        # Read the generation before the state so a concurrent reload can never
+        # get a result from the old model stored under the new generation
+        generation = self._cache.generation
+        state = self._state
+        if not state.is_loaded:
+            raise Exception("Model not loaded")
+        
+        if self._cache.enabled:
+            cache_key = tuple(getattr(student_data, field) for field in FEATURE_COLUMNS)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if self._micro_batcher is not None:
+            # Scored together with concurrent requests in one model call
+            result = self._micro_batcher.predict(student_data)
+        else:
+            model, features = self._single_features(state, student_data)
+            result = self._build_responses(state, model, features)[0]
+        
+        if self._cache.enabled:
+            self._cache.put(cache_key, result, generation)
+        return result
+    
+    def predict_json(self, student_data: SimpleStudentData) -> bytes:
+        """
+        Same prediction as predict(), returned as the encoded /api/predict body
+        (byte-identical to jsonify(result.to_dict()) with Flask's defaults)
+        """
+        generation = self._cache.generation
+        state = self._state
+        if not state.is_loaded:
             raise Exception("Model not loaded")
         
-        # Convert pydantic model to dict with correct column names
-        data_dict = {
-            'Age at enrollment': student_data.age_at_enrollment,
-            'Gender': student_data.gender,
-            'Marital status': student_data.marital_status,
-            'Admission grade': student_data.admission_grade,
-            'Daytime/evening attendance': student_data.daytime_evening_attendance,
-            'Scholarship holder': student_data.scholarship_holder,
-            'Tuition fees up to date': student_data.tuition_fees_up_to_date,
-            'Curricular units 1st sem (enrolled)': student_data.curricular_units_1st_sem_enrolled,
-            'Curricular units 1st sem (approved)': student_data.curricular_units_1st_sem_approved,
-            'Curricular units 1st sem (grade)': student_data.curricular_units_1st_sem_grade,
-            'Curricular units 2nd sem (enrolled)': student_data.curricular_units_2nd_sem_enrolled,
-            'Curricular units 2nd sem (approved)': student_data.curricular_units_2nd_sem_approved,
-            'Curricular units 2nd sem (grade)': student_data.curricular_units_2nd_sem_grade,
-            'Unemployment rate': student_data.unemployment_rate
+        if state.encoder is None or self._micro_batcher is not None:
+            result = self.predict(student_data)
+            started = perf_counter()
+            body = encode_json(result.to_dict())
+            observe_phase('jsonify', perf_counter() - started)
+            return body
+        
+        if self._cache.enabled:
+            cache_key = (_JSON_CACHE_KEY,) + tuple(getattr(student_data, field) for field in FEATURE_COLUMNS)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        model, features = self._single_features(state, student_data)
+        predictions, probabilities = self._score(model, features)
+        started = perf_counter()
+        body = state.encoder.encode(predictions[0], None if probabilities is None else probabilities[0])
+        observe_phase('jsonify', perf_counter() - started)
+        
+        if self._cache.enabled:
+            self._cache.put(cache_key, body, generation)
+        return body
+    
+    def _single_features(self, state: ModelState, student_data: SimpleStudentData):
+        """The model to call and its one-row input for a single student"""
+        started = perf_counter()
+        if state.inference_model is None:
+            model, features = state.model, self._build_feature_frame([student_data], state)
+        else:
+            # Write the fields straight into the preallocated row, in training order
+            model, features = state.inference_model, self._get_row_buffer(len(state.feature_fields))
+            for i, field in enumerate(state.feature_fields):
+                features[0, i] = getattr(student_data, field)
+        observe_phase('feature_assembly', perf_counter() - started)
+        return model, features
+    
+    def predict_batch(self, students: List[SimpleStudentData]) -> List[PredictionResponse]:
+        """Make predictions for many students with a single model call"""
+        state = self._state
+        if not state.is_loaded:
+            raise Exception("Model not loaded")
+        
+        if not students:
+            return []
+        
+        started = perf_counter()
+        if state.inference_model is None:
+            model = state.model
+            features = self._build_feature_frame(students, state)
+        else:
+            model = state.inference_model
+            features = np.array(
+                [[getattr(student, field) for field in state.feature_fields] for student in students],
+                dtype=np.float64
+            )
+        observe_phase('feature_assembly', perf_counter() - started)
+        return self._build_responses(state, model, features)
+    
+    def predict_student_batch(
+        self, batch: StudentBatch
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], List[str], Dict[str, Any]]:
+        """
+        Score a columnar batch with one model call. Returns the predicted labels,
+        the class probabilities (None without predict_proba), the class names in
+        probability order and the model_info of the responses
+        """
+        state = self._state
+        if not state.is_loaded:
+            raise Exception("Model not loaded")
+        
+        started = perf_counter()
+        if state.inference_model is None:
+            import pandas as pd
+            
+            model = state.model
+            features = pd.DataFrame({FEATURE_COLUMNS[field]: batch.columns[field] for field in FEATURE_COLUMNS})
+            features = features[state.model_info['feature_names']]
+        else:
+            model = state.inference_model
+            features = batch.to_matrix(state.feature_fields)
+        observe_phase('feature_assembly', perf_counter() - started)
+        
+        predictions, probabilities = self._score(model, features)
+        return predictions, probabilities, [str(cls) for cls in model.classes_], dict(state.response_model_info)
+    
+    def explain(self, student_data: SimpleStudentData, method: str = 'auto') -> Optional[Dict[str, Any]]:
+        """
+        Prediction for one student with each feature's contribution, largest
+        first for the predicted class. None when the model cannot be explained
+        """
+        state = self._state
+        if not state.is_loaded:
+            raise Exception("Model not loaded")
+        if state.explainer is None:
+            return None
+        
+        row = np.array([getattr(student_data, field) for field in state.feature_fields], dtype=np.float64)
+        started = perf_counter()
+        prediction = str(state.inference_model.predict(row[None, :])[0])
+        explanation = state.explainer.explain(row, method)
+        observe_phase('explain', perf_counter() - started)
+        
+        explanation['contributions'].sort(key=lambda entry: -abs(entry['contribution'].get(prediction, 0.0)))
+        return {
+            "prediction": prediction,
+            "confidence": explanation.pop('probabilities'),
+            **explanation,
+            "model_info": dict(state.response_model_info)
         }
+    
+    def predict_frame(self, frame: 'pd.DataFrame') -> Tuple[np.ndarray, Optional[np.ndarray], List[str]]:
+        """
+        Score a DataFrame with the training column names, for bulk scoring.
+        Returns the predicted labels, the class probabilities (None when the
+        model has no predict_proba) and the class names in probability order
+        """
+        state = self._state
+        if not state.is_loaded:
+            raise Exception("Model not loaded")
         
-        # Create DataFrame with single row
-        df = pd.DataFrame([data_dict])
+        frame = frame[state.model_info['feature_names']]
+        if state.inference_model is None:
+            model, features = state.model, frame
+        else:
+            model, features = state.inference_model, frame.to_numpy(dtype=np.float64)
         
-        # Ensure columns are in the same order as training
-        feature_names = self.model_info['feature_names']
-        df = df[feature_names]
+        predictions = model.predict(features)
+        probabilities = model.predict_proba(features) if hasattr(model, 'predict_proba') else None
+        return predictions, probabilities, [str(cls) for cls in model.classes_]
+    
+    def _build_feature_frame(self, students: List[SimpleStudentData], state: ModelState = None) -> 'pd.DataFrame':
+        """Build a DataFrame with the training column names and order"""
+        import pandas as pd
         
-        # Make prediction
-        prediction = self.model.predict(df)[0]
+        state = state or self._state
+        df = pd.DataFrame(
+            [[getattr(student, field) for field in FEATURE_COLUMNS] for student in students],
+            columns=list(FEATURE_COLUMNS.values())
+        )
+        return df[state.model_info['feature_names']]
+    
+    def _score(self, model, features) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Predicted labels and class probabilities (None when unavailable) for the feature matrix"""
+        # Make predictions
+        started = perf_counter()
+        predictions = model.predict(features)
+        observe_phase('model_predict', perf_counter() - started)
         
         # Get prediction probabilities
-        confidence = {}
-        if hasattr(self.model, 'predict_proba'):
+        probabilities = None
+        if hasattr(model, 'predict_proba'):
             try:
-                probabilities = self.model.predict_proba(df)[0]
-                classes = self.model.classes_
-                confidence = {str(cls): float(prob) for cls, prob in zip(classes, probabilities)}
+                started = perf_counter()
+                probabilities = model.predict_proba(features)
+                observe_phase('model_predict_proba', perf_counter() - started)
             except Exception as e:
-                log_error(f"💥 Error getting probabilities: {e}")
-                confidence = {"prediction_only": 1.0}
-        else:
-            confidence = {"prediction_only": 1.0}
-        
-        return PredictionResponse(
-            prediction=str(prediction),
-            confidence=confidence,
-            model_info={
-                "model_name": self.model_info.get("model_name", "Unknown"),
-                "features_used": len(feature_names),
-                "is_simplified": True
-            }
-        )
+                log_error("💥 Error getting probabilities: %s", e)
+        return predictions, probabilities
+    
+    def _build_responses(self, state: ModelState, model, features) -> List[PredictionResponse]:
+        """Run the model once over the feature matrix and build one response per row"""
+        predictions, probabilities = self._score(model, features)
+        
+        confidences = None
+        if probabilities is not None:
+            classes = [str(cls) for cls in model.classes_]
+            confidences = [
+                {cls: float(prob) for cls, prob in zip(classes, row)}
+                for row in probabilities
+            ]
+        
+        model_info = state.response_model_info
+        
+        return [
+            PredictionResponse(
+                prediction=str(prediction),
+                confidence=confidences[i] if confidences is not None else {"prediction_only": 1.0},
+                model_info=dict(model_info)
+            )
+            for i, prediction in enumerate(predictions)
+        ]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get prediction cache counters"""
+        return self._cache.stats()
+    
+    def get_micro_batch_stats(self) -> Optional[Dict[str, Any]]:
+        """Get micro-batcher fill and wait statistics, None when disabled"""
+        if self._micro_batcher is None:
+            return None
+        return self._micro_batcher.stats()
     
     def get_features_info(self) -> Dict[str, Any]:
         """Get features information with descriptions"""
         if not self.is_model_loaded():
             return None
         
-        feature_descriptions = {
-            'Age at enrollment': 'Idade do estudante na matrícula (16-80 anos)',
-            'Gender': 'Gênero (0=Feminino, 1=Masculino)',
-            'Marital status': 'Estado civil (1=Solteiro, 2=Casado, 3=Divorciado, 4=Viúvo)',
-            'Admission grade': 'Nota de admissão (0-200)',
-            'Daytime/evening attendance': 'Período (0=Noturno, 1=Diurno)',
-            'Scholarship holder': 'Bolseiro (0=Não, 1=Sim)',
-            'Tuition fees up to date': 'Propinas em dia (0=Não, 1=Sim)',
-            'Curricular units 1st sem (enrolled)': 'Unidades curriculares matriculadas no 1º semestre',
-            'Curricular units 1st sem (approved)': 'Unidades curriculares aprovadas no 1º semestre',
-            'Curricular units 1st sem (grade)': 'Nota média do 1º semestre (0-20)',
-            'Curricular units 2nd sem (enrolled)': 'Unidades curriculares matriculadas no 2º semestre',
-            'Curricular units 2nd sem (approved)': 'Unidades curriculares aprovadas no 2º semestre',
-            'Curricular units 2nd sem (grade)': 'Nota média do 2º semestre (0-20)',
-            'Unemployment rate': 'Taxa de desemprego (%)'
-        }
-        
         features = []
         for feature_name in self.model_info['feature_names']:
             features.append({
                 'name': feature_name,
-                'description': feature_descriptions.get(feature_name, 'Descrição não disponível')
+                'description': FEATURE_DESCRIPTIONS.get(feature_name, 'Descrição não disponível')
             })
         
         return {
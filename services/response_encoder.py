@@ -0,0 +1,53 @@
+"""
+Pre-encoded JSON for /api/predict responses.
+
+The body of a prediction only varies in the predicted class and the class
+probabilities; the keys, the class names and the model_info fragment are the
+same for every request of a loaded model. ResponseEncoder encodes those parts
+once per model load and joins them with the per-request values, producing the
+same bytes as Flask's jsonify in its default (compact, sorted keys, ASCII)
+configuration, trailing newline included.
+"""
+import json
+import math
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def encode_json(obj: Any) -> bytes:
+    """json.dumps with jsonify's compact defaults, for bodies without a template"""
+    return (json.dumps(obj, sort_keys=True, separators=(',', ':')) + '\n').encode()
+
+
+def _encode_float(value: float) -> str:
+    # json.dumps writes floats with float.__repr__, and NaN/Infinity by name
+    return float.__repr__(value) if math.isfinite(value) else json.dumps(value)
+
+
+class ResponseEncoder:
+    """JSON body of a PredictionResponse for one model, built from pre-encoded fragments"""
+
+    def __init__(self, classes: Sequence[Any], model_info: Dict[str, Any]):
+        self.classes = [str(cls) for cls in classes]
+        # Probability columns in key order, with their encoded '"name":' prefixes
+        self._order = sorted(range(len(self.classes)), key=lambda i: self.classes[i])
+        self._keys = [encode_basestring_ascii(self.classes[i]) + ':' for i in self._order]
+        self._prefix = '{"confidence":{'
+        self._suffix = '},"model_info":' + json.dumps(model_info, sort_keys=True, separators=(',', ':')) \
+            + ',"prediction":'
+        self._predictions = {cls: encode_basestring_ascii(cls) + '}\n' for cls in self.classes}
+
+    def _encode_prediction(self, prediction: str) -> str:
+        encoded = self._predictions.get(prediction)
+        return encoded if encoded is not None else encode_basestring_ascii(prediction) + '}\n'
+
+    def encode(self, prediction: Any, probabilities: Optional[np.ndarray]) -> bytes:
+        """Body for one prediction and its row of class probabilities (None without predict_proba)"""
+        if probabilities is None:
+            confidence = '"prediction_only":1.0'
+        else:
+            values = probabilities.tolist()
+            confidence = ','.join(key + _encode_float(values[i]) for key, i in zip(self._keys, self._order))
+        return (self._prefix + confidence + self._suffix + self._encode_prediction(str(prediction))).encode()
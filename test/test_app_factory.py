@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+from core.app_factory import create_app
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+class TestAppFactory:
+    
+    def test_background_load_serves_503_until_ready(self):
+        release = threading.Event()
+        loaded = {'value': False}
+        
+        def slow_load():
+            release.wait(5)
+            loaded['value'] = True
+            return True
+        
+        with patch('core.app_factory.settings') as mock_settings, \
+                patch('core.app_factory.prediction_service') as mock_service, \
+                patch('routers.prediction.prediction_service', mock_service):
+            mock_settings.MODEL_BACKGROUND_LOAD = True
+            mock_settings.MODEL_WATCH_INTERVAL = 0
+            mock_service.load_model.side_effect = slow_load
+            mock_service.is_model_loaded.side_effect = lambda: loaded['value']
+            
+            app = create_app()
+            client = app.test_client()
+            
+            response = client.post('/api/predict', data=json.dumps({}), content_type='application/json')
+            assert response.status_code == 503
+            assert json.loads(response.data)['error'] == 'Model not loaded'
+            
+            release.set()
+            app.model_loader.join(5)
+            assert client.get('/api/').get_json()['model_loaded'] is True
+
+    def test_app_import_defers_heavy_modules(self):
+        script = (
+            "import sys\n"
+            "import core.app_factory\n"
+            "heavy = [name for name in ('pandas', 'sklearn', 'joblib') if name in sys.modules]\n"
+            "assert not heavy, heavy\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from config import settings
+from services.compiled_model import CompiledModel, export_pipeline_arrays, save_compiled_model
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+class TestCompiledModel:
+
+    @pytest.fixture
+    def training_data(self):
+        """Dados sintéticos com 14 features em escalas diferentes e 3 classes"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(500, 14)) * rng.uniform(1, 50, 14) + rng.uniform(0, 100, 14)
+        labels = (X[:, 0] / 50 + X[:, 3] / 30 + rng.normal(size=500)).astype(int) % 3
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[labels]
+        return X, y
+
+    @pytest.mark.parametrize('estimator', [
+        SVC(kernel='rbf', probability=True, random_state=42),
+        SVC(kernel='linear', C=10, probability=True, random_state=42),
+        KNeighborsClassifier(n_neighbors=7),
+        DecisionTreeClassifier(max_depth=8, random_state=42),
+        GaussianNB(),
+    ], ids=['svm-rbf', 'svm-linear', 'knn', 'cart', 'nb'])
+    def test_parity_on_training_data(self, training_data, estimator):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('model', estimator)]).fit(X, y)
+
+        compiled = CompiledModel(export_pipeline_arrays(pipeline))
+
+        np.testing.assert_allclose(compiled.predict_proba(X), pipeline.predict_proba(X), rtol=0, atol=1e-8)
+        assert (compiled.predict(X) == pipeline.predict(X)).all()
+        assert list(compiled.classes_) == list(pipeline.classes_)
+
+    def test_save_and_load_roundtrip(self, training_data, tmp_path):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('NB', GaussianNB())]).fit(X, y)
+        path = str(tmp_path / 'model.npz')
+
+        save_compiled_model(pipeline, path, {'model_info': {'model_name': 'NB'}})
+        compiled = CompiledModel.load(path)
+
+        assert compiled.family == 'nb'
+        assert compiled.metadata['model_info']['model_name'] == 'NB'
+        np.testing.assert_allclose(compiled.predict_proba(X), pipeline.predict_proba(X), atol=1e-12)
+
+    def test_unsupported_estimator(self, training_data):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('SVM', SVC(probability=False))]).fit(X, y)
+
+        with pytest.raises(ValueError, match="probability=True"):
+            export_pipeline_arrays(pipeline)
+
+    def test_shipped_artifact_matches_pickle(self):
+        model_path = os.path.join(PROJECT_ROOT, settings.MODEL_PATH)
+        compiled_path = os.path.join(PROJECT_ROOT, settings.COMPILED_MODEL_PATH)
+        if not (os.path.exists(model_path) and os.path.exists(compiled_path)):
+            pytest.skip("Artefatos do modelo não disponíveis")
+
+        pipeline = joblib.load(model_path)
+        compiled = CompiledModel.load(compiled_path)
+        rng = np.random.default_rng(1)
+        X = rng.uniform(0, 1, size=(300, 14)) * [60, 1, 4, 200, 1, 1, 1, 10, 10, 20, 10, 10, 20, 20]
+
+        np.testing.assert_allclose(compiled.predict_proba(X), pipeline.predict_proba(X.tolist()), atol=1e-8)
+
+    def test_service_loads_without_sklearn(self):
+        if not os.path.exists(os.path.join(PROJECT_ROOT, settings.COMPILED_MODEL_PATH)):
+            pytest.skip("Modelo compilado não disponível")
+
+        script = (
+            "import sys\n"
+            "from config import settings\n"
+            "settings.USE_COMPILED_MODEL = True\n"
+            "from services.prediction_service import PredictionService\n"
+            "service = PredictionService()\n"
+            "assert service.load_model()\n"
+            "assert service.model.family\n"
+            "assert 'sklearn' not in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from training.dataset import SELECTED_FEATURES, DatasetUnavailableError, load_dataset
+
+URL = 'https://example.com/data.csv'
+
+
+class TestDataset:
+
+    @pytest.fixture
+    def raw_csv(self):
+        """CSV no formato do dataset original, com colunas extras e um tab no nome"""
+        rng = np.random.default_rng(0)
+        frame = pd.DataFrame({name: rng.integers(0, 10, 20) for name in SELECTED_FEATURES})
+        frame['Admission grade'] = rng.uniform(95, 190, 20)
+        frame = frame.rename(columns={'Daytime/evening attendance': 'Daytime/evening attendance\t'})
+        frame['Nacionality'] = 1
+        frame['Target'] = ['Dropout', 'Graduate'] * 10
+        return frame.to_csv(sep=';', index=False).encode()
+
+    def test_local_file_pruned_and_cached(self, raw_csv, tmp_path):
+        source = tmp_path / 'data.csv'
+        source.write_bytes(raw_csv)
+        cache_dir = tmp_path / 'cache'
+
+        first = load_dataset(str(source), str(cache_dir), verbose=False)
+        with patch('training.dataset.pd.read_csv', side_effect=AssertionError('parsed twice')):
+            second = load_dataset(str(source), str(cache_dir), verbose=False)
+
+        assert list(first.columns) == SELECTED_FEATURES + ['Target']
+        assert first['Admission grade'].dtype == np.float64
+        assert first['Gender'].dtype.kind == 'i'
+        pd.testing.assert_frame_equal(first, second)
+        assert len(list(cache_dir.glob('*.npz'))) == 1
+
+    def test_changed_file_gets_new_entry(self, raw_csv, tmp_path):
+        source = tmp_path / 'data.csv'
+        source.write_bytes(raw_csv)
+        load_dataset(str(source), str(tmp_path / 'cache'), verbose=False)
+
+        source.write_bytes(raw_csv.replace(b'Dropout', b'Enrolled'))
+        frame = load_dataset(str(source), str(tmp_path / 'cache'), verbose=False)
+
+        assert 'Enrolled' in set(frame['Target'])
+        assert len(list((tmp_path / 'cache').glob('*.npz'))) == 2
+
+    def test_url_downloaded_once(self, raw_csv, tmp_path):
+        with patch('training.dataset._download', return_value=raw_csv) as download:
+            load_dataset(URL, str(tmp_path), verbose=False)
+            load_dataset(URL, str(tmp_path), verbose=False)
+            load_dataset(URL, str(tmp_path), refresh=True, verbose=False)
+
+        assert download.call_count == 2
+
+    def test_offline_uses_cache(self, raw_csv, tmp_path):
+        with patch('training.dataset._download', return_value=raw_csv):
+            expected = load_dataset(URL, str(tmp_path), verbose=False)
+
+        with patch('training.dataset._download', side_effect=AssertionError('network used')):
+            frame = load_dataset(URL, str(tmp_path), offline=True, refresh=True, verbose=False)
+
+        pd.testing.assert_frame_equal(frame, expected)
+
+    def test_offline_without_cache(self, tmp_path):
+        with patch('training.dataset._download', side_effect=AssertionError('network used')):
+            with pytest.raises(DatasetUnavailableError, match='Offline'):
+                load_dataset(URL, str(tmp_path), offline=True, verbose=False)
@@ -0,0 +1,110 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from services.compiled_model import CompiledModel, export_pipeline_arrays
+from services.explainer import Explainer
+
+FIELDS = [f'field_{i}' for i in range(14)]
+NAMES = [f'Feature {i}' for i in range(14)]
+
+
+def _contributions(explanation):
+    return np.array([list(entry['contribution'].values()) for entry in explanation['contributions']])
+
+
+class TestExplainer:
+
+    @pytest.fixture
+    def training_data(self):
+        """Dados sintéticos com 14 features em escalas diferentes e 3 classes"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(400, 14)) * rng.uniform(1, 50, 14) + rng.uniform(0, 100, 14)
+        labels = (X[:, 0] / 50 + X[:, 3] / 30 + rng.normal(size=400)).astype(int) % 3
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[labels]
+        return X, y
+
+    def _fit(self, training_data, estimator):
+        X, y = training_data
+        return Pipeline([('StandardScaler', StandardScaler()), ('model', estimator)]).fit(X, y)
+
+    def test_naive_bayes_terms_are_exact(self, training_data):
+        pipeline = self._fit(training_data, GaussianNB())
+        X = training_data[0][:20]
+        expected_jll = pipeline[-1].predict_joint_log_proba(pipeline[0].transform(X))
+
+        for model in (pipeline, CompiledModel(export_pipeline_arrays(pipeline))):
+            explainer = Explainer.from_model(model, model, FIELDS, NAMES)
+            for row, jll, probabilities in zip(X, expected_jll, pipeline.predict_proba(X)):
+                explanation = explainer.explain(row)
+
+                assert explanation['method'] == 'nb'
+                assert explanation['units'] == 'log_likelihood'
+                np.testing.assert_allclose(list(explanation['probabilities'].values()), probabilities, atol=1e-12)
+                # Baseline log-likelihood plus the contributions is the student's
+                total = np.array(list(explanation['baseline'].values())) + _contributions(explanation).sum(axis=0)
+                np.testing.assert_allclose(total, jll, rtol=1e-10)
+
+    def test_decision_path_is_exact(self, training_data):
+        pipeline = self._fit(training_data, DecisionTreeClassifier(max_depth=6, random_state=42))
+        X = training_data[0][:50]
+        explainer = Explainer.from_model(pipeline, pipeline, FIELDS, NAMES)
+
+        for row, probabilities in zip(X, pipeline.predict_proba(X)):
+            explanation = explainer.explain(row)
+
+            assert explanation['method'] == 'cart'
+            np.testing.assert_allclose(list(explanation['probabilities'].values()), probabilities)
+            total = np.array(list(explanation['baseline'].values())) + _contributions(explanation).sum(axis=0)
+            np.testing.assert_allclose(total, probabilities, atol=1e-12)
+            # Only features split on along the path get credit
+            used = set(pipeline[-1].tree_.feature[pipeline[-1].decision_path(
+                pipeline[0].transform(row[None, :]).astype(np.float32)).indices])
+            assert all(i in used for i in np.flatnonzero(np.abs(_contributions(explanation)).sum(axis=1)))
+
+    def test_perturbation_uses_one_predict_proba_call(self, training_data):
+        pipeline = self._fit(training_data, SVC(kernel='linear', probability=True, random_state=42))
+        model = Mock(wraps=pipeline, classes_=pipeline.classes_)
+        explainer = Explainer.from_model(pipeline, model, FIELDS, NAMES)
+        # The baseline is scored once, when the explainer is built
+        assert model.predict_proba.call_count == 1
+
+        row = training_data[0][0].copy()
+        row[5] = explainer.baseline[5]
+        explanation = explainer.explain(row)
+
+        assert model.predict_proba.call_count == 2
+        assert explanation['method'] == 'perturbation'
+        contributions = _contributions(explanation)
+        assert not contributions[5].any()
+        for i in (0, 3, 13):
+            perturbed = row.copy()
+            perturbed[i] = explainer.baseline[i]
+            expected = pipeline.predict_proba(row[None, :])[0] - pipeline.predict_proba(perturbed[None, :])[0]
+            np.testing.assert_allclose(contributions[i], expected, atol=1e-12)
+
+    def test_baseline_is_the_training_mean(self, training_data):
+        pipeline = self._fit(training_data, GaussianNB())
+        explainer = Explainer.from_model(pipeline, pipeline, FIELDS, NAMES)
+
+        explanation = explainer.explain(training_data[0][0], method='perturbation')
+
+        np.testing.assert_allclose(explainer.baseline, training_data[0].mean(axis=0))
+        assert explanation['method'] == 'perturbation'
+        assert [entry['baseline'] for entry in explanation['contributions']] == explainer.baseline.tolist()
+        assert [entry['field'] for entry in explanation['contributions']] == FIELDS
+        with pytest.raises(ValueError):
+            explainer.explain(training_data[0][0], method='shap')
+
+    def test_unavailable_without_baseline_or_probabilities(self, training_data):
+        pipeline = self._fit(training_data, GaussianNB())
+        no_scaler = Mock(spec=['predict', 'predict_proba', 'classes_'])
+
+        assert Explainer.from_model(no_scaler, no_scaler, FIELDS, NAMES) is None
+        assert Explainer.from_model(pipeline, Mock(spec=['predict', 'classes_']), FIELDS, NAMES) is None
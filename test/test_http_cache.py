@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+from flask import Flask
+
+from utils.http_cache import VersionedBodies, cache_control_header, conditional_response
+
+
+class TestHttpCache:
+
+    def test_body_built_once_per_key(self):
+        bodies = VersionedBodies()
+        build = Mock(return_value=b'{"a":1}\n')
+
+        first = bodies.get('root', 'v1', build)
+        second = bodies.get('root', 'v1', build)
+
+        assert first == second
+        assert build.call_count == 1
+
+    def test_new_key_rebuilds_and_changes_etag(self):
+        bodies = VersionedBodies()
+
+        _, first_etag = bodies.get('root', 'v1', lambda: b'{"a":1}\n')
+        body, second_etag = bodies.get('root', 'v2', lambda: b'{"a":2}\n')
+
+        assert body == b'{"a":2}\n'
+        assert first_etag != second_etag
+
+    def test_missing_body_is_not_stored(self):
+        bodies = VersionedBodies()
+        build = Mock(return_value=None)
+
+        assert bodies.get('features', None, build) is None
+        assert bodies.get('features', None, build) is None
+        assert build.call_count == 2
+
+    def test_conditional_response(self):
+        app = Flask(__name__)
+
+        with app.test_request_context(headers={'If-None-Match': 'W/"other", "abc"'}):
+            not_modified = conditional_response(b'{}\n', 'abc', 'no-cache')
+        with app.test_request_context():
+            full = conditional_response(b'{}\n', 'abc', 'no-cache')
+
+        assert not_modified.status_code == 304
+        assert not_modified.get_data() == b''
+        assert full.status_code == 200 and full.get_data() == b'{}\n'
+        assert full.headers['ETag'] == not_modified.headers['ETag'] == '"abc"'
+        assert full.headers['Cache-Control'] == 'no-cache'
+
+    def test_cache_control_header(self):
+        assert cache_control_header(0) == 'no-cache'
+        assert cache_control_header(30) == 'public, max-age=30'
@@ -0,0 +1,104 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from services.prediction_service import FEATURE_COLUMNS
+from training.incremental import IncrementalUpdateError, drift_report, run_update, update_pipeline
+
+
+class TestIncrementalUpdate:
+
+    @pytest.fixture
+    def terms(self):
+        """Dois períodos de dados; o segundo com médias deslocadas"""
+        rng = np.random.default_rng(0)
+        columns = list(FEATURE_COLUMNS.values())
+
+        def term(rows, shift):
+            X = pd.DataFrame(rng.normal(size=(rows, 14)) * rng.uniform(1, 30, 14) + shift, columns=columns)
+            labels = (X.iloc[:, 0] / 20 + X.iloc[:, 3] / 15 + rng.normal(size=rows)).astype(int) % 3
+            return X, np.array(['Dropout', 'Enrolled', 'Graduate'])[labels]
+        return term(600, 0.0), term(200, 5.0)
+
+    def pipeline(self, estimator):
+        return Pipeline([('StandardScaler', StandardScaler()), ('model', estimator)])
+
+    @pytest.mark.parametrize('estimator', [GaussianNB(), KNeighborsClassifier(n_neighbors=5)])
+    def test_matches_full_refit(self, terms, estimator):
+        (X_old, y_old), (X_new, y_new) = terms
+        previous = self.pipeline(estimator).fit(X_old, y_old)
+
+        updated = update_pipeline(previous, X_new, y_new)
+        refit = self.pipeline(estimator).fit(pd.concat([X_old, X_new]), np.concatenate([y_old, y_new]))
+
+        probe = pd.concat([X_old.iloc[:100], X_new.iloc[:100]])
+        np.testing.assert_allclose(updated.predict_proba(probe), refit.predict_proba(probe), atol=1e-6)
+        np.testing.assert_allclose(updated.named_steps['StandardScaler'].mean_,
+                                   refit.named_steps['StandardScaler'].mean_)
+
+    def test_previous_pipeline_unchanged(self, terms):
+        (X_old, y_old), (X_new, y_new) = terms
+        previous = self.pipeline(GaussianNB()).fit(X_old, y_old)
+        before = previous.predict_proba(X_new)
+
+        update_pipeline(previous, X_new, y_new)
+
+        np.testing.assert_array_equal(previous.predict_proba(X_new), before)
+
+    def test_unsupported_families(self, terms):
+        (X_old, y_old), (X_new, y_new) = terms
+        svm = self.pipeline(SVC(probability=True)).fit(X_old.iloc[:100], y_old[:100])
+
+        with pytest.raises(IncrementalUpdateError, match='SVC'):
+            update_pipeline(svm, X_new, y_new)
+
+    def test_new_class_needs_retrain(self, terms):
+        (X_old, y_old), (X_new, y_new) = terms
+        previous = self.pipeline(GaussianNB()).fit(X_old, y_old)
+
+        with pytest.raises(IncrementalUpdateError, match='Transfer'):
+            update_pipeline(previous, X_new, np.where(y_new == 'Dropout', 'Transfer', y_new))
+
+    def test_drift_report(self, terms):
+        (X_old, y_old), (X_new, y_new) = terms
+        previous = self.pipeline(GaussianNB()).fit(X_old, y_old)
+        updated = update_pipeline(previous, X_new, y_new)
+
+        report = drift_report(previous, updated, X_new, y_new)
+
+        assert 0.0 <= report['disagreement'] <= 1.0
+        assert report['feature_mean_shift']['Age at enrollment'] > 0
+        assert set(report['prediction_share']['updated']) == {'Dropout', 'Enrolled', 'Graduate'}
+        assert 'updated_accuracy' in report
+
+    def test_run_update_writes_versioned_artifacts(self, terms, tmp_path, monkeypatch):
+        (X_old, y_old), (X_new, y_new) = terms
+        model_path, info_path = tmp_path / 'model.pkl', tmp_path / 'info.pkl'
+        joblib.dump(self.pipeline(GaussianNB()).fit(X_old, y_old), model_path)
+        joblib.dump({'model_name': 'NB', 'feature_names': list(X_old.columns),
+                     'classes': ['Dropout', 'Enrolled', 'Graduate']}, info_path)
+        data_path = tmp_path / 'term.csv'
+        X_new.assign(Target=y_new).to_csv(data_path, index=False)
+        monkeypatch.setattr('training.incremental.settings.COMPILED_MODEL_PATH', str(tmp_path / 'missing.npz'))
+        monkeypatch.setattr('training.incremental.settings.MODEL_BUNDLE_PATH', str(tmp_path / 'missing.bundle'))
+
+        held = run_update(str(data_path), str(model_path), str(info_path), str(tmp_path / 'versions'),
+                          promote=True, max_disagreement=-1.0)
+        result = run_update(str(data_path), str(model_path), str(info_path), str(tmp_path / 'versions'),
+                            promote=True)
+
+        assert held['drifted'] and not held['promoted']
+        assert result['promoted']
+        info = joblib.load(info_path)
+        assert info['version'] == result['version']
+        assert info['n_samples_seen'] == 800
+        assert info['incremental_updates'] == 1
+        versions = {held['version'], result['version']}
+        assert len(list((tmp_path / 'versions').iterdir())) == 4 * len(versions)
+        assert all(result['version'] in path for path in result['paths'].values())
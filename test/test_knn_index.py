@@ -0,0 +1,94 @@
+import io
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from config import settings
+from services.knn_index import ApproximateKNNModel, IVFIndex, is_knn_model, tune_tree_index
+from services.prediction_service import FEATURE_COLUMNS, ModelState
+
+
+class TestKnnIndex:
+
+    @pytest.fixture
+    def knn_pipeline(self):
+        """KNN com 2000 linhas de referência agrupadas em 14 dimensões"""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(10, 14)) * 3
+        X = centers[rng.integers(0, 10, 2000)] + rng.normal(size=(2000, 14))
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, 2000)]
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier(5))]).fit(X, y)
+        return pipeline, X
+
+    def test_tuned_tree_index_is_pickled(self, knn_pipeline):
+        pipeline, X = knn_pipeline
+        expected = pipeline.predict_proba(X[:50])
+
+        info = tune_tree_index(pipeline, leaf_sizes=(10, 40), single_queries=20)
+        buffer = io.BytesIO()
+        joblib.dump(pipeline, buffer)
+        restored = joblib.load(io.BytesIO(buffer.getvalue()))
+
+        knn = restored.steps[-1][1]
+        assert info['algorithm'] in ('kd_tree', 'ball_tree')
+        assert knn.algorithm == info['algorithm'] and knn.leaf_size == info['leaf_size']
+        assert knn._fit_method == info['algorithm']
+        assert len(info['timings']) == 4
+        np.testing.assert_array_equal(restored.predict_proba(X[:50]), expected)
+
+    def test_ivf_probing_every_cell_is_exact(self, knn_pipeline):
+        pipeline, X = knn_pipeline
+        approximate = ApproximateKNNModel.from_model(pipeline, n_lists=16, nprobe=16)
+
+        np.testing.assert_array_equal(approximate.predict_proba(X[:100]), pipeline.predict_proba(X[:100]))
+        np.testing.assert_array_equal(approximate.predict(X[:100]), pipeline.predict(X[:100]))
+
+    def test_ivf_recall_grows_with_nprobe(self, knn_pipeline):
+        pipeline, X = knn_pipeline
+        queries = X[:200] + 0.1
+        exact = pipeline.predict_proba(queries)
+
+        errors = [
+            np.abs(ApproximateKNNModel.from_model(pipeline, n_lists=40, nprobe=nprobe).predict_proba(queries) - exact).mean()
+            for nprobe in (1, 8, 40)
+        ]
+
+        assert errors[0] >= errors[1] >= errors[2] == 0.0
+
+    def test_ivf_probes_extra_cells_for_enough_neighbors(self):
+        points = np.arange(20, dtype=np.float64).reshape(10, 2)
+        index = IVFIndex.build(points, np.zeros(10, dtype=np.int64), n_lists=10, nprobe=1)
+
+        neighbors = index.kneighbors(points[:1], 3)
+
+        assert sorted(index.points[neighbors[0], 0]) == [0.0, 2.0, 4.0]
+
+    def test_service_uses_approximate_index(self, knn_pipeline, monkeypatch):
+        pipeline, _ = knn_pipeline
+        model_info = {'model_name': 'KNN', 'feature_names': list(FEATURE_COLUMNS.values())}
+        monkeypatch.setattr(settings, 'KNN_APPROXIMATE', True)
+        monkeypatch.setattr(settings, 'KNN_IVF_LISTS', 8)
+        monkeypatch.setattr(settings, 'KNN_IVF_NPROBE', 2)
+
+        state = ModelState(pipeline, model_info, prepare=True)
+
+        assert is_knn_model(pipeline)
+        assert isinstance(state.inference_model, ApproximateKNNModel)
+        assert state.inference_model.index.nprobe == 2
+
+    def test_service_keeps_exact_model_when_index_unsupported(self, knn_pipeline, monkeypatch):
+        _, X = knn_pipeline
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[np.arange(len(X)) % 3]
+        pipeline = Pipeline([('StandardScaler', StandardScaler()),
+                             ('KNN', KNeighborsClassifier(5, weights='distance'))]).fit(X, y)
+        model_info = {'model_name': 'KNN', 'feature_names': list(FEATURE_COLUMNS.values())}
+        monkeypatch.setattr(settings, 'KNN_APPROXIMATE', True)
+
+        state = ModelState(pipeline, model_info, prepare=True)
+
+        assert not isinstance(state.inference_model, ApproximateKNNModel)
+        np.testing.assert_array_equal(state.inference_model.predict_proba(X[:20]), pipeline.predict_proba(X[:20]))
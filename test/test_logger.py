@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueListener
+
+import pytest
+
+import logger as app_logger
+from core.app_factory import create_app
+from logger import JsonFormatter, LogSampler, _LazyQueueHandler, request_id_var
+
+
+def _record(message, *args, **attributes):
+    record = logging.LogRecord('logger', logging.ERROR, __file__, 1, message, args, None)
+    record.__dict__.update(attributes)
+    return record
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLogger:
+
+    def test_json_formatter(self):
+        line = JsonFormatter().format(_record("Validation error: %s", "idade", request_id='abc'))
+        entry = json.loads(line)
+
+        assert entry['message'] == "Validation error: idade"
+        assert entry['level'] == 'ERROR'
+        assert entry['request_id'] == 'abc'
+        assert entry['time'].endswith('+00:00')
+
+    def test_json_formatter_exception_and_unicode(self):
+        try:
+            raise ValueError("falhou")
+        except ValueError:
+            record = _record("💥 Erro")
+            record.exc_info = sys.exc_info()
+
+        line = JsonFormatter().format(record)
+        entry = json.loads(line)
+
+        assert '💥' in line
+        assert 'request_id' not in entry
+        assert 'ValueError: falhou' in entry['exception']
+
+    def test_message_is_formatted_on_listener_thread(self):
+        formatted_on = []
+
+        class Value:
+            def __str__(self):
+                formatted_on.append(threading.current_thread())
+                return 'valor'
+
+        handler = _LazyQueueHandler(queue.Queue())
+        output = logging.StreamHandler(open(os.devnull, 'w'))
+        output.setFormatter(JsonFormatter())
+        listener = QueueListener(handler.queue, output)
+        listener.start()
+        try:
+            record = _record("Validation error: %s", Value())
+            handler.handle(record)
+            assert record.args and record.msg == "Validation error: %s"
+        finally:
+            listener.stop()
+            output.stream.close()
+
+        assert formatted_on and formatted_on[0] is not threading.current_thread()
+
+    def test_full_queue_drops_records(self):
+        handler = _LazyQueueHandler(queue.Queue(2))
+
+        for i in range(5):
+            handler.handle(_record("mensagem %d", i))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_sampler_limits_per_window(self):
+        clock = _FakeClock()
+        sampler = LogSampler(3, clock=clock)
+
+        results = [sampler.allow('validation') for _ in range(10)]
+        assert [allowed for allowed, _ in results] == [True] * 3 + [False] * 7
+
+        # Other keys have their own window
+        assert sampler.allow('other') == (True, 0)
+
+        clock.now += 1.0
+        assert sampler.allow('validation') == (True, 7)
+        assert sampler.allow('validation') == (True, 0)
+
+    def test_sampler_disabled(self):
+        sampler = LogSampler(0)
+
+        assert all(sampler.allow('validation')[0] for _ in range(100))
+
+    def test_log_sampled_reports_suppressed(self, monkeypatch, caplog):
+        clock = _FakeClock()
+        monkeypatch.setattr(app_logger, '_sampler', LogSampler(1, clock=clock))
+
+        with caplog.at_level(logging.INFO, logger='logger'):
+            for _ in range(4):
+                app_logger.log_sampled('validation', logging.ERROR, "Validation error: %s", 'idade')
+            clock.now += 1.5
+            app_logger.log_sampled('validation', logging.ERROR, "Validation error: %s", 'nota')
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == ["Validation error: idade", "Validation error: nota (3 similar messages suppressed)"]
+        assert caplog.records[-1].suppressed == 3
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(app_logger, '_sampler', LogSampler(0))
+        return create_app().test_client()
+
+    def test_request_id_echoed_and_logged(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger='logger'):
+            response = client.post('/api/predict', json={'age_at_enrollment': 5},
+                                   headers={'X-Request-ID': 'req-123'})
+
+        assert response.status_code == 400
+        assert response.headers['X-Request-ID'] == 'req-123'
+        validation = [r for r in caplog.records if r.getMessage().startswith('Validation error')]
+        assert validation and validation[-1].request_id == 'req-123'
+        assert request_id_var.get() is None
+
+    def test_request_id_generated(self, client):
+        generated = client.get('/api/').headers['X-Request-ID']
+        replaced = client.get('/api/', headers={'X-Request-ID': 'id com espaços'}).headers['X-Request-ID']
+
+        assert len(generated) == 32
+        assert len(replaced) == 32 and replaced != generated
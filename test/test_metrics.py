@@ -0,0 +1,68 @@
+import threading
+
+from services.metrics import Counter, Histogram, render_gauges
+
+
+class TestMetrics:
+    
+    def test_counter_merges_stripes(self):
+        counter = Counter('requests_total', 'Requests', ('endpoint',))
+        threads = [
+            threading.Thread(target=lambda: [counter.inc(('/a',)) for _ in range(100)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert counter.collect() == {('/a',): 800}
+
+    def test_concurrent_threads_use_different_stripes(self):
+        counter = Counter('requests_total', 'Requests', ('endpoint',))
+        # All threads are alive at once, as with a threaded server
+        barrier = threading.Barrier(8)
+        
+        def record():
+            barrier.wait()
+            counter.inc(('/a',))
+            barrier.wait()
+        
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        used = [values for values, _ in counter._stripes if values]
+        assert len(used) == 8
+        assert counter.collect() == {('/a',): 8}
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('latency_seconds', 'Latency', ('phase',), buckets=(0.1, 1.0))
+        histogram.observe(('validate',), 0.05)
+        histogram.observe(('validate',), 0.1)
+        histogram.observe(('validate',), 0.5)
+        histogram.observe(('validate',), 5.0)
+        
+        lines = histogram.render()
+        
+        assert 'latency_seconds_bucket{phase="validate",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{phase="validate",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{phase="validate",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{phase="validate"} 4' in lines
+        assert 'latency_seconds_sum{phase="validate"} 5.65' in lines
+
+    def test_render_header_and_label_escaping(self):
+        counter = Counter('errors_total', 'Errors', ('message',))
+        counter.inc(('say "hi"\n',))
+        
+        lines = counter.render()
+        
+        assert lines[:2] == ['# HELP errors_total Errors', '# TYPE errors_total counter']
+        assert lines[2] == r'errors_total{message="say \"hi\"\n"} 1'
+
+    def test_render_gauges(self):
+        lines = render_gauges('cache', 'Cache counters', {'misses': 2, 'hits': 0.5}, 'stat')
+        
+        assert lines[2:] == ['cache{stat="hits"} 0.5', 'cache{stat="misses"} 2']
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from services.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    
+    @pytest.fixture
+    def calls(self):
+        return []
+    
+    @pytest.fixture
+    def slow_double(self, calls):
+        def predict_batch(items):
+            calls.append(list(items))
+            time.sleep(0.01)
+            return [item * 2 for item in items]
+        return predict_batch
+    
+    def test_single_caller_is_not_delayed(self, calls, slow_double):
+        batcher = MicroBatcher(slow_double, max_batch_size=8, max_wait_ms=1000)
+        
+        start = time.perf_counter()
+        assert batcher.predict(21) == 42
+        
+        assert time.perf_counter() - start < 0.5
+        assert calls == [[21]]
+
+    def test_concurrent_callers_share_batches(self, calls, slow_double):
+        batcher = MicroBatcher(slow_double, max_batch_size=8, max_wait_ms=50)
+        results = {}
+        
+        def call(value):
+            results[value] = batcher.predict(value)
+        
+        threads = [threading.Thread(target=call, args=(value,)) for value in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert results == {value: value * 2 for value in range(16)}
+        assert len(calls) < 16
+        assert max(len(batch) for batch in calls) <= 8
+        stats = batcher.stats()
+        assert stats['items'] == 16
+        assert stats['batches'] == len(calls)
+        assert 0 < stats['avg_fill_ratio'] <= 1
+
+    def test_errors_reach_every_caller(self):
+        def failing_batch(items):
+            raise ValueError("Model not loaded")
+        batcher = MicroBatcher(failing_batch, max_batch_size=4, max_wait_ms=1)
+        
+        with pytest.raises(ValueError, match="Model not loaded"):
+            batcher.predict(1)
+        assert batcher.stats()['batches'] == 1
@@ -0,0 +1,98 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from config import settings
+from services.model_bundle import ALIGNMENT, ModelBundleError, load_bundle, read_manifest, save_bundle
+from services.prediction_service import FEATURE_COLUMNS, PredictionService
+
+
+class TestModelBundle:
+
+    @pytest.fixture
+    def training_data(self):
+        """Dados sintéticos com 14 features e 3 classes"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(300, 14)) * rng.uniform(1, 50, 14) + rng.uniform(0, 100, 14)
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, 300)]
+        return X, y
+
+    @pytest.fixture
+    def model_info(self):
+        """Informações do modelo com um escalar NumPy, como as do treinamento"""
+        return {
+            'model_name': 'SVM',
+            'model_score': np.float64(0.75),
+            'feature_names': list(FEATURE_COLUMNS.values()),
+            'classes': ['Dropout', 'Enrolled', 'Graduate']
+        }
+
+    @pytest.mark.parametrize('estimator', [
+        SVC(kernel='rbf', probability=True, random_state=42),
+        KNeighborsClassifier(n_neighbors=7),
+    ], ids=['svm', 'knn'])
+    @pytest.mark.parametrize('mmap_mode', [None, 'c'])
+    def test_roundtrip(self, training_data, model_info, tmp_path, estimator, mmap_mode):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('model', estimator)]).fit(X, y)
+        path = str(tmp_path / 'model.bundle')
+
+        save_bundle(pipeline, model_info, path)
+        bundle = load_bundle(path, mmap_mode=mmap_mode)
+
+        np.testing.assert_array_equal(bundle.model.predict_proba(X), pipeline.predict_proba(X))
+        assert bundle.model_info == dict(model_info, model_score=0.75)
+        assert bundle.manifest['classes'] == ['Dropout', 'Enrolled', 'Graduate']
+        assert len(bundle.checksum) == 64
+
+    def test_arrays_are_aligned_views(self, training_data, model_info, tmp_path):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier())]).fit(X, y)
+        path = str(tmp_path / 'model.bundle')
+
+        save_bundle(pipeline, model_info, path)
+        manifest = read_manifest(path)
+        fit_x = load_bundle(path, mmap_mode='c').model.steps[-1][1]._fit_X
+
+        assert manifest['buffers'] and all(offset % ALIGNMENT == 0 for offset, _ in manifest['buffers'])
+        assert not fit_x.flags.owndata and fit_x.flags.writeable
+
+    def test_corruption_is_detected(self, training_data, model_info, tmp_path):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier())]).fit(X, y)
+        path = tmp_path / 'model.bundle'
+        save_bundle(pipeline, model_info, str(path))
+
+        content = bytearray(path.read_bytes())
+        content[-10] ^= 0xFF
+        path.write_bytes(bytes(content))
+
+        with pytest.raises(ModelBundleError, match='Checksum'):
+            load_bundle(str(path))
+
+    def test_rejects_other_files(self, training_data, tmp_path):
+        path = tmp_path / 'model.pkl'
+        joblib.dump({'not': 'a bundle'}, path)
+
+        with pytest.raises(ModelBundleError):
+            load_bundle(str(path))
+
+    def test_service_loads_bundle(self, training_data, model_info, tmp_path, monkeypatch):
+        X, y = training_data
+        pipeline = Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier())]).fit(X, y)
+        path = str(tmp_path / 'model.bundle')
+        save_bundle(pipeline, model_info, path)
+        monkeypatch.setattr(settings, 'USE_MODEL_BUNDLE', True)
+        monkeypatch.setattr(settings, 'USE_COMPILED_MODEL', False)
+        monkeypatch.setattr(settings, 'MODEL_BUNDLE_PATH', path)
+
+        service = PredictionService()
+
+        assert service.get_model_paths() == [path]
+        assert service.load_model()
+        assert service.model_version == load_bundle(path).checksum[:12]
+        assert service.model_info['model_name'] == 'SVM'
@@ -0,0 +1,51 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from services.model_watcher import ModelWatcher
+
+
+class TestModelWatcher:
+    
+    @pytest.fixture
+    def model_file(self, tmp_path):
+        path = tmp_path / 'model.pkl'
+        path.write_bytes(b'v1')
+        return path
+    
+    @pytest.fixture
+    def service(self, model_file):
+        service = Mock()
+        service.get_model_paths.return_value = [str(model_file)]
+        service.load_model.return_value = True
+        return service
+    
+    def test_no_reload_without_changes(self, service):
+        watcher = ModelWatcher(service, interval=1)
+        
+        assert watcher.check() is None
+        service.load_model.assert_not_called()
+
+    def test_reload_after_change_settles(self, service, model_file):
+        watcher = ModelWatcher(service, interval=1)
+        model_file.write_bytes(b'version 2')
+        os.utime(model_file, ns=(1, 1))
+        
+        pending = watcher.check()
+        assert pending is not None
+        service.load_model.assert_not_called()
+        
+        assert watcher.check(pending) is None
+        assert service.load_model.call_count == 1
+        
+        # Same files again: nothing to do
+        assert watcher.check() is None
+        assert service.load_model.call_count == 1
+
+    def test_missing_files_are_ignored(self, service, model_file):
+        watcher = ModelWatcher(service, interval=1)
+        model_file.unlink()
+        
+        assert watcher.check() is None
+        service.load_model.assert_not_called()
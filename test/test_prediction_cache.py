@@ -0,0 +1,74 @@
+import pytest
+
+from services.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionCache:
+    
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+    
+    def test_get_miss_and_hit(self):
+        cache = PredictionCache(max_size=2)
+        
+        assert cache.get(('a',)) is None
+        cache.put(('a',), 'result')
+        
+        assert cache.get(('a',)) == 'result'
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_ttl_expiration(self, clock):
+        cache = PredictionCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.put('a', 1)
+        
+        clock.now = 59
+        assert cache.get('a') == 1
+        clock.now = 60
+        assert cache.get('a') is None
+        
+        stats = cache.stats()
+        assert stats['expirations'] == 1
+        assert stats['size'] == 0
+
+    def test_clear_drops_stale_generation(self):
+        cache = PredictionCache(max_size=10)
+        generation = cache.generation
+        cache.put('a', 1)
+        
+        cache.clear()
+        cache.put('b', 2, generation)
+        
+        assert cache.get('a') is None
+        assert cache.get('b') is None
+        assert cache.stats()['generation'] == generation + 1
+
+    def test_disabled_cache(self):
+        cache = PredictionCache(max_size=0)
+        cache.put('a', 1)
+        
+        assert cache.enabled is False
+        assert cache.stats()['size'] == 0
@@ -1,10 +1,13 @@
 import pytest
 import json
+import signal
+import numpy as np
 from unittest.mock import Mock, patch
 from flask import Flask
 
 from routers.prediction import prediction_bp
 from models.schemas import SimpleStudentData, PredictionResponse
+from services.response_encoder import encode_json
 from utils.validation import ValidationError
 
 
@@ -101,6 +104,35 @@ class TestPredictionRouter:
         data = json.loads(response.data)
         assert 'error' in data
 
+    def test_model_info_etag_and_not_modified(self, client, mock_prediction_service):
+        mock_prediction_service.model_version = 'v1'
+        mock_prediction_service.get_model_info.return_value = {'model_name': 'Test Model', 'model_version': 'v1'}
+        
+        first = client.get('/api/model-info')
+        second = client.get('/api/model-info', headers={'If-None-Match': first.headers['ETag']})
+        
+        assert first.status_code == 200
+        assert first.headers['Cache-Control'] == 'no-cache'
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert 'Access-Control-Allow-Origin' in second.headers
+        assert mock_prediction_service.get_model_info.call_count == 1
+
+    def test_metadata_rebuilt_after_model_reload(self, client, mock_prediction_service):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.model_version = 'v1'
+        mock_prediction_service.get_features_info.return_value = {'total_features': 1, 'features': []}
+        first = client.get('/api/features')
+        
+        mock_prediction_service.model_version = 'v2'
+        mock_prediction_service.get_features_info.return_value = {'total_features': 2, 'features': []}
+        second = client.get('/api/features', headers={'If-None-Match': first.headers['ETag']})
+        
+        assert second.status_code == 200
+        assert json.loads(second.data)['total_features'] == 2
+        assert second.headers['ETag'] != first.headers['ETag']
+
     def test_predict_options_request(self, client):
         response = client.options('/api/predict')
         
@@ -110,7 +142,7 @@ class TestPredictionRouter:
 
     def test_predict_success(self, client, mock_prediction_service, sample_request_data, mock_prediction_response):
         mock_prediction_service.is_model_loaded.return_value = True
-        mock_prediction_service.predict.return_value = mock_prediction_response
+        mock_prediction_service.predict_json.return_value = encode_json(mock_prediction_response.to_dict())
         
         with patch('routers.prediction.validate_dataclass_data') as mock_validate:
             mock_validate.return_value = sample_request_data
@@ -161,7 +193,7 @@ class TestPredictionRouter:
 
     def test_predict_service_exception(self, client, mock_prediction_service, sample_request_data):
         mock_prediction_service.is_model_loaded.return_value = True
-        mock_prediction_service.predict.side_effect = Exception("Prediction failed")
+        mock_prediction_service.predict_json.side_effect = Exception("Prediction failed")
         
         with patch('routers.prediction.validate_dataclass_data') as mock_validate:
             mock_validate.return_value = sample_request_data
@@ -174,6 +206,51 @@ class TestPredictionRouter:
         data = json.loads(response.data)
         assert 'Prediction error' in data['error']
 
+    def test_predict_debug_mode_uses_jsonify(self, app, client, mock_prediction_service, sample_request_data,
+                                             mock_prediction_response):
+        app.debug = True
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.predict.return_value = mock_prediction_response
+        
+        with patch('routers.prediction.validate_dataclass_data') as mock_validate:
+            mock_validate.return_value = sample_request_data
+            
+            response = client.post('/api/predict',
+                                 data=json.dumps(sample_request_data),
+                                 content_type='application/json')
+        
+        assert response.status_code == 200
+        assert json.loads(response.data) == mock_prediction_response.to_dict()
+        mock_prediction_service.predict_json.assert_not_called()
+
+    def test_explain_success(self, client, mock_prediction_service, sample_request_data):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.explain.return_value = {
+            'prediction': 'Dropout', 'method': 'perturbation', 'contributions': []
+        }
+        
+        response = client.post('/api/explain?method=perturbation', json=sample_request_data)
+        
+        assert response.status_code == 200
+        assert response.get_json()['method'] == 'perturbation'
+        student, method = mock_prediction_service.explain.call_args[0]
+        assert student.admission_grade == 150.0
+        assert method == 'perturbation'
+        assert response.headers['Access-Control-Allow-Origin'] == '*'
+
+    def test_explain_errors(self, client, mock_prediction_service, sample_request_data):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.explain.return_value = None
+        
+        invalid_method = client.post('/api/explain?method=shap', json=sample_request_data)
+        invalid_data = client.post('/api/explain', json={'gender': 1})
+        unavailable = client.post('/api/explain', json=sample_request_data)
+        
+        assert invalid_method.status_code == 400
+        assert invalid_data.status_code == 400
+        assert unavailable.status_code == 503
+        assert mock_prediction_service.explain.call_count == 1
+
     def test_predict_example_success(self, client, mock_prediction_service, mock_prediction_response):
         mock_prediction_service.predict.return_value = mock_prediction_response
         
@@ -192,6 +269,104 @@ class TestPredictionRouter:
         data = json.loads(response.data)
         assert 'Prediction error' in data['error']
 
+    def test_cache_stats_endpoint(self, client, mock_prediction_service):
+        mock_prediction_service.get_cache_stats.return_value = {'hits': 3, 'misses': 1, 'evictions': 0}
+        
+        response = client.get('/api/cache-stats')
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['hits'] == 3
+
+    @pytest.fixture
+    def admin_headers(self, monkeypatch):
+        monkeypatch.setattr('routers.prediction.settings.ADMIN_TOKEN', 'secret')
+        return {'X-Admin-Token': 'secret'}
+
+    def test_reload_model_success(self, client, mock_prediction_service, admin_headers):
+        mock_prediction_service.model_version = 'v1'
+        
+        def load_model():
+            mock_prediction_service.model_version = 'v2'
+            return True
+        mock_prediction_service.load_model.side_effect = load_model
+        
+        response = client.post('/api/admin/reload-model', headers=admin_headers)
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['previous_version'] == 'v1'
+        assert data['model_version'] == 'v2'
+
+    def test_reload_model_failure(self, client, mock_prediction_service, admin_headers):
+        mock_prediction_service.model_version = 'v1'
+        mock_prediction_service.load_model.return_value = False
+        
+        response = client.post('/api/admin/reload-model', headers=admin_headers)
+        
+        assert response.status_code == 500
+        assert json.loads(response.data)['model_version'] == 'v1'
+
+    def test_reload_model_requires_admin_token(self, client, mock_prediction_service):
+        mock_prediction_service.model_version = 'v1'
+        mock_prediction_service.load_model.return_value = True
+        
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.ADMIN_TOKEN = 'secret'
+            denied = client.post('/api/admin/reload-model', headers={'X-Admin-Token': 'wrong'})
+            allowed = client.post('/api/admin/reload-model', headers={'X-Admin-Token': 'secret'})
+        
+        assert denied.status_code == 403
+        assert allowed.status_code == 200
+        assert mock_prediction_service.load_model.call_count == 1
+
+    def test_reload_model_under_prefork_signals_parent(self, client, mock_prediction_service, admin_headers,
+                                                        monkeypatch):
+        mock_prediction_service.model_version = 'v1'
+        monkeypatch.setattr('routers.prediction.reload_parent_pid', 4242)
+        
+        with patch('routers.prediction.os.kill') as mock_kill:
+            response = client.post('/api/admin/reload-model', headers=admin_headers)
+        
+        assert response.status_code == 202
+        assert json.loads(response.data)['previous_version'] == 'v1'
+        mock_kill.assert_called_once_with(4242, signal.SIGHUP)
+        mock_prediction_service.load_model.assert_not_called()
+
+    def test_admin_endpoints_closed_without_token(self, client, mock_prediction_service, monkeypatch):
+        monkeypatch.setattr('routers.prediction.settings.ADMIN_TOKEN', None)
+        
+        reload_response = client.post('/api/admin/reload-model')
+        profiling_response = client.post('/api/admin/profiling', json={'enabled': True})
+        
+        assert reload_response.status_code == 403
+        assert profiling_response.status_code == 403
+        mock_prediction_service.load_model.assert_not_called()
+
+    def test_micro_batch_stats_endpoint(self, client, mock_prediction_service):
+        mock_prediction_service.get_micro_batch_stats.return_value = {'batches': 2, 'items': 5}
+        
+        response = client.get('/api/micro-batch-stats')
+        
+        data = json.loads(response.data)
+        assert data['enabled'] is True
+        assert data['items'] == 5
+
+    def test_metrics_endpoint(self, client, mock_prediction_service):
+        mock_prediction_service.get_cache_stats.return_value = {'enabled': True, 'hits': 3, 'misses': 1, 'size': 1}
+        mock_prediction_service.get_micro_batch_stats.return_value = None
+        client.get('/api/micro-batch-stats')
+        
+        response = client.get('/api/metrics')
+        
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.data.decode()
+        assert 'api_requests_total{endpoint="/api/micro-batch-stats",method="GET",status="200"}' in body
+        assert 'prediction_cache{stat="hits"} 3' in body
+        assert 'stat="enabled"' not in body
+        assert 'micro_batch' not in body
+
     def test_features_endpoint_success(self, client, mock_prediction_service):
         mock_prediction_service.is_model_loaded.return_value = True
         mock_features = {
@@ -246,4 +421,182 @@ class TestPredictionRouter:
         
         assert response.headers['Access-Control-Allow-Origin'] == '*'
         assert 'GET, POST, OPTIONS' in response.headers['Access-Control-Allow-Methods']
-        assert 'Content-Type' in response.headers['Access-Control-Allow-Headers'] 
\ No newline at end of file
+        assert 'Content-Type' in response.headers['Access-Control-Allow-Headers'] 
+    @pytest.fixture
+    def columnar_scores(self, mock_prediction_service):
+        def predict_student_batch(batch):
+            return (
+                np.array(['Graduate'] * len(batch)),
+                np.tile([0.2, 0.1, 0.7], (len(batch), 1)),
+                ['Dropout', 'Enrolled', 'Graduate'],
+                {'model_name': 'Test Model', 'features_used': 14, 'is_simplified': True}
+            )
+        mock_prediction_service.predict_student_batch.side_effect = predict_student_batch
+        return mock_prediction_service.predict_student_batch
+    
+    def test_predict_batch_success(self, client, mock_prediction_service, sample_request_data, columnar_scores):
+        mock_prediction_service.is_model_loaded.return_value = True
+        
+        response = client.post('/api/predict/batch',
+                             data=json.dumps({'students': [sample_request_data, sample_request_data]}),
+                             content_type='application/json')
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['total'] == 2
+        assert data['succeeded'] == 2
+        assert data['failed'] == 0
+        assert data['results'][1]['index'] == 1
+        assert data['results'][1]['prediction'] == 'Graduate'
+        assert data['model_info']['model_name'] == 'Test Model'
+        assert data['results'][0]['confidence'] == {'Dropout': 0.2, 'Enrolled': 0.1, 'Graduate': 0.7}
+        # Complete numeric records are scored by column, without per-row objects
+        assert columnar_scores.call_count == 1
+        mock_prediction_service.predict_batch.assert_not_called()
+    
+    def test_predict_batch_columnar_matches_row_path(self, client, mock_prediction_service, sample_request_data,
+                                                     columnar_scores, mock_prediction_response):
+        """Testa que o caminho colunar e o caminho linha a linha produzem a mesma resposta"""
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.predict_batch.side_effect = lambda students: [mock_prediction_response] * len(students)
+        body = json.dumps([sample_request_data, sample_request_data])
+        
+        columnar = client.post('/api/predict/batch', data=body, content_type='application/json').get_json()
+        with patch('routers.prediction.StudentBatch.from_records', side_effect=ValidationError("forçado")):
+            by_row = client.post('/api/predict/batch', data=body, content_type='application/json').get_json()
+        
+        assert columnar == by_row
+        students = mock_prediction_service.predict_batch.call_args[0][0]
+        assert not hasattr(students[0], '__dict__')
+
+    def test_predict_batch_partial_errors(self, client, mock_prediction_service, sample_request_data, mock_prediction_response):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.predict_batch.return_value = [mock_prediction_response]
+        invalid_data = dict(sample_request_data, age_at_enrollment='abc')
+        
+        response = client.post('/api/predict/batch',
+                             data=json.dumps([invalid_data, sample_request_data]),
+                             content_type='application/json')
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['succeeded'] == 1
+        assert data['failed'] == 1
+        assert data['results'][0]['error'] == 'Validation Error'
+        assert 'age_at_enrollment' in data['results'][0]['message']
+        assert data['results'][1]['prediction'] == 'Graduate'
+        assert len(mock_prediction_service.predict_batch.call_args[0][0]) == 1
+
+    def test_predict_batch_too_large(self, client, mock_prediction_service, sample_request_data):
+        mock_prediction_service.is_model_loaded.return_value = True
+        
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.BATCH_MAX_SIZE = 1
+            response = client.post('/api/predict/batch',
+                                 data=json.dumps([sample_request_data, sample_request_data]),
+                                 content_type='application/json')
+        
+        assert response.status_code == 413
+        mock_prediction_service.predict_batch.assert_not_called()
+
+    def test_predict_batch_empty_list(self, client, mock_prediction_service):
+        mock_prediction_service.is_model_loaded.return_value = True
+        
+        response = client.post('/api/predict/batch',
+                             data=json.dumps([]),
+                             content_type='application/json')
+        
+        assert response.status_code == 400
+
+    def test_predict_batch_model_not_loaded(self, client, mock_prediction_service, sample_request_data):
+        mock_prediction_service.is_model_loaded.return_value = False
+        
+        response = client.post('/api/predict/batch',
+                             data=json.dumps([sample_request_data]),
+                             content_type='application/json')
+        
+        assert response.status_code == 503
+
+    def test_predict_stream_ndjson_in_chunks(self, client, mock_prediction_service, sample_request_data,
+                                             mock_prediction_response, columnar_scores):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.predict_batch.side_effect = lambda students: [mock_prediction_response] * len(students)
+        body = '\n'.join([json.dumps(sample_request_data)] * 2 + ['not json', '', json.dumps(sample_request_data)])
+        
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.STREAM_CHUNK_SIZE = 2
+            mock_settings.STREAM_MAX_LINE_BYTES = 8192
+            response = client.post('/api/predict/stream', data=body, content_type='application/x-ndjson')
+            lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [line.get('index') for line in lines[:4]] == [0, 1, 2, 3]
+        assert lines[1]['prediction'] == 'Graduate'
+        assert lines[2]['error'] == 'Validation Error'
+        assert 'Invalid JSON' in lines[2]['message']
+        assert lines[4]['summary']['total'] == 4
+        assert lines[4]['summary']['failed'] == 1
+        assert lines[4]['summary']['model_info']['model_name'] == 'Test Model'
+        # The first chunk is all valid and scored by column; the second has a bad line
+        assert [len(call[0][0]) for call in columnar_scores.call_args_list] == [2]
+        assert [len(call[0][0]) for call in mock_prediction_service.predict_batch.call_args_list] == [1]
+
+    def test_predict_stream_csv(self, client, mock_prediction_service, sample_request_data, mock_prediction_response):
+        mock_prediction_service.is_model_loaded.return_value = True
+        mock_prediction_service.predict_batch.side_effect = lambda students: [mock_prediction_response] * len(students)
+        header = ','.join(sample_request_data)
+        row = ','.join(str(value) for value in sample_request_data.values())
+        invalid_row = row.replace('20,', 'abc,', 1)
+        
+        response = client.post('/api/predict/stream', data='\n'.join([header, row, invalid_row]) + '\n',
+                             content_type='text/csv')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        
+        assert lines[0]['prediction'] == 'Graduate'
+        assert 'age_at_enrollment' in lines[1]['message']
+        assert lines[2]['summary']['succeeded'] == 1
+        students = mock_prediction_service.predict_batch.call_args[0][0]
+        assert students[0].age_at_enrollment == 20
+        assert students[0].admission_grade == 150.0
+
+    def test_predict_stream_rejects_long_line(self, client, mock_prediction_service, sample_request_data,
+                                              columnar_scores):
+        mock_prediction_service.is_model_loaded.return_value = True
+        # One valid line, then a body without newlines longer than the limit
+        body = json.dumps(sample_request_data) + '\n' + 'x' * 10000
+        
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.STREAM_CHUNK_SIZE = 1
+            mock_settings.STREAM_MAX_LINE_BYTES = 1024
+            response = client.post('/api/predict/stream', data=body, content_type='application/x-ndjson')
+            lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        
+        assert lines[0]['index'] == 0 and 'prediction' in lines[0]
+        assert lines[1] == {'error': 'Line longer than 1024 bytes', 'index': 1}
+        assert len(lines) == 2
+
+    def test_predict_stream_model_not_loaded(self, client, mock_prediction_service):
+        mock_prediction_service.is_model_loaded.return_value = False
+        
+        response = client.post('/api/predict/stream', data='{}', content_type='application/x-ndjson')
+        
+        assert response.status_code == 503
+
+    def test_predict_stream_csv_by_column(self, client, mock_prediction_service, sample_request_data, columnar_scores):
+        mock_prediction_service.is_model_loaded.return_value = True
+        header = ','.join(sample_request_data)
+        row = ','.join(str(value) for value in sample_request_data.values())
+        
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.STREAM_CHUNK_SIZE = 2
+            mock_settings.STREAM_MAX_LINE_BYTES = 8192
+            response = client.post('/api/predict/stream', data='\n'.join([header, row, '', row, row]) + '\n',
+                                 content_type='text/csv')
+            lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        
+        assert [line.get('index') for line in lines[:3]] == [0, 1, 2]
+        assert lines[3]['summary']['succeeded'] == 3
+        batch = columnar_scores.call_args_list[0][0][0]
+        assert batch.columns['age_at_enrollment'].dtype == np.int64
+        mock_prediction_service.predict_batch.assert_not_called()
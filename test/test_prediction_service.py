@@ -1,10 +1,11 @@
 import pytest
 from unittest.mock import Mock, patch, mock_open
+import numpy as np
 import pandas as pd
 import joblib
 
 from services.prediction_service import PredictionService
-from models.schemas import SimpleStudentData, PredictionResponse
+from models.schemas import SimpleStudentData, PredictionResponse, StudentBatch
 
 
 class TestPredictionService:
@@ -59,6 +60,7 @@ class TestPredictionService:
         assert service.model is None
         assert service.model_info is None
 
+    @patch('services.prediction_service._file_digest', Mock(return_value='abc123def456'))
     @patch('os.path.exists')
     @patch('joblib.load')
     def test_load_model_success(self, mock_joblib_load, mock_exists, service, mock_model, mock_model_info):
@@ -71,6 +73,8 @@ class TestPredictionService:
         assert service.model == mock_model
         assert service.model_info == mock_model_info
         assert mock_joblib_load.call_count == 2
+        assert service.model_version == 'abc123def456'
+        assert service._state.feature_fields == ('age_at_enrollment', 'gender', 'admission_grade')
 
     @patch('os.path.exists')
     def test_load_model_files_not_found(self, mock_exists, service):
@@ -165,4 +169,226 @@ class TestPredictionService:
         assert result['total_features'] == 3
         assert len(result['features']) == 3
         assert result['features'][0]['name'] == 'Age at enrollment'
-        assert 'Idade do estudante' in result['features'][0]['description'] 
\ No newline at end of file
+        assert 'Idade do estudante' in result['features'][0]['description'] 
+    def test_predict_batch_model_not_loaded(self, service, sample_student_data):
+        with pytest.raises(Exception, match="Model not loaded"):
+            service.predict_batch([sample_student_data])
+
+    def test_predict_batch_empty(self, service, mock_model, mock_model_info):
+        service.model = mock_model
+        service.model_info = mock_model_info
+        
+        assert service.predict_batch([]) == []
+        mock_model.predict.assert_not_called()
+
+    def test_predict_batch_single_model_call(self, service, mock_model, mock_model_info, sample_student_data):
+        mock_model.predict.return_value = ['Graduate', 'Dropout']
+        mock_model.predict_proba.return_value = [[0.7, 0.2, 0.1], [0.1, 0.8, 0.1]]
+        service.model = mock_model
+        service.model_info = mock_model_info
+        
+        results = service.predict_batch([sample_student_data, sample_student_data])
+        
+        assert [r.prediction for r in results] == ['Graduate', 'Dropout']
+        assert results[1].confidence['Dropout'] == 0.8
+        assert mock_model.predict.call_count == 1
+        assert mock_model.predict_proba.call_count == 1
+        df = mock_model.predict.call_args[0][0]
+        assert list(df.columns) == mock_model_info['feature_names']
+        assert len(df) == 2
+
+
+    @patch('services.prediction_service._file_digest', Mock(return_value='abc123def456'))
+    @patch('os.path.exists')
+    @patch('joblib.load')
+    def test_predict_numpy_row_in_training_order(self, mock_joblib_load, mock_exists, service, mock_model,
+                                                 mock_model_info, sample_student_data):
+        mock_exists.return_value = True
+        mock_joblib_load.side_effect = [mock_model, mock_model_info]
+        service.load_model()
+        
+        result = service.predict(sample_student_data)
+        
+        assert result.prediction == 'Graduate'
+        row = mock_model.predict.call_args[0][0]
+        assert isinstance(row, np.ndarray)
+        assert row.tolist() == [[20.0, 1.0, 150.0]]
+
+
+    def test_predict_uses_cache(self, service, mock_model, mock_model_info, sample_student_data):
+        service.model = mock_model
+        service.model_info = mock_model_info
+        
+        first = service.predict(sample_student_data)
+        second = service.predict(sample_student_data)
+        
+        assert second is first
+        assert mock_model.predict.call_count == 1
+        stats = service.get_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    @patch('services.prediction_service._file_digest', Mock(return_value='abc123def456'))
+    @patch('os.path.exists')
+    @patch('joblib.load')
+    def test_load_model_flushes_cache(self, mock_joblib_load, mock_exists, service, mock_model,
+                                      mock_model_info, sample_student_data):
+        mock_exists.return_value = True
+        mock_joblib_load.side_effect = [mock_model, mock_model_info, mock_model, mock_model_info]
+        service.load_model()
+        service.predict(sample_student_data)
+        
+        service.load_model()
+        mock_model.predict.reset_mock()
+        service.predict(sample_student_data)
+        
+        assert mock_model.predict.call_count == 1
+        assert service.get_cache_stats()['size'] == 1
+
+
+    @patch('services.prediction_service._file_digest', Mock(side_effect=['v1', 'v2']))
+    @patch('os.path.exists')
+    @patch('joblib.load')
+    def test_failed_reload_keeps_current_model(self, mock_joblib_load, mock_exists, service, mock_model,
+                                               mock_model_info, sample_student_data):
+        mock_exists.return_value = True
+        mock_joblib_load.side_effect = [mock_model, mock_model_info, Exception("Corrupted file")]
+        service.load_model()
+        
+        assert service.load_model() is False
+        
+        assert service.model is mock_model
+        assert service.model_version == 'v1'
+        assert service.predict(sample_student_data).model_info['model_version'] == 'v1'
+
+    @patch('os.path.exists')
+    @patch('joblib.load')
+    def test_reload_swaps_model_and_info_together(self, mock_joblib_load, mock_exists, service, mock_model,
+                                                  mock_model_info):
+        new_model = Mock()
+        new_model.predict.return_value = ['Dropout']
+        new_model.predict_proba.return_value = [[0.1, 0.9]]
+        new_model.classes_ = ['Graduate', 'Dropout']
+        new_info = dict(mock_model_info, model_name='New Model')
+        mock_exists.return_value = True
+        mock_joblib_load.side_effect = [mock_model, mock_model_info, new_model, new_info]
+        
+        with patch('services.prediction_service._file_digest', Mock(side_effect=['v1', 'v2'])):
+            service.load_model()
+            old_state = service._state
+            service.load_model()
+        
+        assert old_state.model is mock_model and old_state.model_info is mock_model_info
+        assert service.model is new_model and service.model_info is new_info
+        assert service.get_model_info()['model_version'] == 'v2'
+
+
+    def test_predict_through_micro_batcher(self, mock_model, mock_model_info, sample_student_data):
+        with patch('services.prediction_service.settings.MICRO_BATCH_ENABLED', True):
+            service = PredictionService()
+        service.model = mock_model
+        service.model_info = mock_model_info
+        
+        result = service.predict(sample_student_data)
+        
+        assert result.prediction == 'Graduate'
+        assert service.get_micro_batch_stats()['items'] == 1
+        assert isinstance(mock_model.predict.call_args[0][0], pd.DataFrame)
+
+    def test_micro_batch_stats_disabled(self, service):
+        assert service.get_micro_batch_stats() is None
+
+
+class TestNumpyInferenceParity:
+    """The NumPy fast path must match the DataFrame path exactly on the real model"""
+    
+    @pytest.fixture
+    def service(self):
+        service = PredictionService()
+        if not service.load_model():
+            pytest.skip("Modelo não disponível para teste de paridade")
+        return service
+    
+    @pytest.fixture
+    def random_students(self):
+        rng = np.random.default_rng(42)
+        students = []
+        for _ in range(200):
+            students.append(SimpleStudentData(
+                age_at_enrollment=int(rng.integers(17, 60)), gender=int(rng.integers(0, 2)),
+                marital_status=int(rng.integers(1, 5)), admission_grade=float(rng.uniform(95, 190)),
+                daytime_evening_attendance=int(rng.integers(0, 2)), scholarship_holder=int(rng.integers(0, 2)),
+                tuition_fees_up_to_date=int(rng.integers(0, 2)),
+                curricular_units_1st_sem_enrolled=int(rng.integers(0, 10)),
+                curricular_units_1st_sem_approved=int(rng.integers(0, 10)),
+                curricular_units_1st_sem_grade=float(rng.uniform(0, 20)),
+                curricular_units_2nd_sem_enrolled=int(rng.integers(0, 10)),
+                curricular_units_2nd_sem_approved=int(rng.integers(0, 10)),
+                curricular_units_2nd_sem_grade=float(rng.uniform(0, 20)),
+                unemployment_rate=float(rng.uniform(5, 20))
+            ))
+        return students
+    
+    def test_single_row_matches_dataframe_path(self, service, random_students):
+        df = service._build_feature_frame(random_students)
+        expected_predictions = service.model.predict(df)
+        expected_probabilities = service.model.predict_proba(df)
+        
+        for i, student in enumerate(random_students):
+            result = service.predict(student)
+            assert result.prediction == str(expected_predictions[i])
+            assert list(result.confidence.values()) == expected_probabilities[i].tolist()
+    
+    def test_batch_matches_dataframe_path(self, service, random_students):
+        df = service._build_feature_frame(random_students)
+        expected_probabilities = service.model.predict_proba(df)
+        
+        results = service.predict_batch(random_students)
+        
+        assert [list(r.confidence.values()) for r in results] == expected_probabilities.tolist()
+    
+    def test_columnar_batch_matches_dataframe_path(self, service, random_students):
+        df = service._build_feature_frame(random_students)
+        expected_probabilities = service.model.predict_proba(df)
+        batch = StudentBatch.from_records([student.to_dict() for student in random_students])
+        
+        predictions, probabilities, classes, model_info = service.predict_student_batch(batch)
+        
+        assert probabilities.tolist() == expected_probabilities.tolist()
+        assert predictions.tolist() == service.model.predict(df).tolist()
+        assert classes == [str(cls) for cls in service.model.classes_]
+        assert model_info['model_version'] == service.model_version
+
+    
+    def test_explain_matches_prediction(self, service, random_students):
+        student = random_students[0]
+        expected = service.predict(student)
+        
+        explanation = service.explain(student)
+        
+        assert explanation['prediction'] == expected.prediction
+        assert explanation['confidence'] == expected.confidence
+        assert explanation['model_info']['model_version'] == service.model_version
+        assert len(explanation['contributions']) == len(service.model_info['feature_names'])
+        impact = [abs(entry['contribution'][expected.prediction]) for entry in explanation['contributions']]
+        assert impact == sorted(impact, reverse=True)
+
+class TestMemoryMappedLoading:
+    
+    def test_mmap_mode_shares_arrays_and_keeps_predictions(self):
+        service = PredictionService()
+        with patch('services.prediction_service.settings.MODEL_MMAP_MODE', 'c'):
+            if not service.load_model():
+                pytest.skip("Modelo não disponível para teste de mmap")
+        reference = PredictionService()
+        reference.load_model()
+        
+        estimator = service.model.steps[-1][1]
+        arrays = [value for value in vars(estimator).values() if isinstance(value, np.ndarray)]
+        assert arrays and all(isinstance(value, np.memmap) for value in arrays if value.size > 100)
+        
+        X = np.random.default_rng(0).uniform(0, 20, size=(50, 14))
+        np.testing.assert_array_equal(
+            service._state.inference_model.predict_proba(X),
+            reference._state.inference_model.predict_proba(X)
+        )
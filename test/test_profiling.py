@@ -0,0 +1,177 @@
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import Flask, Response
+
+import routers.prediction as prediction_router
+from routers.prediction import prediction_bp
+from utils.profiling import RequestProfiler, SamplingProfiler, TracingProfiler, collapse, profiled
+
+
+def _inner():
+    time.sleep(0.01)
+
+
+def _outer():
+    _inner()
+    return 'ok'
+
+
+def _parse(text):
+    return {line.rsplit(' ', 1)[0]: int(line.rsplit(' ', 1)[1]) for line in text.splitlines()}
+
+
+class TestProfiling:
+
+    def test_tracing_profiler_self_time_per_stack(self):
+        profiler = TracingProfiler()
+        profiler.start()
+        _outer()
+        stacks = profiler.stop()
+
+        sleep_stacks = {stack: value for stack, value in stacks.items() if stack.endswith('time.sleep')}
+        assert len(sleep_stacks) == 1
+        stack, value = next(iter(sleep_stacks.items()))
+        assert stack.split(';')[0].startswith('_outer (test_profiling.py:')
+        assert stack.split(';')[1].startswith('_inner (')
+        assert value >= 9000
+        # The callers' own time excludes the sleep
+        assert all(v < 9000 for s, v in stacks.items() if not s.endswith('time.sleep'))
+
+    def test_sampling_profiler(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        for _ in range(5):
+            _outer()
+        stacks = profiler.stop()
+
+        assert stacks
+        assert any(stack.startswith('_outer (') and ';_inner (' in stack for stack in stacks)
+
+    def test_collapse_format(self):
+        text = collapse({'a;b': 12.6, 'a': 3.0, 'a;c': 0.2})
+
+        assert text == 'a 3\na;b 13\n'
+
+    def test_configure_validates(self):
+        profiler = RequestProfiler()
+
+        with pytest.raises(ValueError):
+            profiler.configure(sample_rate=1.5)
+        with pytest.raises(ValueError):
+            profiler.configure(mode='other')
+
+        profiler.configure(enabled=True, sample_rate=0.5, mode='sampling')
+        assert profiler.status()['enabled'] is True
+        assert profiler.status()['mode'] == 'sampling'
+
+    def test_disabled_profiler_calls_view_directly(self, tmp_path):
+        profiler = RequestProfiler(enabled=False, sample_rate=1.0, output_dir=str(tmp_path))
+        requested = Mock(return_value=True)
+        view = profiled(profiler, requested)(lambda: Response('ok'))
+
+        response = view()
+
+        assert 'X-Profile-File' not in response.headers
+        requested.assert_not_called()
+        assert not os.listdir(tmp_path)
+
+    def test_requested_profile_is_written(self, tmp_path):
+        profiler = RequestProfiler(enabled=True, output_dir=str(tmp_path))
+
+        def view():
+            _outer()
+            return Response('ok')
+
+        response = profiled(profiler, lambda: True)(view)()
+
+        name = response.headers['X-Profile-File']
+        stacks = _parse((tmp_path / name).read_text())
+        assert any(stack.startswith('view (') and stack.endswith('time.sleep') for stack in stacks)
+        assert profiler.status()['profiled_requests'] == 1
+
+    def test_sample_rate(self, tmp_path):
+        profiler = RequestProfiler(enabled=True, sample_rate=1.0, output_dir=str(tmp_path))
+        view = profiled(profiler, lambda: False)(lambda: Response('ok'))
+
+        assert 'X-Profile-File' in view().headers
+
+        profiler.configure(sample_rate=0.0)
+        assert 'X-Profile-File' not in view().headers
+
+    def test_keeps_newest_profiles(self, tmp_path):
+        profiler = RequestProfiler(enabled=True, output_dir=str(tmp_path), max_files=3)
+        (tmp_path / 'notes.txt').write_text('kept')
+        paths = []
+        for i in range(5):
+            paths.append(profiler.write({'a;b': 10.0}, f'profile-{i}'))
+            # Distinct modification times, oldest first
+            os.utime(paths[-1], (i, i))
+
+        assert sorted(os.listdir(tmp_path)) == ['notes.txt', 'profile-2.collapsed', 'profile-3.collapsed',
+                                                'profile-4.collapsed']
+
+
+class TestProfilingRoutes:
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        # The predict view holds this instance, so its attributes are patched instead
+        profiler = prediction_router.request_profiler
+        for name, value in (('enabled', False), ('sample_rate', 0.0), ('mode', 'tracing'),
+                            ('output_dir', str(tmp_path)), ('max_files', 100)):
+            monkeypatch.setattr(profiler, name, value)
+        app = Flask(__name__)
+        app.register_blueprint(prediction_bp)
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_admin_toggle(self, client):
+        with patch('routers.prediction.settings') as mock_settings:
+            mock_settings.ADMIN_TOKEN = 'secret'
+            denied = client.post('/api/admin/profiling', json={'enabled': True})
+            invalid = client.post('/api/admin/profiling', json={'mode': 'other'},
+                                  headers={'X-Admin-Token': 'secret'})
+            allowed = client.post('/api/admin/profiling', json={'enabled': True, 'sample_rate': 0.25},
+                                  headers={'X-Admin-Token': 'secret'})
+
+        assert denied.status_code == 403
+        assert invalid.status_code == 400
+        assert allowed.status_code == 200
+        assert allowed.get_json()['enabled'] is True
+        assert allowed.get_json()['sample_rate'] == 0.25
+
+    def test_predict_profiled_with_header(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr('routers.prediction.settings.ADMIN_TOKEN', 'secret')
+        headers = {'X-Profile': '1', 'X-Admin-Token': 'secret'}
+        with patch('routers.prediction.prediction_service') as mock_service, \
+                patch('routers.prediction.validate_dataclass_data', return_value={}), \
+                patch('routers.prediction.SimpleStudentData'):
+            mock_service.predict_json.return_value = b'{"prediction":"Graduate"}\n'
+            off = client.post('/api/predict', json={'a': 1}, headers=headers)
+            prediction_router.request_profiler.enabled = True
+            on = client.post('/api/predict', json={'a': 1}, headers=headers)
+            without_token = client.post('/api/predict', json={'a': 1}, headers={'X-Profile': '1'})
+            not_requested = client.post('/api/predict', json={'a': 1})
+
+        assert 'X-Profile-File' not in off.headers
+        assert 'X-Profile-File' not in not_requested.headers
+        assert 'X-Profile-File' not in without_token.headers
+        assert on.status_code == 200
+        assert on.headers['X-Profile-File'] in os.listdir(tmp_path)
+        assert 'predict_student_status (prediction.py:' in (tmp_path / on.headers['X-Profile-File']).read_text()
+
+    def test_predict_header_ignored_without_admin_token(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr('routers.prediction.settings.ADMIN_TOKEN', None)
+        prediction_router.request_profiler.enabled = True
+        with patch('routers.prediction.prediction_service') as mock_service, \
+                patch('routers.prediction.validate_dataclass_data', return_value={}), \
+                patch('routers.prediction.SimpleStudentData'):
+            mock_service.predict_json.return_value = b'{"prediction":"Graduate"}\n'
+            response = client.post('/api/predict', json={'a': 1}, headers={'X-Profile': '1'})
+
+        assert response.status_code == 200
+        assert 'X-Profile-File' not in response.headers
+        assert not os.listdir(tmp_path)
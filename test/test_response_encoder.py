@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from flask import Flask, jsonify
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from models.schemas import PredictionResponse, SimpleStudentData
+from services.prediction_service import FEATURE_COLUMNS, ModelState, PredictionService
+from services.response_encoder import ResponseEncoder, encode_json
+
+
+class TestResponseEncoder:
+
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+
+    @pytest.fixture
+    def model_info(self):
+        """Fragmento model_info das respostas de predição"""
+        return {'model_name': 'SVM', 'model_version': 'abc123def456', 'features_used': 14, 'is_simplified': True}
+
+    def jsonify_bytes(self, app, response: PredictionResponse) -> bytes:
+        with app.app_context():
+            return jsonify(response.to_dict()).get_data()
+
+    def test_matches_jsonify(self, app, model_info):
+        classes = ['Graduate', 'Dropout', 'Enrolled']
+        encoder = ResponseEncoder(classes, model_info)
+        rng = np.random.default_rng(0)
+        rows = np.vstack([rng.dirichlet(np.ones(3), 200), [[1.0, 0.0, 0.0], [1e-300, 0.5, 0.5], [np.nan, np.inf, -np.inf]]])
+
+        for i, row in enumerate(rows):
+            prediction = classes[i % 3]
+            expected = PredictionResponse(
+                prediction=prediction,
+                confidence={cls: float(prob) for cls, prob in zip(classes, row)},
+                model_info=dict(model_info)
+            )
+            assert encoder.encode(np.str_(prediction), row) == self.jsonify_bytes(app, expected)
+
+    def test_matches_jsonify_without_probabilities(self, app, model_info):
+        encoder = ResponseEncoder(['Dropout', 'Graduate'], model_info)
+        expected = PredictionResponse('Dropout', {'prediction_only': 1.0}, dict(model_info))
+
+        assert encoder.encode('Dropout', None) == self.jsonify_bytes(app, expected)
+
+    def test_escapes_non_ascii_labels(self, app, model_info):
+        encoder = ResponseEncoder(['Evasão', 'Formado "A"'], model_info)
+        expected = PredictionResponse('Evasão', {'Evasão': 0.25, 'Formado "A"': 0.75}, dict(model_info))
+
+        assert encoder.encode('Evasão', np.array([0.25, 0.75])) == self.jsonify_bytes(app, expected)
+        assert encode_json(expected.to_dict()) == self.jsonify_bytes(app, expected)
+
+    def test_service_predict_json_matches_predict(self, app):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 14))
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, 200)]
+        service = PredictionService()
+        service._state = ModelState(
+            Pipeline([('StandardScaler', StandardScaler()), ('NB', GaussianNB())]).fit(X, y),
+            {'model_name': 'NB', 'feature_names': list(FEATURE_COLUMNS.values())},
+            version='abc123def456', prepare=True
+        )
+        student = SimpleStudentData(**dict(zip(FEATURE_COLUMNS, [20, 1, 1, 150.0, 1, 0, 1, 6, 5, 12.5, 6, 6, 13.0, 8.5])))
+
+        body = service.predict_json(student)
+
+        assert body == self.jsonify_bytes(app, service.predict(student))
+        assert service.predict_json(student) == body
+        assert service.get_cache_stats()['hits'] == 1
@@ -1,5 +1,12 @@
 import pytest
-from models.schemas import SimpleStudentData, PredictionResponse, ModelInfo, FeatureInfo, FeaturesResponse
+import numpy as np
+from dataclasses import fields
+
+from models.schemas import (
+    SimpleStudentData, PredictionResponse, ModelInfo, FeatureInfo, FeaturesResponse,
+    CompactStudentData, StudentBatch, STUDENT_FIELDS
+)
+from utils.validation import ValidationError
 
 
 class TestSimpleStudentData:
@@ -134,4 +141,106 @@ class TestFeaturesResponse:
         assert result_dict['total_features'] == 2
         assert len(result_dict['features']) == 2
         assert result_dict['features'][0]['name'] == 'Age'
-        assert result_dict['features'][1]['name'] == 'Gender' 
\ No newline at end of file
+        assert result_dict['features'][1]['name'] == 'Gender' 
+
+@pytest.fixture
+def student_records():
+    return [
+        {
+            'age_at_enrollment': 20 + i, 'gender': i % 2, 'marital_status': 1, 'admission_grade': 150.0 + i,
+            'daytime_evening_attendance': 1, 'scholarship_holder': 0, 'tuition_fees_up_to_date': 1,
+            'curricular_units_1st_sem_enrolled': 6, 'curricular_units_1st_sem_approved': 5,
+            'curricular_units_1st_sem_grade': 12.5, 'curricular_units_2nd_sem_enrolled': 6,
+            'curricular_units_2nd_sem_approved': 6, 'curricular_units_2nd_sem_grade': 13,
+            'unemployment_rate': 8.5
+        }
+        for i in range(3)
+    ]
+
+
+class TestCompactStudentData:
+    
+    def test_same_fields_as_simple_student_data(self):
+        assert [(f.name, f.type) for f in fields(CompactStudentData)] == \
+            [(f.name, f.type) for f in fields(SimpleStudentData)]
+    
+    def test_slotted_round_trip(self, student_records):
+        student = CompactStudentData.from_dict(student_records[0])
+        
+        assert not hasattr(student, '__dict__')
+        assert student.to_dict() == student_records[0]
+        assert student == CompactStudentData.from_dict(SimpleStudentData.from_dict(student_records[0]).to_dict())
+    
+    def test_missing_field(self, student_records):
+        del student_records[0]['gender']
+        
+        with pytest.raises(KeyError):
+            CompactStudentData.from_dict(student_records[0])
+
+
+class TestStudentBatch:
+    
+    def test_from_records_typed_columns(self, student_records):
+        batch = StudentBatch.from_records(student_records)
+        
+        assert len(batch) == 3
+        assert batch.columns['age_at_enrollment'].dtype == np.int64
+        assert batch.columns['curricular_units_2nd_sem_grade'].dtype == np.float64
+        assert batch.columns['age_at_enrollment'].tolist() == [20, 21, 22]
+        assert batch.row(1) == CompactStudentData.from_dict(student_records[1])
+    
+    def test_to_matrix_in_requested_order(self, student_records):
+        batch = StudentBatch.from_records(student_records)
+        
+        matrix = batch.to_matrix()
+        reordered = batch.to_matrix(('unemployment_rate', 'age_at_enrollment'))
+        
+        assert matrix.shape == (3, len(STUDENT_FIELDS))
+        assert matrix[2].tolist() == [float(student_records[2][name]) for name in STUDENT_FIELDS]
+        assert reordered[:, 1].tolist() == [20.0, 21.0, 22.0]
+        assert matrix.flags['C_CONTIGUOUS']
+    
+    @pytest.mark.parametrize('change', [
+        {'age_at_enrollment': '20'},
+        {'age_at_enrollment': 20.5},
+        {'admission_grade': None},
+        {'age_at_enrollment': 10 ** 30}
+    ])
+    def test_from_records_rejects_values_needing_conversion(self, student_records, change):
+        student_records[1].update(change)
+        
+        with pytest.raises(ValidationError):
+            StudentBatch.from_records(student_records)
+    
+    def test_from_records_rejects_missing_fields_and_non_objects(self, student_records):
+        with pytest.raises(ValidationError, match="'gender' is required"):
+            StudentBatch.from_records(student_records + [{'age_at_enrollment': 20}])
+        with pytest.raises(ValidationError):
+            StudentBatch.from_records(student_records + [[1, 2, 3]])
+    
+    def test_from_csv_matches_records(self, student_records):
+        header = ['extra'] + list(reversed(STUDENT_FIELDS))
+        lines = [','.join(header)] + [
+            ','.join(['x'] + [str(record[name]) for name in reversed(STUDENT_FIELDS)]) for record in student_records
+        ]
+        
+        from_text = StudentBatch.from_csv(lines[:2] + ['', '  '] + lines[2:])
+        from_bytes = StudentBatch.from_csv([line.encode() for line in lines[1:]], header)
+        expected = StudentBatch.from_records(student_records)
+        
+        for batch in (from_text, from_bytes):
+            assert len(batch) == 3
+            assert batch.columns['age_at_enrollment'].dtype == np.int64
+            np.testing.assert_array_equal(batch.to_matrix(), expected.to_matrix())
+    
+    @pytest.mark.parametrize('value', ['abc', '20.0', ''])
+    def test_from_csv_rejects_invalid_integers(self, value):
+        header = list(STUDENT_FIELDS)
+        row = [value] + ['1'] * (len(header) - 1)
+        
+        with pytest.raises(ValidationError, match="Invalid CSV data"):
+            StudentBatch.from_csv([','.join(row)], header)
+    
+    def test_from_csv_missing_column(self):
+        with pytest.raises(ValidationError, match="is required"):
+            StudentBatch.from_csv(['age_at_enrollment,gender', '20,1'])
@@ -0,0 +1,71 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+import score_students
+from config import settings
+from services.prediction_service import FEATURE_COLUMNS
+
+
+class TestScoreStudents:
+
+    @pytest.fixture
+    def model_files(self, tmp_path, monkeypatch):
+        """Modelo pequeno treinado com os nomes de colunas do treino"""
+        feature_names = list(FEATURE_COLUMNS.values())
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(200, len(feature_names))), columns=feature_names)
+        y = np.array(['Dropout', 'Enrolled', 'Graduate'])[rng.integers(0, 3, 200)]
+        model = Pipeline([('StandardScaler', StandardScaler()), ('NB', GaussianNB())]).fit(X, y)
+
+        model_path = tmp_path / 'model.pkl'
+        info_path = tmp_path / 'model_info.pkl'
+        joblib.dump(model, model_path)
+        joblib.dump({'model_name': 'NB', 'feature_names': feature_names, 'classes': list(model.classes_)}, info_path)
+        monkeypatch.setattr(settings, 'MODEL_PATH', str(model_path))
+        monkeypatch.setattr(settings, 'MODEL_INFO_PATH', str(info_path))
+        monkeypatch.setattr(settings, 'USE_COMPILED_MODEL', False)
+        return model
+
+    @pytest.fixture
+    def input_csv(self, tmp_path):
+        rng = np.random.default_rng(1)
+        columns = list(FEATURE_COLUMNS.values())
+        frame = pd.DataFrame(rng.normal(size=(250, len(columns))), columns=columns[::-1])
+        frame.insert(0, 'Student ID', range(250))
+        path = tmp_path / 'students.csv'
+        frame.to_csv(path, index=False)
+        return path, frame
+
+    def test_scores_in_input_order(self, model_files, input_csv, tmp_path):
+        path, frame = input_csv
+        output = tmp_path / 'predictions.csv'
+
+        rows = score_students.score_file(str(path), str(output), workers=2, chunk_size=40,
+                                         keep_columns=['Student ID'])
+
+        result = pd.read_csv(output)
+        features = frame[list(FEATURE_COLUMNS.values())]
+        assert rows == 250
+        assert list(result.columns) == ['Student ID', 'prediction', 'prob_Dropout', 'prob_Enrolled', 'prob_Graduate']
+        assert result['Student ID'].tolist() == list(range(250))
+        assert result['prediction'].tolist() == model_files.predict(features).tolist()
+        np.testing.assert_allclose(result.iloc[:, 2:].to_numpy(), model_files.predict_proba(features))
+
+    def test_single_worker_matches_pool(self, model_files, input_csv, tmp_path):
+        path, _ = input_csv
+        score_students.score_file(str(path), str(tmp_path / 'pool.csv'), workers=2, chunk_size=64)
+        score_students.score_file(str(path), str(tmp_path / 'single.csv'), workers=1, chunk_size=100)
+
+        assert (tmp_path / 'pool.csv').read_text() == (tmp_path / 'single.csv').read_text()
+
+    def test_missing_feature_column(self, model_files, input_csv, tmp_path):
+        path, frame = input_csv
+        frame.drop(columns=['Gender']).to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match='Gender'):
+            score_students.score_file(str(path), str(tmp_path / 'out.csv'), workers=1)
@@ -0,0 +1,126 @@
+"""
+Testes do servidor prefork (serve.py)
+"""
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from config import settings
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _get(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request('GET', path)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, body
+
+
+def _post(port, path, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request('POST', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, body
+
+
+def _wait_replaced(pid, before):
+    deadline = time.monotonic() + 30
+    while _children(pid) & before and time.monotonic() < deadline:
+        time.sleep(0.1)
+    return not _children(pid) & before
+
+
+def _children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return set(int(child) for child in f.read().split())
+
+
+@pytest.fixture
+def server():
+    if not os.path.exists(os.path.join(PROJECT_ROOT, settings.MODEL_PATH)):
+        pytest.skip("Artefatos do modelo não disponíveis")
+    if not hasattr(os, 'fork'):
+        pytest.skip("serve.py requer os.fork")
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, 'serve.py', '--host', '127.0.0.1', '--port', str(port), '--workers', '2',
+         '--max-requests', '3', '--graceful-timeout', '5'],
+        cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        env={**os.environ, 'ADMIN_TOKEN': 'serve-test'}
+    )
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            status, body = _get(port, '/api/')
+            if status == 200 and json.loads(body)['model_loaded']:
+                break
+        except (OSError, ValueError):
+            pass
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail(f"serve.py não iniciou: {process.communicate()[0]}")
+        time.sleep(0.05)
+
+    yield process, port
+
+    if process.poll() is None:
+        process.kill()
+        process.communicate()
+
+
+class TestServe:
+    """Testes do servidor prefork"""
+
+    def test_serves_recycles_reloads_and_stops(self, server):
+        """Testa atendimento, reciclagem dos workers, SIGHUP e SIGTERM"""
+        process, port = server
+
+        # Com --max-requests 3 os dois workers são reciclados várias vezes
+        statuses = [_get(port, '/api/model-info')[0] for _ in range(10)]
+        assert statuses == [200] * 10
+
+        can_list_children = os.path.exists(f'/proc/{process.pid}/task/{process.pid}/children')
+        if can_list_children:
+            time.sleep(0.5)
+            before = _children(process.pid)
+        process.send_signal(signal.SIGHUP)
+        if can_list_children:
+            assert _wait_replaced(process.pid, before)
+
+        # The admin endpoint, answered by one worker, reloads all of them through the parent
+        if can_list_children:
+            time.sleep(0.5)
+            before = _children(process.pid)
+        status, _ = _post(port, '/api/admin/reload-model', {'X-Admin-Token': 'serve-test'})
+        assert status == 202
+        if can_list_children:
+            assert _wait_replaced(process.pid, before)
+
+        statuses = [_get(port, '/api/model-info')[0] for _ in range(4)]
+        assert statuses == [200] * 4
+
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=30)
+
+        assert process.returncode == 0
+        assert "recycled" in output
+        assert output.count("Reloading the model") == 2
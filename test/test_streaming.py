@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+from utils.streaming import iter_chunks, iter_csv_records, iter_lines, iter_ndjson_records
+from utils.validation import ValidationError
+
+
+class TestStreaming:
+    
+    def test_iter_lines_across_blocks(self):
+        stream = io.BytesIO(b'first\nsecond line\n\nlast')
+        
+        assert list(iter_lines(stream, block_size=4)) == [b'first', b'second line', b'', b'last']
+
+    def test_iter_lines_rejects_long_lines(self):
+        lines = iter_lines(io.BytesIO(b'short\n' + b'x' * 100), block_size=16, max_line_length=32)
+        
+        assert next(lines) == b'short'
+        with pytest.raises(ValidationError):
+            next(lines)
+        # Complete lines are checked as well
+        with pytest.raises(ValidationError):
+            list(iter_lines(io.BytesIO(b'y' * 40 + b'\n'), block_size=64, max_line_length=32))
+        assert list(iter_lines(io.BytesIO(b'z' * 32), block_size=8, max_line_length=32)) == [b'z' * 32]
+
+    def test_ndjson_skips_blank_lines_and_reports_invalid_json(self):
+        records = list(iter_ndjson_records([b'{"a": 1}', b'  ', b'{oops', b'[1]']))
+        
+        assert records[0] == {'a': 1}
+        assert isinstance(records[1], ValidationError)
+        assert records[2] == [1]
+
+    def test_csv_uses_header_and_skips_empty_rows(self):
+        records = list(iter_csv_records([b'a,b', b'1,2.5', b',', b'3,4']))
+        
+        assert records == [{'a': '1', 'b': '2.5'}, {'a': '3', 'b': '4'}]
+
+    def test_iter_chunks(self):
+        assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(iter_chunks([], 2)) == []
@@ -0,0 +1,104 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from sklearn.model_selection import GridSearchCV
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from training.orchestrator import TrainingOrchestrator
+
+
+class TestTrainingOrchestrator:
+
+    @pytest.fixture
+    def training_data(self):
+        """Dados sintéticos com 14 features e 3 classes"""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(400, 14)) * rng.uniform(1, 50, 14)
+        labels = (X[:, 0] / 30 + X[:, 3] / 20 + rng.normal(size=400)).astype(int) % 3
+        return X, np.array(['Dropout', 'Enrolled', 'Graduate'])[labels]
+
+    @pytest.fixture
+    def families(self):
+        return {
+            'KNN': (Pipeline([('StandardScaler', StandardScaler()), ('KNN', KNeighborsClassifier())]),
+                    {'KNN__n_neighbors': [3, 5, 7]}),
+            'CART': (Pipeline([('StandardScaler', StandardScaler()), ('CART', DecisionTreeClassifier(random_state=0))]),
+                     {'CART__max_depth': [3, None]}),
+            'NB': (Pipeline([('StandardScaler', StandardScaler()), ('NB', GaussianNB())]),
+                   {'NB__var_smoothing': [1e-9, 1e-3]})
+        }
+
+    def test_grid_search_matches_gridsearchcv(self, training_data, families):
+        X, y = training_data
+        result = TrainingOrchestrator(families, cv=5, n_jobs=1, verbose=False).grid_search(X, y)
+
+        scores = {(c.family, tuple(sorted(c.params.items()))): c.mean_score for c in result.candidates}
+        for name, (pipeline, grid) in families.items():
+            search = GridSearchCV(pipeline, grid, cv=5).fit(X, y)
+            for params, score in zip(search.cv_results_['params'], search.cv_results_['mean_test_score']):
+                assert scores[(name, tuple(sorted(params.items())))] == pytest.approx(score)
+        assert result.fits == 7 * 5
+
+    def test_results_cached_and_reused(self, training_data, families, tmp_path):
+        X, y = training_data
+        orchestrator = TrainingOrchestrator(families, cv=3, n_jobs=1, cache_dir=str(tmp_path), verbose=False)
+
+        first = orchestrator.grid_search(X, y)
+        os.remove(sorted(tmp_path.iterdir())[0])
+        second = orchestrator.grid_search(X, y)
+
+        assert len(list(tmp_path.glob('*.json'))) == 7
+        assert second.fits == 3
+        assert second.cached == 6
+        assert second.best.params == first.best.params
+        stored = json.loads(next(tmp_path.glob('*.json')).read_text())
+        assert len(stored['fold_scores']) == 3
+
+    def test_cache_keyed_by_data(self, training_data, families, tmp_path):
+        X, y = training_data
+        orchestrator = TrainingOrchestrator(families, cv=3, n_jobs=1, cache_dir=str(tmp_path), verbose=False)
+
+        orchestrator.grid_search(X, y)
+        result = orchestrator.grid_search(X[:300], y[:300])
+
+        assert result.cached == 0
+
+    def test_cache_keyed_by_pipeline_settings(self, training_data, families, tmp_path, monkeypatch):
+        X, y = training_data
+        TrainingOrchestrator(families, cv=3, n_jobs=1, cache_dir=str(tmp_path), verbose=False).grid_search(X, y)
+
+        # Same family name and grid, different fixed parameter
+        edited = dict(families)
+        edited['CART'] = (Pipeline([('StandardScaler', StandardScaler()),
+                                    ('CART', DecisionTreeClassifier(random_state=1))]),
+                          {'CART__max_depth': [3, None]})
+        result = TrainingOrchestrator(edited, cv=3, n_jobs=1, cache_dir=str(tmp_path), verbose=False).grid_search(X, y)
+        assert result.cached == 5
+        assert result.fits == 2 * 3
+
+        monkeypatch.setattr('training.orchestrator.sklearn.__version__', '0.0.0')
+        result = TrainingOrchestrator(families, cv=3, n_jobs=1, cache_dir=str(tmp_path), verbose=False).grid_search(X, y)
+        assert result.cached == 0
+
+    def test_halving_search_keeps_fewer_candidates(self, training_data, families):
+        X, y = training_data
+        orchestrator = TrainingOrchestrator(families, cv=3, n_jobs=1, verbose=False)
+
+        result = orchestrator.halving_search(X, y, factor=3)
+
+        assert result.best.n_samples is None
+        assert result.fits < 7 * 3 * 2
+        assert sum(c.n_samples is None for c in result.candidates) <= 3
+        assert isinstance(orchestrator.build(result.best).fit(X, y).predict(X[:2])[0], str)
+
+    def test_rejects_pipeline_without_default_scaler(self):
+        families = {'NB': (Pipeline([('StandardScaler', StandardScaler(with_mean=False)), ('NB', GaussianNB())]), {})}
+
+        with pytest.raises(ValueError, match='default scaler'):
+            TrainingOrchestrator(families)
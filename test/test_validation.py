@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pytest
+
+from models.schemas import SimpleStudentData
+from utils.validation import (
+    ValidationError,
+    compile_validator,
+    validate_dataclass_batch,
+    validate_dataclass_data,
+    validate_field_type,
+)
+
+
+@dataclass
+class OptionalFieldsData:
+    name: str
+    active: bool = False
+    tags: List[str] = field(default_factory=list)
+    note: Optional[int] = None
+
+
+class TestValidation:
+    
+    @pytest.fixture
+    def valid_data_dict(self):
+        return {
+            'age_at_enrollment': 20,
+            'gender': 1,
+            'marital_status': 1,
+            'admission_grade': 150.0,
+            'daytime_evening_attendance': 1,
+            'scholarship_holder': 0,
+            'tuition_fees_up_to_date': 1,
+            'curricular_units_1st_sem_enrolled': 6,
+            'curricular_units_1st_sem_approved': 5,
+            'curricular_units_1st_sem_grade': 12.5,
+            'curricular_units_2nd_sem_enrolled': 6,
+            'curricular_units_2nd_sem_approved': 6,
+            'curricular_units_2nd_sem_grade': 13.0,
+            'unemployment_rate': 8.5
+        }
+    
+    def test_compile_validator_is_cached(self):
+        assert compile_validator(SimpleStudentData) is compile_validator(SimpleStudentData)
+        assert len(compile_validator(SimpleStudentData)) == 14
+
+    def test_compile_validator_rejects_non_dataclass(self):
+        with pytest.raises(ValueError, match="must be a dataclass"):
+            validate_dataclass_data(dict, {})
+
+    @pytest.mark.parametrize('field_name,value', [
+        ('age_at_enrollment', '21'),
+        ('age_at_enrollment', 21.9),
+        ('age_at_enrollment', True),
+        ('admission_grade', 150),
+        ('admission_grade', '150.5'),
+    ])
+    def test_coercion_matches_validate_field_type(self, valid_data_dict, field_name, value):
+        expected_type = int if field_name == 'age_at_enrollment' else float
+        
+        result = validate_dataclass_data(SimpleStudentData, dict(valid_data_dict, **{field_name: value}))
+        
+        expected = validate_field_type(value, expected_type, field_name)
+        assert result[field_name] == expected
+        assert type(result[field_name]) is type(expected)
+
+    def test_error_messages(self, valid_data_dict):
+        data = dict(valid_data_dict, age_at_enrollment='abc', admission_grade=None)
+        del data['gender']
+        
+        with pytest.raises(ValidationError) as exc_info:
+            validate_dataclass_data(SimpleStudentData, data)
+        
+        assert exc_info.value.message == (
+            "Validation errors: Field 'age_at_enrollment' must be of type int, got str; "
+            "Field 'gender' is required; "
+            "Field 'admission_grade' must be of type float, got NoneType"
+        )
+
+    def test_defaults_and_passthrough_types(self):
+        result = validate_dataclass_data(OptionalFieldsData, {'name': 7, 'active': 'yes', 'note': 'x'})
+        
+        assert result == {'name': '7', 'active': True, 'tags': [], 'note': 'x'}
+        assert validate_dataclass_data(OptionalFieldsData, {'name': 'a'})['tags'] is not result['tags']
+
+    def test_validate_batch(self, valid_data_dict):
+        validated, errors = validate_dataclass_batch(
+            SimpleStudentData, [valid_data_dict, 'not an object', {}]
+        )
+        
+        assert validated[0] == valid_data_dict
+        assert validated[1] is None and validated[2] is None
+        assert set(errors) == {1, 2}
+        assert 'JSON object' in errors[1].message
@@ -0,0 +1,189 @@
+"""
+Training dataset loading with a local, content-addressed cache.
+
+The raw CSV is stored under cache_dir/raw/<sha256>.csv and, after the first
+parse, the 14 selected features plus Target are stored as typed columns in
+cache_dir/<sha256>.npz, which loads in milliseconds. A URL is only
+downloaded the first time (or with refresh=True); index.json remembers
+which content hash each source resolved to, which is what lets offline mode
+train from a URL it has seen before without network access.
+"""
+import hashlib
+import json
+import os
+import time
+import urllib.request
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+
+# The most important and interpretable features, in training column order
+SELECTED_FEATURES = [
+    # Personal Information (3 features)
+    'Age at enrollment',
+    'Gender',
+    'Marital status',
+
+    # Academic Information (2 features)
+    'Admission grade',
+    'Daytime/evening attendance',
+
+    # Financial Status (2 features)
+    'Scholarship holder',
+    'Tuition fees up to date',
+
+    # 1st Semester Performance (3 features)
+    'Curricular units 1st sem (enrolled)',
+    'Curricular units 1st sem (approved)',
+    'Curricular units 1st sem (grade)',
+
+    # 2nd Semester Performance (3 features)
+    'Curricular units 2nd sem (enrolled)',
+    'Curricular units 2nd sem (approved)',
+    'Curricular units 2nd sem (grade)',
+
+    # Economic Context (1 feature)
+    'Unemployment rate'
+]
+
+TARGET_COLUMN = 'Target'
+
+
+class DatasetUnavailableError(Exception):
+    """The dataset is not cached and cannot be downloaded"""
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def _download(url: str, timeout: float = 60.0) -> bytes:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+class DatasetCache:
+    """Raw files and pruned typed copies of the dataset, keyed by content hash"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.raw_dir = os.path.join(cache_dir, 'raw')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+
+    def _read_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _write_atomic(self, path: str, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        write(temporary)
+        os.replace(temporary, path)
+
+    def lookup(self, source: str) -> Optional[str]:
+        """Content hash the source resolved to last time, if its raw file is still cached"""
+        digest = self._read_index().get(source)
+        if digest and os.path.exists(self.raw_path(digest)):
+            return digest
+        return None
+
+    def remember(self, source: str, digest: str):
+        index = self._read_index()
+        index[source] = digest
+
+        def write(path):
+            with open(path, 'w') as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+        self._write_atomic(self.index_path, write)
+
+    def raw_path(self, digest: str) -> str:
+        return os.path.join(self.raw_dir, f'{digest}.csv')
+
+    def pruned_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f'{digest}.npz')
+
+    def store_raw(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.raw_path(digest)
+        if not os.path.exists(path):
+            def write(temporary):
+                with open(temporary, 'wb') as f:
+                    f.write(content)
+            self._write_atomic(path, write)
+        return digest
+
+    def load_pruned(self, digest: str) -> Optional[pd.DataFrame]:
+        path = self.pruned_path(digest)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as arrays:
+            columns = [str(name) for name in arrays['columns']]
+            return pd.DataFrame({name: arrays[f'col{i}'] for i, name in enumerate(columns)})
+
+    def store_pruned(self, digest: str, frame: pd.DataFrame):
+        arrays = {'columns': np.array(frame.columns, dtype=str)}
+        for i, name in enumerate(frame.columns):
+            values = frame[name].to_numpy()
+            # Text columns become fixed-width unicode so the file loads without pickle
+            arrays[f'col{i}'] = values.astype(str) if values.dtype == object else values
+
+        def write(temporary):
+            with open(temporary, 'wb') as f:
+                np.savez(f, **arrays)
+        self._write_atomic(self.pruned_path(digest), write)
+
+
+def prune_dataset(dataset: pd.DataFrame) -> pd.DataFrame:
+    """Clean the column names and keep only the selected features and the target"""
+    dataset.columns = dataset.columns.str.strip()
+    return dataset[SELECTED_FEATURES + [TARGET_COLUMN]].reset_index(drop=True)
+
+
+def load_dataset(source: Optional[str] = None, cache_dir: Optional[str] = None,
+                 offline: Optional[bool] = None, refresh: bool = False,
+                 verbose: bool = True) -> pd.DataFrame:
+    """
+    Load the pruned dataset (SELECTED_FEATURES + Target) from a path or URL
+    Defaults come from settings.TRAINING_DATA_SOURCE, TRAINING_DATA_CACHE_DIR
+    and TRAINING_OFFLINE. refresh downloads a URL again even if it is cached
+    """
+    source = source or settings.TRAINING_DATA_SOURCE
+    cache = DatasetCache(cache_dir or settings.TRAINING_DATA_CACHE_DIR)
+    offline = settings.TRAINING_OFFLINE if offline is None else offline
+    started = time.perf_counter()
+
+    if _is_url(source):
+        digest = None if refresh and not offline else cache.lookup(source)
+        origin = 'cache'
+        if digest is None:
+            if offline:
+                raise DatasetUnavailableError(
+                    f"Offline mode and {source} is not in the cache ({cache.cache_dir}); "
+                    f"set TRAINING_DATA_SOURCE to a local copy of the file"
+                )
+            digest = cache.store_raw(_download(source))
+            cache.remember(source, digest)
+            origin = 'download'
+    else:
+        if not os.path.exists(source):
+            raise DatasetUnavailableError(f"Dataset file not found: {source}")
+        with open(source, 'rb') as f:
+            digest = cache.store_raw(f.read())
+        origin = 'local file'
+
+    frame = cache.load_pruned(digest)
+    if frame is None:
+        frame = prune_dataset(pd.read_csv(cache.raw_path(digest), delimiter=';'))
+        cache.store_pruned(digest, frame)
+        origin = f'{origin}, parsed'
+
+    if verbose:
+        print(f"📦 Dataset {digest[:12]} loaded from {origin} in "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    return frame
+
@@ -0,0 +1,245 @@
+"""
+Incremental model updates from newly labelled students, without retraining.
+
+Supported for the families that can absorb new samples cheaply:
+
+* the StandardScaler statistics are updated with a running mean/variance
+  (StandardScaler.partial_fit), and the fitted estimator is moved into the
+  new scaled space so its previous state stays valid;
+* Naive Bayes per-class means and variances are updated with partial_fit;
+* KNN gets the new samples appended to its stored training set.
+
+SVM and CART have no incremental fit and raise IncrementalUpdateError; use
+generate_simple_model.py for those. Each update writes a new versioned
+artifact and a drift report comparing it with the previous one:
+
+    python -m training.incremental new_term.csv
+    python -m training.incremental new_term.csv --promote --max-disagreement 0.05
+"""
+import argparse
+import copy
+import hashlib
+import io
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from config import settings
+from services.compiled_model import save_compiled_model
+from services.model_bundle import save_bundle
+from training.dataset import TARGET_COLUMN
+
+
+class IncrementalUpdateError(Exception):
+    """The model family does not support incremental updates"""
+
+
+def _split_pipeline(pipeline: Pipeline) -> Tuple[StandardScaler, Any]:
+    steps = getattr(pipeline, 'steps', None)
+    if not steps or len(steps) != 2 or not isinstance(steps[0][1], StandardScaler):
+        raise IncrementalUpdateError("Expected Pipeline([StandardScaler(), estimator])")
+    return steps[0][1], steps[1][1]
+
+
+def _rescale_features(values: np.ndarray, old: StandardScaler, new: StandardScaler) -> np.ndarray:
+    """Map rows scaled with the old scaler statistics to the new ones"""
+    return (values * old.scale_ + old.mean_ - new.mean_) / new.scale_
+
+
+def _update_naive_bayes(nb: GaussianNB, old: StandardScaler, new: StandardScaler,
+                        X_new: np.ndarray, y_new: np.ndarray):
+    unknown = set(np.unique(y_new)) - set(nb.classes_)
+    if unknown:
+        raise IncrementalUpdateError(f"New classes {sorted(unknown)} need a full retrain")
+
+    # Move the class statistics to the new scaled space. partial_fit removes
+    # epsilon_ before updating and adds a fresh one after, so drop it first
+    variances = (nb.var_ - nb.epsilon_) * (old.scale_ / new.scale_) ** 2
+    nb.theta_ = _rescale_features(nb.theta_, old, new)
+    nb.var_ = variances
+    nb.epsilon_ = 0.0
+    nb.partial_fit(X_new, y_new)
+
+
+def _update_knn(knn: KNeighborsClassifier, old: StandardScaler, new: StandardScaler,
+                X_new: np.ndarray, y_new: np.ndarray):
+    stored_X = _rescale_features(np.asarray(knn._fit_X), old, new)
+    stored_y = knn.classes_[np.asarray(knn._y)]
+    knn.fit(np.vstack([stored_X, X_new]), np.concatenate([stored_y, y_new]))
+
+
+def update_pipeline(pipeline: Pipeline, X_new: pd.DataFrame, y_new) -> Pipeline:
+    """Return a copy of the pipeline updated with the new labelled samples"""
+    old_scaler, estimator = _split_pipeline(pipeline)
+    if not isinstance(estimator, (GaussianNB, KNeighborsClassifier)):
+        raise IncrementalUpdateError(
+            f"{type(estimator).__name__} does not support incremental updates; "
+            f"run generate_simple_model.py to retrain"
+        )
+
+    updated = copy.deepcopy(pipeline)
+    new_scaler, estimator = _split_pipeline(updated)
+    new_scaler.partial_fit(X_new)
+
+    X_scaled = new_scaler.transform(X_new)
+    y_new = np.asarray(y_new)
+    if isinstance(estimator, GaussianNB):
+        _update_naive_bayes(estimator, old_scaler, new_scaler, X_scaled, y_new)
+    else:
+        _update_knn(estimator, old_scaler, new_scaler, X_scaled, y_new)
+    return updated
+
+
+def drift_report(previous: Pipeline, updated: Pipeline, X: pd.DataFrame, y=None) -> Dict[str, Any]:
+    """Compare the previous and updated models on the same rows"""
+    previous_predictions = previous.predict(X)
+    updated_predictions = updated.predict(X)
+    previous_scaler, _ = _split_pipeline(previous)
+    updated_scaler, _ = _split_pipeline(updated)
+
+    report = {
+        'rows': len(X),
+        'disagreement': float(np.mean(previous_predictions != updated_predictions)),
+        'mean_probability_change': float(np.mean(np.abs(previous.predict_proba(X) - updated.predict_proba(X)))),
+        'prediction_share': {
+            'previous': {str(c): float(np.mean(previous_predictions == c)) for c in previous.classes_},
+            'updated': {str(c): float(np.mean(updated_predictions == c)) for c in updated.classes_}
+        },
+        # Shift of each feature mean in units of the previous standard deviation
+        'feature_mean_shift': {
+            str(name): float(shift) for name, shift in zip(
+                X.columns, (updated_scaler.mean_ - previous_scaler.mean_) / previous_scaler.scale_
+            )
+        }
+    }
+    if y is not None:
+        y = np.asarray(y)
+        report['previous_accuracy'] = float(np.mean(previous_predictions == y))
+        report['updated_accuracy'] = float(np.mean(updated_predictions == y))
+    return report
+
+
+def _artifact_version(pipeline: Pipeline) -> str:
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return f"{stamp}-{hashlib.sha256(buffer.getvalue()).hexdigest()[:8]}"
+
+
+def _replace_file(source: str, destination: str):
+    """Copy source over destination atomically, so a watcher never sees half a file"""
+    temporary = f'{destination}.tmp'
+    with open(source, 'rb') as src, open(temporary, 'wb') as dst:
+        dst.write(src.read())
+    os.replace(temporary, destination)
+
+
+def run_update(data_path: str, model_path: Optional[str] = None, info_path: Optional[str] = None,
+               output_dir: str = 'model_versions', promote: bool = False,
+               max_disagreement: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Update the current artifact with the labelled rows in data_path (CSV with
+    the training column names and Target), write a versioned copy to
+    output_dir and optionally promote it to the live model paths
+    """
+    started = time.perf_counter()
+    model_path = model_path or settings.MODEL_PATH
+    info_path = info_path or settings.MODEL_INFO_PATH
+    previous = joblib.load(model_path)
+    model_info = joblib.load(info_path)
+
+    feature_names = list(model_info['feature_names'])
+    data = pd.read_csv(data_path)
+    X_new, y_new = data[feature_names], data[TARGET_COLUMN]
+
+    updated = update_pipeline(previous, X_new, y_new)
+    report = drift_report(previous, updated, X_new, y_new)
+
+    version = _artifact_version(updated)
+    scaler, _ = _split_pipeline(updated)
+    updated_info = dict(
+        model_info,
+        version=version,
+        parent_version=model_info.get('version'),
+        n_samples_seen=int(scaler.n_samples_seen_) if np.ndim(scaler.n_samples_seen_) == 0
+        else int(np.max(scaler.n_samples_seen_)),
+        incremental_updates=model_info.get('incremental_updates', 0) + 1,
+        classes=list(updated.classes_)
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        'model': os.path.join(output_dir, f'student_dropout_simple_model-{version}.pkl'),
+        'model_info': os.path.join(output_dir, f'student_dropout_simple_model_info-{version}.pkl'),
+        'compiled': os.path.join(output_dir, f'student_dropout_simple_model-{version}.npz'),
+        'bundle': os.path.join(output_dir, f'student_dropout_simple_model-{version}.bundle')
+    }
+    joblib.dump(updated, paths['model'])
+    joblib.dump(updated_info, paths['model_info'])
+    save_compiled_model(updated, paths['compiled'], {'model_info': updated_info})
+    save_bundle(updated, updated_info, paths['bundle'])
+
+    drifted = max_disagreement is not None and report['disagreement'] > max_disagreement
+    promoted = promote and not drifted
+    if promoted:
+        # The info file first: the watcher reloads once both files have settled
+        _replace_file(paths['model_info'], info_path)
+        _replace_file(paths['model'], model_path)
+        if os.path.exists(settings.COMPILED_MODEL_PATH):
+            _replace_file(paths['compiled'], settings.COMPILED_MODEL_PATH)
+        if os.path.exists(settings.MODEL_BUNDLE_PATH):
+            _replace_file(paths['bundle'], settings.MODEL_BUNDLE_PATH)
+
+    return {
+        'version': version,
+        'paths': paths,
+        'drift': report,
+        'drifted': drifted,
+        'promoted': promoted,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('data', help='CSV with the training column names and Target')
+    parser.add_argument('--model', help=f'Current model (default {settings.MODEL_PATH})')
+    parser.add_argument('--model-info', help=f'Current model info (default {settings.MODEL_INFO_PATH})')
+    parser.add_argument('--output-dir', default='model_versions')
+    parser.add_argument('--promote', action='store_true', help='Replace the live model files with the update')
+    parser.add_argument('--max-disagreement', type=float,
+                        help='Do not promote (and exit 1) when more predictions change than this share')
+    args = parser.parse_args()
+
+    try:
+        result = run_update(args.data, args.model, args.model_info, args.output_dir,
+                            args.promote, args.max_disagreement)
+    except IncrementalUpdateError as e:
+        sys.exit(f"❌ {e}")
+
+    drift = result['drift']
+    print(f"✅ Version {result['version']} built in {result['seconds']:.2f}s -> {result['paths']['model']}")
+    print(f"📊 Drift on {drift['rows']} new rows: {drift['disagreement']:.1%} of predictions changed, "
+          f"mean probability change {drift['mean_probability_change']:.4f}")
+    print(f"   Accuracy on the new labels: {drift['previous_accuracy']:.4f} -> {drift['updated_accuracy']:.4f}")
+    largest = sorted(drift['feature_mean_shift'].items(), key=lambda item: -abs(item[1]))[:3]
+    print("   Largest feature mean shifts: " + ", ".join(f"{name} {shift:+.3f}σ" for name, shift in largest))
+    if result['drifted']:
+        print(f"⚠️ Disagreement above {args.max_disagreement:.1%}, not promoted")
+        sys.exit(1)
+    if result['promoted']:
+        print("🚀 Promoted to the live model files")
+
+
+if __name__ == '__main__':
+    main()
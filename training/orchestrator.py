@@ -0,0 +1,285 @@
+"""
+Hyperparameter search over several model families in one shared worker pool.
+
+Every (family, parameter set, fold) fit is a separate job in a single joblib
+pool, so cores stay busy across families instead of idling between one
+GridSearchCV and the next. All candidate pipelines start with a default
+StandardScaler, so the scaler is fitted once per fold and the scaled fold
+arrays are shared by every job. Each candidate's CV result is stored in a
+JSON file under cache_dir, keyed by the data, the folds, every parameter of
+the candidate pipeline and the scikit-learn version, so an interrupted or
+repeated run only fits what is missing.
+"""
+import hashlib
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+@dataclass
+class Candidate:
+    """One parameter set of one model family and its CV result"""
+    family: str
+    params: Dict[str, Any]
+    fold_scores: List[float] = field(default_factory=list)
+    fit_time: float = 0.0
+    n_samples: Optional[int] = None
+    cached: bool = False
+
+    @property
+    def mean_score(self) -> float:
+        return float(np.mean(self.fold_scores)) if self.fold_scores else float('-inf')
+
+
+@dataclass
+class SearchResult:
+    candidates: List[Candidate]
+    best: Candidate
+    elapsed: float
+    fits: int
+    cached: int
+
+
+def _estimator_params(pipeline: Pipeline, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip the final step prefix ('SVM__C' -> 'C') from pipeline parameters"""
+    final_name = pipeline.steps[-1][0]
+    prefix = f'{final_name}__'
+    stripped = {}
+    for name, value in params.items():
+        if not name.startswith(prefix):
+            raise ValueError(f"Only parameters of the final step '{final_name}' can be searched, got {name}")
+        stripped[name[len(prefix):]] = value
+    return stripped
+
+
+def _check_pipeline(name: str, pipeline: Pipeline):
+    first = pipeline.steps[0][1] if isinstance(pipeline, Pipeline) and len(pipeline.steps) == 2 else None
+    if not isinstance(first, StandardScaler) or first.get_params() != StandardScaler().get_params():
+        raise ValueError(f"{name}: expected Pipeline([StandardScaler(), estimator]) with a default scaler")
+
+
+def _fingerprint(*arrays) -> str:
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype, array.shape)).encode())
+        digest.update(array.tobytes() if array.dtype != object else repr(array.tolist()).encode())
+    return digest.hexdigest()
+
+
+def _candidate_key(data_key: str, family: str, pipeline: Pipeline, params: Dict[str, Any],
+                   n_samples: Optional[int]) -> str:
+    # Every parameter of the configured pipeline, not only the searched ones, so
+    # editing a family's fixed settings (probability, random_state...) is a new key
+    configured = clone(pipeline).set_params(**params).get_params(deep=True)
+    payload = json.dumps(
+        {
+            'data': data_key,
+            'family': family,
+            'pipeline': {name: repr(value) for name, value in configured.items()},
+            'n_samples': n_samples,
+            'sklearn': sklearn.__version__
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+
+def _fit_and_score(estimator, params, X_train, y_train, X_test, y_test) -> Tuple[float, float]:
+    started = time.perf_counter()
+    estimator = clone(estimator).set_params(**params)
+    estimator.fit(X_train, y_train)
+    score = float(estimator.score(X_test, y_test))
+    return score, time.perf_counter() - started
+
+
+class TrainingOrchestrator:
+    """
+    Search the parameter grids of several Pipeline([StandardScaler(), estimator])
+    families with one shared pool of n_jobs workers.
+    """
+
+    def __init__(self, families: Dict[str, Tuple[Pipeline, Dict[str, List[Any]]]], cv: int = 5,
+                 n_jobs: int = -1, cache_dir: Optional[str] = None, verbose: bool = True):
+        for name, (pipeline, _) in families.items():
+            _check_pipeline(name, pipeline)
+        self.families = families
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def _candidates(self) -> List[Candidate]:
+        return [
+            Candidate(name, dict(params))
+            for name, (_, grid) in self.families.items()
+            for params in ParameterGrid(grid)
+        ]
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f'{key}.json') if self.cache_dir else None
+
+    def _load_cached(self, candidate: Candidate, key: str) -> bool:
+        path = self._cache_path(key)
+        if path is None or not os.path.exists(path):
+            return False
+        with open(path) as f:
+            stored = json.load(f)
+        candidate.fold_scores = stored['fold_scores']
+        candidate.fit_time = stored['fit_time']
+        candidate.cached = True
+        return True
+
+    def _store(self, candidate: Candidate, key: str):
+        path = self._cache_path(key)
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({
+                'family': candidate.family,
+                'params': candidate.params,
+                'n_samples': candidate.n_samples,
+                'fold_scores': candidate.fold_scores,
+                'mean_score': candidate.mean_score,
+                'fit_time': candidate.fit_time
+            }, f, default=repr)
+        os.replace(temporary, path)
+
+    def _scaled_folds(self, X: np.ndarray, y: np.ndarray, folds, n_samples: Optional[int]) -> list:
+        """Fit the scaler once per fold (on the first n_samples training rows) and transform"""
+        scaled = []
+        for train_index, test_index in folds:
+            if n_samples is not None:
+                train_index = train_index[:n_samples]
+            scaler = StandardScaler().fit(X[train_index])
+            scaled.append((scaler.transform(X[train_index]), y[train_index],
+                           scaler.transform(X[test_index]), y[test_index]))
+        return scaled
+
+    def _evaluate(self, candidates: List[Candidate], X, y, folds, data_key: str,
+                  n_samples: Optional[int] = None) -> Tuple[int, int]:
+        """Score the candidates on every fold, reusing cached results; returns (fits, cached)"""
+        pending = []
+        for candidate in candidates:
+            candidate.n_samples = n_samples
+            candidate.cached = False
+            key = _candidate_key(data_key, candidate.family, self.families[candidate.family][0],
+                                 candidate.params, n_samples)
+            if not self._load_cached(candidate, key):
+                pending.append((candidate, key))
+
+        if pending:
+            scaled = self._scaled_folds(X, y, folds, n_samples)
+            jobs = [
+                (candidate, fold)
+                for candidate, _ in pending
+                for fold in range(len(scaled))
+            ]
+            outputs = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_and_score)(
+                    self.families[candidate.family][0].steps[-1][1],
+                    _estimator_params(self.families[candidate.family][0], candidate.params),
+                    *scaled[fold]
+                )
+                for candidate, fold in jobs
+            )
+            results = iter(outputs)
+            for candidate, key in pending:
+                fold_results = [next(results) for _ in scaled]
+                candidate.fold_scores = [score for score, _ in fold_results]
+                candidate.fit_time = sum(seconds for _, seconds in fold_results)
+                self._store(candidate, key)
+
+        return len(pending) * len(folds), len(candidates) - len(pending)
+
+    def _folds(self, X, y):
+        return list(StratifiedKFold(n_splits=self.cv).split(X, y))
+
+    def grid_search(self, X, y) -> SearchResult:
+        """Evaluate every candidate of every family on every fold"""
+        started = time.perf_counter()
+        X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+        folds = self._folds(X, y)
+        data_key = _fingerprint(X, y) + f':cv{self.cv}'
+
+        candidates = self._candidates()
+        fits, cached = self._evaluate(candidates, X, y, folds, data_key)
+        self._log(f"   {len(candidates)} candidates, {fits} fits, {cached} from cache")
+        return SearchResult(candidates, self._best(candidates), time.perf_counter() - started, fits, cached)
+
+    def halving_search(self, X, y, factor: int = 3, min_samples: Optional[int] = None,
+                       random_state: int = 0) -> SearchResult:
+        """
+        Successive halving: score every candidate on a small share of each
+        training fold, keep the best 1/factor and repeat with factor times more
+        rows, until the survivors are scored on the full folds
+        """
+        started = time.perf_counter()
+        X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+        # Shuffle each training fold once so every prefix is a random subsample
+        rng = np.random.default_rng(random_state)
+        folds = [(rng.permutation(train), test) for train, test in self._folds(X, y)]
+        data_key = _fingerprint(X, y) + f':cv{self.cv}:halving{random_state}'
+
+        candidates = self._candidates()
+        n_train = min(len(train) for train, _ in folds)
+        n_rounds = max(1, math.ceil(math.log(len(candidates), factor)))
+        min_samples = min_samples or 20 * len(np.unique(y))
+
+        survivors = candidates
+        total_fits = total_cached = 0
+        for round_index in range(n_rounds):
+            rounds_left = n_rounds - 1 - round_index
+            n_samples = None if rounds_left == 0 else max(min_samples, n_train // factor ** rounds_left)
+            fits, cached = self._evaluate(survivors, X, y, folds, data_key, n_samples)
+            total_fits += fits
+            total_cached += cached
+            self._log(f"   round {round_index + 1}/{n_rounds}: {len(survivors)} candidates on "
+                      f"{n_samples or n_train} rows, {fits} fits, {cached} from cache")
+            if rounds_left:
+                survivors = sorted(survivors, key=lambda c: c.mean_score, reverse=True)
+                survivors = survivors[:max(1, math.ceil(len(survivors) / factor))]
+
+        return SearchResult(candidates, self._best(survivors), time.perf_counter() - started,
+                            total_fits, total_cached)
+
+    @staticmethod
+    def _best(candidates: Sequence[Candidate]) -> Candidate:
+        # First candidate wins ties, like GridSearchCV's rank_test_score
+        best = candidates[0]
+        for candidate in candidates[1:]:
+            if candidate.mean_score > best.mean_score:
+                best = candidate
+        return best
+
+    def best_per_family(self, result: SearchResult) -> Dict[str, Candidate]:
+        """Best fully-evaluated candidate of each family"""
+        best = {}
+        for candidate in result.candidates:
+            if candidate.n_samples is not None:
+                continue
+            current = best.get(candidate.family)
+            if current is None or candidate.mean_score > current.mean_score:
+                best[candidate.family] = candidate
+        return best
+
+    def build(self, candidate: Candidate) -> Pipeline:
+        """Unfitted pipeline for a candidate"""
+        return clone(self.families[candidate.family][0]).set_params(**candidate.params)
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, make_response, request
+
+
+class VersionedBodies:
+    """
+    Serialized response bodies and their strong ETags, one per name, rebuilt
+    only when the key (the loaded model version) changes
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Hashable, bytes, str]] = {}
+
+    def get(self, name: str, key: Hashable, build: Callable[[], Optional[bytes]]) -> Optional[Tuple[bytes, str]]:
+        """(body, etag) for the key, calling build on a miss; None (not stored) when build returns None"""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+
+        body = build()
+        if body is None:
+            return None
+        etag = hashlib.sha256(body).hexdigest()[:20]
+        # A single assignment, so concurrent requests see either entry whole
+        self._entries[name] = (key, body, etag)
+        return body, etag
+
+    def clear(self):
+        self._entries = {}
+
+
+def conditional_response(body: bytes, etag: str, cache_control: str, mimetype: str = 'application/json') -> Response:
+    """200 with the body, or an empty 304 when the request's If-None-Match has the ETag"""
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(Response(body, mimetype=mimetype))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def cache_control_header(max_age: int) -> str:
+    """Cache-Control for responses that change when the model is reloaded"""
+    if max_age <= 0:
+        # Clients may store the response but revalidate it (cheaply, with the ETag) every time
+        return 'no-cache'
+    return f'public, max-age={max_age}'
@@ -0,0 +1,227 @@
+"""
+On-demand request profiling with collapsed-stack output.
+
+A profiled request is run under one of two profilers:
+
+    tracing   sys.setprofile on the request's thread; every Python and C call
+              is timed and its self time added to its stack (exact, but the
+              request runs a few times slower while profiled)
+    sampling  a helper thread reads the request thread's stack from
+              sys._current_frames() every interval; cheaper, but samples can
+              only be taken when the request thread releases the GIL
+
+Each profile is written as one "frame;frame;frame value" line per stack, with
+values in microseconds, which flamegraph.pl, speedscope and inferno read.
+Only the newest max_files profiles are kept in the output directory.
+When the profiler is disabled, a wrapped view costs one attribute check.
+"""
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from time import perf_counter
+from typing import Callable, Dict, Optional, Tuple
+
+from logger import log_info, request_id_var
+
+MODES = ('tracing', 'sampling')
+
+
+def _code_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _builtin_name(function) -> str:
+    # Builtin methods have no module but a qualified name such as list.append
+    name = getattr(function, '__qualname__', None) or repr(function)
+    module = getattr(function, '__module__', None)
+    return f"{module}.{name}" if module else name
+
+
+def collapse(stacks: Dict[str, float]) -> str:
+    """Collapsed-stack text, one line per stack with a value of at least 1"""
+    lines = [f"{stack} {round(value)}" for stack, value in sorted(stacks.items()) if round(value) > 0]
+    return ''.join(line + '\n' for line in lines)
+
+
+class TracingProfiler:
+    """Self time of every call made by the current thread between start() and stop()"""
+
+    def __init__(self):
+        self.stacks: Dict[str, float] = defaultdict(float)
+        # [stack key, start time, time spent in children] for every open call
+        self._open = []
+
+    def _callback(self, frame, event, arg):
+        now = perf_counter()
+        if event == 'call' or event == 'c_call':
+            name = _code_name(frame.f_code) if event == 'call' else _builtin_name(arg)
+            parent = self._open[-1][0] + ';' if self._open else ''
+            self._open.append([parent + name, now, 0.0])
+        elif self._open:
+            # return, c_return or c_exception
+            key, started, children = self._open.pop()
+            elapsed = now - started
+            self.stacks[key] += (elapsed - children) * 1e6
+            if self._open:
+                self._open[-1][2] += elapsed
+
+    def start(self):
+        sys.setprofile(self._callback)
+
+    def stop(self) -> Dict[str, float]:
+        sys.setprofile(None)
+        # Calls still open here (sys.setprofile itself) are not counted
+        self._open = []
+        return self.stacks
+
+
+class SamplingProfiler:
+    """Stacks of the current thread sampled from a helper thread every interval"""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Dict[str, float] = defaultdict(float)
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+        self._root = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._target)
+        names = []
+        while frame is not None and frame is not self._root:
+            names.append(_code_name(frame.f_code))
+            frame = frame.f_back
+        if names:
+            self.stacks[';'.join(reversed(names))] += self.interval * 1e6
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._target = threading.get_ident()
+        # Frames above the caller of start() are not part of the profile
+        self._root = sys._getframe(1)
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, float]:
+        self._stop.set()
+        self._thread.join()
+        self._root = None
+        return self.stacks
+
+
+class RequestProfiler:
+    """Decides which requests are profiled and writes their collapsed stacks to output_dir"""
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 0.0, mode: str = 'tracing',
+                 interval_ms: float = 1.0, output_dir: str = 'profiles', max_files: int = 100):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval_ms = interval_ms
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self.profiled = 0
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                  mode: Optional[str] = None):
+        """Update the settings given, validating them first"""
+        if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if mode is not None:
+            self.mode = mode
+        if enabled is not None:
+            self.enabled = enabled
+
+    def status(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "interval_ms": self.interval_ms,
+            "output_dir": self.output_dir,
+            "max_files": self.max_files,
+            "profiled_requests": self.profiled
+        }
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _profiler(self):
+        if self.mode == 'sampling':
+            return SamplingProfiler(self.interval_ms / 1000)
+        return TracingProfiler()
+
+    def write(self, stacks: Dict[str, float], name: str) -> str:
+        """Write one profile, remove the oldest beyond max_files and return its path"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.collapsed")
+        with open(path, 'w') as f:
+            f.write(collapse(stacks))
+        self._prune(path)
+        return path
+
+    def _prune(self, keep: str):
+        profiles = []
+        for entry in os.scandir(self.output_dir):
+            if entry.name.endswith('.collapsed') and entry.path != keep:
+                try:
+                    profiles.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        # Workers share the directory, so another one may have removed a file first
+        for _, old in sorted(profiles)[:max(len(profiles) + 1 - self.max_files, 0)]:
+            try:
+                os.remove(old)
+            except FileNotFoundError:
+                pass
+
+    def run(self, func: Callable, *args, **kwargs) -> Tuple[object, str]:
+        """Call func under a profiler; returns its result and the profile's path"""
+        profiler = self._profiler()
+        started = perf_counter()
+        profiler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            stacks = profiler.stop()
+            elapsed = perf_counter() - started
+        self.profiled += 1
+
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{request_id_var.get() or self.profiled}"
+        path = self.write(stacks, name)
+        log_info("🔥 Profile of %s written to %s (%.1f ms, %s)", getattr(func, '__name__', func), path,
+                 elapsed * 1000, self.mode)
+        return result, path
+
+
+def profiled(profiler: RequestProfiler, requested: Callable[[], bool]):
+    """
+    Decorate a view so that, while the profiler is enabled, requests for which
+    requested() is true or that fall in the sample rate are profiled; the
+    profile's file name is returned in the X-Profile-File header
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return view(*args, **kwargs)
+            if not (requested() or profiler.should_sample()):
+                return view(*args, **kwargs)
+            response, path = profiler.run(view, *args, **kwargs)
+            if hasattr(response, 'headers'):
+                response.headers['X-Profile-File'] = os.path.basename(path)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+import csv
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.validation import ValidationError
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines(stream, block_size: int = READ_BLOCK_SIZE,
+               max_line_length: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield the lines of a binary stream, reading it in fixed-size blocks
+    (iterating request.stream directly reads one byte at a time).
+    A line longer than max_line_length bytes raises ValidationError instead
+    of being buffered, which keeps memory flat on a body without newlines
+    """
+    pending = b''
+    for block in iter(lambda: stream.read(block_size), b''):
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            _check_line_length(line, max_line_length)
+            yield line
+        # The unfinished line is checked too, so it never grows past the limit
+        _check_line_length(pending, max_line_length)
+    if pending:
+        yield pending
+
+
+def _check_line_length(line: bytes, max_line_length: Optional[int]):
+    if max_line_length is not None and len(line) > max_line_length:
+        raise ValidationError(f"Line longer than {max_line_length} bytes")
+
+
+def iter_ndjson_records(lines: Iterable[bytes]) -> Iterator[Union[Any, ValidationError]]:
+    """
+    Parse one JSON value per line, skipping blank lines
+    Lines that are not valid JSON are yielded as a ValidationError
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValidationError(f"Invalid JSON: {e}")
+
+def iter_csv_records(lines: Iterable[bytes], header: Optional[List[str]] = None) -> Iterator[dict]:
+    """Parse CSV rows into dicts keyed by the header row (the first line, unless given)"""
+    decoded = (line.decode('utf-8', errors='replace') for line in lines)
+    for row in csv.DictReader(decoded, fieldnames=header):
+        if any(row.values()):
+            yield row
+
+def iter_csv_chunks(lines: Iterable[bytes], size: int) -> Iterator[Tuple[List[str], List[bytes]]]:
+    """Parse the CSV header row and group the following raw lines into chunks of at most size"""
+    iterator = iter(lines)
+    for line in iterator:
+        if line.strip():
+            header = next(csv.reader([line.decode('utf-8', errors='replace')]))
+            break
+    else:
+        return
+    for chunk in iter_chunks(iterator, size):
+        yield header, chunk
+
+def iter_chunks(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most size items without reading ahead"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,5 +1,5 @@
-from dataclasses import fields, is_dataclass
-from typing import Any, Dict, Type, get_type_hints
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, get_type_hints
 
 
 class ValidationError(Exception):
@@ -9,40 +9,103 @@ class ValidationError(Exception):
         self.field = field
         super().__init__(message)
 
-def validate_dataclass_data(dataclass_type: Type, data: Dict[str, Any]) -> Dict[str, Any]:
+# Compiled validators by dataclass type, built once on first use
+_compiled_validators: Dict[Type, List[Tuple[str, Optional[Callable], Any, Optional[Callable]]]] = {}
+
+# Marks fields without a default value in compiled validators
+_REQUIRED = object()
+
+def compile_validator(dataclass_type: Type) -> List[Tuple[str, Optional[Callable], Any, Optional[Callable]]]:
     """
-    Validate data against a dataclass schema
-    Returns validated data or raises ValidationError
+    Build the flat list of (field name, converter, default, default factory)
+    entries for a dataclass. The converter is None when values pass through
+    unchanged and the default is _REQUIRED when the field has none
     """
+    validator = _compiled_validators.get(dataclass_type)
+    if validator is not None:
+        return validator
+    
     if not is_dataclass(dataclass_type):
         raise ValueError("dataclass_type must be a dataclass")
     
-    # Get all required fields from dataclass
-    dataclass_fields = {f.name: f for f in fields(dataclass_type)}
     type_hints = get_type_hints(dataclass_type)
+    validator = []
+    for field_obj in fields(dataclass_type):
+        default_factory = field_obj.default_factory if field_obj.default_factory is not MISSING else None
+        if field_obj.default is not MISSING:
+            default = field_obj.default
+        elif default_factory is not None:
+            default = None
+        else:
+            default = _REQUIRED
+        converter = _make_converter(type_hints.get(field_obj.name), field_obj.name)
+        validator.append((field_obj.name, converter, default, default_factory))
+    
+    _compiled_validators[dataclass_type] = validator
+    return validator
+
+def _make_converter(expected_type: Type, field_name: str) -> Optional[Callable[[Any], Any]]:
+    """Build the converter applied by validate_field_type for one field"""
+    if expected_type not in (int, float, str, bool):
+        return None
+    
+    def type_error(value):
+        return ValidationError(
+            f"Field '{field_name}' must be of type {expected_type.__name__}, got {type(value).__name__}",
+            field_name
+        )
+    
+    if expected_type is int:
+        def convert(value):
+            if isinstance(value, int):
+                return value
+            try:
+                return int(value)
+            except (ValueError, TypeError):
+                raise type_error(value)
+    elif expected_type is float:
+        def convert(value):
+            if isinstance(value, float):
+                return value
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                raise type_error(value)
+    elif expected_type is str:
+        def convert(value):
+            return value if isinstance(value, str) else str(value)
+    else:
+        def convert(value):
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str):
+                return value.lower() in ('true', '1', 'yes', 'on')
+            return bool(value)
     
+    return convert
+
+def validate_dataclass_data(dataclass_type: Type, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate data against a dataclass schema
+    Returns validated data or raises ValidationError
+    """
     validated_data = {}
     errors = []
     
-    # Check required fields
-    for field_name, field_obj in dataclass_fields.items():
+    for field_name, convert, default, default_factory in compile_validator(dataclass_type):
         if field_name not in data:
             # Check if field has default value
-            if field_obj.default is not field_obj.default_factory:
-                validated_data[field_name] = field_obj.default
-            elif field_obj.default_factory is not field_obj.default_factory:
-                validated_data[field_name] = field_obj.default_factory()
-            else:
+            if default is _REQUIRED:
                 errors.append(f"Field '{field_name}' is required")
-                continue
+            elif default_factory is not None:
+                validated_data[field_name] = default_factory()
+            else:
+                validated_data[field_name] = default
+        elif convert is None:
+            validated_data[field_name] = data[field_name]
         else:
-            # Validate field type
-            expected_type = type_hints.get(field_name)
-            value = data[field_name]
-            
             try:
-                validated_value = validate_field_type(value, expected_type, field_name)
-                validated_data[field_name] = validated_value
+                validated_data[field_name] = convert(data[field_name])
             except ValidationError as e:
                 errors.append(e.message)
     
@@ -51,6 +114,30 @@ def validate_dataclass_data(dataclass_type: Type, data: Dict[str, Any]) -> Dict[
     
     return validated_data
 
+def validate_dataclass_batch(
+    dataclass_type: Type, items: List[Any]
+) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, ValidationError]]:
+    """
+    Validate a list of records against a dataclass schema
+    Returns the validated records (None where invalid) and the errors by index
+    """
+    validated_items = []
+    errors = {}
+    
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            validated_items.append(None)
+            errors[index] = ValidationError("Each item must be a JSON object")
+            continue
+        
+        try:
+            validated_items.append(validate_dataclass_data(dataclass_type, item))
+        except ValidationError as e:
+            validated_items.append(None)
+            errors[index] = e
+    
+    return validated_items, errors
+
 def validate_field_type(value: Any, expected_type: Type, field_name: str) -> Any:
     """Validate individual field type"""
     if expected_type is None: